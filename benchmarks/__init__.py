@@ -0,0 +1,29 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmarks for python-ovs-vsctl.
+
+Each benchmark is a runnable module, e.g.::
+
+    $ python -m benchmarks.bench_backend
+
+`benchmarks.suite` measures the parsers and `VSCtl.run` round-trips with
+the outputs of 10 to 100k rows generated by `benchmarks.synthetic`, and
+stores the results in JSON to compare them across commits::
+
+    $ python -m benchmarks.suite --output before.json
+    $ python -m benchmarks.suite --compare before.json --threshold 1.2
+"""
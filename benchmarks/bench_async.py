@@ -0,0 +1,68 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measures the throughput of `AsyncVSCtl` running hundreds of commands at
+once against a stub 'ovs-vsctl' which emulates the latency of OVSDB server.
+"""
+
+import asyncio
+import tempfile
+
+from ovs_vsctl import line_parser
+from ovs_vsctl.aio import AsyncVSCtl
+
+from benchmarks.common import make_stub
+from benchmarks.common import measure
+from benchmarks.common import report
+from benchmarks.common import stub_vsctl
+
+N_COMMANDS = 300
+DELAY = 0.02
+COMMAND = 'list-br'
+
+
+def main():
+    path = make_stub(tempfile.mkdtemp(), 's1\n', delay=DELAY)
+    rows = []
+
+    vsctl = stub_vsctl(path)
+    elapsed = measure(
+        lambda: [vsctl.run(COMMAND, parser=line_parser)
+                 for _ in range(N_COMMANDS)], repeat=1)
+    rows.append(('VSCtl', '-', elapsed, N_COMMANDS / elapsed))
+
+    loop = asyncio.new_event_loop()
+    for concurrency in (1, 16, 64, 256):
+        vsctl = AsyncVSCtl('tcp', '127.0.0.1', 6640, concurrency=concurrency)
+        vsctl.ovs_vsctl_path = path
+
+        async def run_all(vsctl=vsctl):
+            return await asyncio.gather(*[
+                vsctl.run(COMMAND, parser=line_parser)
+                for _ in range(N_COMMANDS)])
+
+        elapsed = measure(lambda: loop.run_until_complete(run_all()),
+                          repeat=1)
+        rows.append(('AsyncVSCtl', concurrency, elapsed,
+                     N_COMMANDS / elapsed))
+    loop.close()
+
+    report('%d x %s (%.3f sec latency)' % (N_COMMANDS, COMMAND, DELAY), rows,
+           ('runner', 'concurrency', 'sec', 'commands/sec'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compares `SubprocessBackend` and `JsonRpcBackend`.
+
+`SubprocessBackend` runs a stub 'ovs-vsctl' which only prints the output,
+so the results show the lower bound of the cost of spawning processes.
+`JsonRpcBackend` talks to `FakeOVSDBServer` over a kept-open connection.
+"""
+
+import tempfile
+
+from ovs_vsctl import list_cmd_parser
+from ovs_vsctl.backend import JsonRpcBackend
+
+from benchmarks.common import fake_server
+from benchmarks.common import make_stub
+from benchmarks.common import measure
+from benchmarks.common import report
+from benchmarks.common import server_vsctl
+from benchmarks.common import stub_vsctl
+
+COMMAND = 'list Port'
+
+
+def main():
+    rows = []
+    tmpdir = tempfile.mkdtemp()
+    for n_ports in (10, 100, 1000):
+        server = fake_server(n_ports)
+        rpc = server_vsctl(server, backend=JsonRpcBackend)
+        output = rpc.run(COMMAND, table_format='list',
+                         data_format='json').stdout.read()
+        stub = stub_vsctl(make_stub(tmpdir, output))
+
+        number = max(1, 500 // n_ports)
+        rows.append((n_ports, 'subprocess', measure(
+            lambda: stub.run(COMMAND, parser=list_cmd_parser), number)))
+        rows.append((n_ports, 'jsonrpc', measure(
+            lambda: rpc.run(COMMAND, parser=list_cmd_parser), number)))
+
+        rpc.close()
+        server.stop()
+
+    report('%s with list_cmd_parser' % COMMAND, rows,
+           ('rows', 'backend', 'sec/call'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measures the throughput of provisioning hundreds of ports with
+`BulkProvisioner` against an invocation per port, with a stub 'ovs-vsctl'
+which emulates the latency of OVSDB server.
+"""
+
+import tempfile
+
+from ovs_vsctl.bulk import BulkProvisioner
+from ovs_vsctl.bulk import port_commands
+
+from benchmarks.common import make_stub
+from benchmarks.common import measure
+from benchmarks.common import report
+from benchmarks.common import stub_vsctl
+
+N_PORTS = 500
+DELAY = 0.01
+
+
+def _items():
+    return [port_commands('br0', 'tap%d' % i, type='internal',
+                          external_ids={'iface-id': 'vm%d' % i})
+            for i in range(N_PORTS)]
+
+
+def _per_item(vsctl, items):
+    for item in items:
+        vsctl.run(' -- '.join(item))
+
+
+def main():
+    vsctl = stub_vsctl(make_stub(tempfile.mkdtemp(), delay=DELAY))
+    items = _items()
+
+    rows = []
+    elapsed = measure(lambda: _per_item(vsctl, items), repeat=1)
+    rows.append(('per item', N_PORTS, elapsed, N_PORTS / elapsed))
+    for initial_chunk, max_chunk in ((1, 16), (16, 64), (16, 512)):
+        provisioner = BulkProvisioner(vsctl, initial_chunk, max_chunk)
+        elapsed = measure(lambda: provisioner.provision(items), repeat=1)
+        rows.append(('bulk %d..%d' % (initial_chunk, max_chunk),
+                     provisioner.invocations, elapsed, N_PORTS / elapsed))
+
+    report('add-port of %d ports (%.3f sec latency)' % (N_PORTS, DELAY),
+           rows, ('mode', 'invocations', 'sec', 'ports/sec'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compares the aggregation of 'statistics' of Interface table over the list
+of `Record` and over `ColumnarTable`.
+"""
+
+from ovs_vsctl import json_list_cmd_parser
+from ovs_vsctl.columnar import columnar_parser
+from ovs_vsctl.columnar import numpy
+
+from benchmarks.common import measure
+from benchmarks.common import report
+from benchmarks.synthetic import interface_json_output
+
+
+def _records_total(records):
+    return sum(r.statistics.get('rx_bytes', 0) for r in records
+               if r.statistics.get('rx_bytes', 0) > 1000)
+
+
+def _columnar_total(table):
+    column = table['statistics:rx_bytes']
+    if numpy is not None:
+        return table.sum('statistics:rx_bytes', where=column > 1000)
+    return table.sum('statistics:rx_bytes',
+                     where=[v > 1000 for v in column])
+
+
+def main():
+    rows = []
+    for n_rows in (1000, 10000, 100000):
+        output = interface_json_output(n_rows)
+        records = json_list_cmd_parser(output)
+        table = columnar_parser(output)
+        assert _records_total(records) == _columnar_total(table)
+
+        rows.append((n_rows, 'Record', 'parse',
+                     measure(lambda: json_list_cmd_parser(output))))
+        rows.append((n_rows, 'ColumnarTable', 'parse',
+                     measure(lambda: columnar_parser(output))))
+        rows.append((n_rows, 'Record', 'aggregate',
+                     measure(lambda: _records_total(records))))
+        rows.append((n_rows, 'ColumnarTable', 'aggregate',
+                     measure(lambda: _columnar_total(table))))
+
+    report('Total rx_bytes of busy interfaces (numpy: %s)'
+           % (numpy is not None), rows, ('rows', 'result', 'step', 'sec'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compares `list_cmd_parser` and the parser of `SchemaDecoder` which uses the
+decoders compiled from the schema.
+"""
+
+from ovs_vsctl import list_cmd_parser
+from ovs_vsctl.decoder import SchemaDecoder
+from ovs_vsctl.fake_server import VSWITCH_SCHEMA
+from ovs_vsctl.schema import Schema
+
+from benchmarks.common import measure
+from benchmarks.common import report
+from benchmarks.synthetic import interface_list_output
+
+
+def main():
+    decoder = SchemaDecoder(Schema.from_json(VSWITCH_SCHEMA))
+    rows = []
+    for n_rows in (1000, 10000, 100000):
+        output = interface_list_output(n_rows)
+        for name, parser in (
+                ('list_cmd_parser', list_cmd_parser),
+                ('SchemaDecoder', decoder.list_cmd_parser('Interface'))):
+            elapsed = measure(lambda: parser(output), repeat=2)
+            rows.append((n_rows, name, elapsed, elapsed / n_rows * 1e6))
+
+    report('list Interface', rows, ('rows', 'parser', 'sec/parse', 'usec/row'))
+
+
+if __name__ == '__main__':
+    main()
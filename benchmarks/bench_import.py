@@ -0,0 +1,54 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measures the time to import `ovs_vsctl` in a fresh interpreter and to
+construct `VSCtl`.
+"""
+
+import subprocess
+import sys
+
+from ovs_vsctl import VSCtl
+
+from benchmarks.common import measure
+from benchmarks.common import report
+
+# Number of calls of the constructor in a trial.
+NUMBER = 10000
+
+
+def _python(code):
+    subprocess.check_call([sys.executable, '-c', code])
+
+
+def main():
+    startup = measure(lambda: _python('pass'), repeat=10)
+    imported = measure(lambda: _python('import ovs_vsctl'), repeat=10)
+    rows = [
+        ('python -c pass', startup * 1e3),
+        ('python -c "import ovs_vsctl"', imported * 1e3),
+        ('import ovs_vsctl', (imported - startup) * 1e3),
+        ("VSCtl('tcp', '127.0.0.1', 6640)", measure(
+            lambda: VSCtl('tcp', '127.0.0.1', 6640), number=NUMBER) * 1e3),
+        ("VSCtl('tcp', '::1', 6640)", measure(
+            lambda: VSCtl('tcp', '::1', 6640), number=NUMBER) * 1e3),
+    ]
+
+    report('Import and construction', rows, ('step', 'msec'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compares looking up Interfaces by 'name' and 'external_ids:iface-id' with
+the linear scan over the list of `Record` and with `IndexedTable`.
+"""
+
+from ovs_vsctl import list_cmd_parser
+from ovs_vsctl.index import IndexedTable
+
+from benchmarks.common import measure
+from benchmarks.common import report
+from benchmarks.synthetic import interface_list_output
+
+# Number of lookups in a trial.
+LOOKUPS = 100
+
+
+def _scan(records, names):
+    return [[r for r in records if r.name == n][0] for n in names]
+
+
+def _scan_iface_id(records, iface_ids):
+    return [[r for r in records if r.external_ids.get('iface-id') == i]
+            for i in iface_ids]
+
+
+def main():
+    rows = []
+    for n_rows in (100, 1000, 10000):
+        records = list_cmd_parser(interface_list_output(n_rows))
+        step = max(n_rows // LOOKUPS, 1)
+        names = ['tap%d' % i for i in range(0, n_rows, step)]
+        iface_ids = ['vm%d' % i for i in range(0, n_rows, step)]
+
+        def _build(records=records):
+            return IndexedTable(records, unique=['_uuid', 'name'],
+                                multi=['external_ids:iface-id'])
+        table = _build()
+        assert _scan(records, names) == [table.get('name', n) for n in names]
+
+        rows.append((n_rows, 'scan', 'name',
+                     measure(lambda: _scan(records, names))))
+        rows.append((n_rows, 'scan', 'iface-id',
+                     measure(lambda: _scan_iface_id(records, iface_ids))))
+        rows.append((n_rows, 'IndexedTable', 'build', measure(_build)))
+        rows.append((n_rows, 'IndexedTable', 'name',
+                     measure(lambda: [table.get('name', n)
+                                      for n in names])))
+        rows.append((n_rows, 'IndexedTable', 'iface-id',
+                     measure(lambda: [table.find('external_ids:iface-id', i)
+                                      for i in iface_ids])))
+
+    report('%d lookups of Interface' % LOOKUPS, rows,
+           ('rows', 'container', 'lookup', 'sec'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measures the overhead of the metrics in `VSCtl.run` with a backend which
+returns the outputs without spawning 'ovs-vsctl'.
+"""
+
+from ovs_vsctl import VSCtl
+from ovs_vsctl import line_parser
+from ovs_vsctl import utils
+from ovs_vsctl.metrics import MetricsRegistry
+
+from benchmarks.common import measure
+from benchmarks.common import report
+
+# Number of calls in a trial.
+NUMBER = 10000
+
+
+class _EchoBackend():
+    def __init__(self, _):
+        pass
+
+    @staticmethod
+    def execute(args, stream=False):  # pylint: disable=unused-argument
+        return utils.Process(args, 0, 's1\n')
+
+    def close(self):
+        pass
+
+
+def main():
+    rows = []
+    for name, metrics in (('none', None),
+                          ('callback', lambda invocation: None),
+                          ('MetricsRegistry', MetricsRegistry())):
+        vsctl = VSCtl('tcp', '127.0.0.1', 6640, backend=_EchoBackend,
+                      metrics=metrics)
+        rows.append((name, measure(
+            lambda: vsctl.run('list-br', parser=line_parser),
+            number=NUMBER) * 1e6))
+
+    report('VSCtl.run without spawning', rows, ('metrics', 'usec/call'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compares `list_cmd_parser` with `parallel_list_cmd_parser` over the output
+sizes and the numbers of the worker processes, to find the size from which
+the parallel parsing pays off (`DEFAULT_MIN_SIZE`).
+
+The speedup is bounded by the number of CPUs printed in the title. On a
+single CPU, the speedup shows the overhead of sending the chunks and the
+parsed records between the processes (about 0.6, i.e. the parallel parsing
+pays off with 2 or more CPUs regardless of the size above a few hundreds of
+records).
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import functools
+import os
+
+from ovs_vsctl import list_cmd_parser
+from ovs_vsctl.parallel import parallel_list_cmd_parser
+
+from benchmarks.common import measure
+from benchmarks.common import report
+from benchmarks.synthetic import interface_list_output
+
+SIZES = (1000, 5000, 20000, 50000)
+PROCESSES = (2, 4, 8)
+
+
+def main():
+    executors = dict((p, ProcessPoolExecutor(max_workers=p))
+                     for p in PROCESSES)
+    rows = []
+    for n_rows in SIZES:
+        output = interface_list_output(n_rows)
+        serial = measure(lambda: list_cmd_parser(output))
+        rows.append((n_rows, len(output), 'serial', serial, 1.0))
+        for processes, executor in sorted(executors.items()):
+            # Starts the workers.
+            parallel_list_cmd_parser(output, processes, min_size=0,
+                                     executor=executor)
+            elapsed = measure(functools.partial(
+                parallel_list_cmd_parser, output, processes, min_size=0,
+                executor=executor))
+            rows.append((n_rows, len(output), '%d processes' % processes,
+                         elapsed, serial / elapsed))
+
+    for executor in executors.values():
+        executor.shutdown()
+
+    report('list Interface parsing (%d CPUs)' % (os.cpu_count() or 1), rows,
+           ('rows', 'chars', 'parser', 'sec', 'speedup'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measures the scaling of `VSCtlPool` over the pool sizes, running a command
+on hundreds of targets with a stub 'ovs-vsctl' which emulates the latency
+of OVSDB server.
+"""
+
+import functools
+import tempfile
+
+from ovs_vsctl import VSCtl
+from ovs_vsctl import line_parser
+from ovs_vsctl.pool import VSCtlPool
+
+from benchmarks.common import make_stub
+from benchmarks.common import measure
+from benchmarks.common import report
+
+N_TARGETS = 500
+DELAY = 0.02
+COMMAND = 'list-br'
+
+
+def _factory(path, protocol, addr, port):
+    vsctl = VSCtl(protocol, addr, port)
+    vsctl.ovs_vsctl_path = path
+    return vsctl
+
+
+def _sweep(pool, targets):
+    results = list(pool.run(targets, COMMAND, parser=line_parser))
+    assert all(r.ok for r in results)
+
+
+def main():
+    path = make_stub(tempfile.mkdtemp(), 's1\n', delay=DELAY)
+    factory = functools.partial(_factory, path)
+    targets = [('tcp', '127.0.0.1', 6640 + i) for i in range(N_TARGETS)]
+
+    rows = []
+    for executor, sizes in (('thread', (1, 8, 32, 128)),
+                            ('process', (8, 32))):
+        for max_workers in sizes:
+            with VSCtlPool(max_workers, executor, factory) as pool:
+                # Warms up the workers.
+                _sweep(pool, targets[:max_workers])
+                elapsed = measure(lambda: _sweep(pool, targets), repeat=1)
+            rows.append((executor, max_workers, elapsed,
+                         N_TARGETS / elapsed))
+
+    report('%s on %d targets (%.3f sec latency)'
+           % (COMMAND, N_TARGETS, DELAY), rows,
+           ('executor', 'workers', 'sec', 'targets/sec'))
+
+
+if __name__ == '__main__':
+    main()
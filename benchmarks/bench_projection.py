@@ -0,0 +1,94 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compares fetching all the columns of Interface table with fetching only
+'name' and 'ofport' by '--columns' option, over `JsonRpcBackend` talking to
+`FakeOVSDBServer` whose interfaces have realistic 'statistics' and
+'status' maps.
+"""
+
+import functools
+
+from ovs_vsctl import list_cmd_parser
+from ovs_vsctl import record_class_parser
+from ovs_vsctl.backend import JsonRpcBackend
+from ovs_vsctl.fake_server import FakeOVSDBServer
+from ovs_vsctl.parser import CompactRecord
+
+from benchmarks.common import measure
+from benchmarks.common import report
+from benchmarks.common import server_vsctl
+
+COMMAND = 'list Interface'
+
+STATISTICS = ('collisions', 'rx_bytes', 'rx_crc_err', 'rx_dropped',
+              'rx_errors', 'rx_frame_err', 'rx_missed_errors', 'rx_over_err',
+              'rx_packets', 'tx_bytes', 'tx_dropped', 'tx_errors',
+              'tx_packets')
+
+
+class Interface(CompactRecord):
+    """
+    Interface with the columns used by the caller.
+    """
+    __slots__ = ('name', 'ofport')
+
+
+def _server(n_rows):
+    server = FakeOVSDBServer()
+    for i in range(n_rows):
+        server.add_port(
+            'tap%d' % i, ofport=i + 1,
+            statistics=['map', [[k, i * 1000 + j]
+                                for j, k in enumerate(STATISTICS)]],
+            status=['map', [['driver_name', 'tun'],
+                            ['driver_version', '1.6'],
+                            ['firmware_version', '']]],
+            external_ids=['map', [['attached-mac', '00:00:00:00:00:01'],
+                                  ['iface-id', 'vm%d' % i],
+                                  ['iface-status', 'active']]])
+    server.start()
+    return server
+
+
+def main():
+    rows = []
+    for n_rows in (100, 1000, 2000):
+        server = _server(n_rows)
+        vsctl = server_vsctl(server, backend=JsonRpcBackend)
+        number = max(1, 1000 // n_rows)
+        for name, kwargs in (
+                ('all columns', {'parser': list_cmd_parser}),
+                ('columns=name,ofport', {'parser': list_cmd_parser,
+                                         'columns': ['name', 'ofport']}),
+                ('record_class_parser',
+                 {'parser': record_class_parser(Interface)})):
+            columns = kwargs.get('columns', getattr(
+                kwargs['parser'], 'columns', None))
+            chars = len(vsctl.run(COMMAND, table_format='list',
+                                  data_format='json',
+                                  columns=columns).stdout.read())
+            rows.append((n_rows, name, chars, measure(
+                functools.partial(vsctl.run, COMMAND, **kwargs), number)))
+        vsctl.close()
+        server.stop()
+
+    report('%s over JsonRpcBackend' % COMMAND, rows,
+           ('rows', 'projection', 'chars', 'sec/call'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compares selecting an interface by filtering 'list Interface' in Python
+with selecting it by 'find' command built by `Query`, over
+`JsonRpcBackend` talking to `FakeOVSDBServer`.
+"""
+
+import functools
+
+from ovs_vsctl import list_cmd_parser
+from ovs_vsctl.backend import JsonRpcBackend
+from ovs_vsctl.query import Query
+
+from benchmarks.common import fake_server
+from benchmarks.common import measure
+from benchmarks.common import report
+from benchmarks.common import server_vsctl
+
+
+def _filter(vsctl, name):
+    return [r for r in vsctl.run('list Interface', parser=list_cmd_parser)
+            if r.name == name]
+
+
+def main():
+    rows = []
+    for n_ports in (100, 1000):
+        server = fake_server(n_ports)
+        vsctl = server_vsctl(server, backend=JsonRpcBackend)
+        name = 'br0-eth%d' % (n_ports // 2)
+        query = Query('Interface', name=name)
+        projected = query.select('name', 'ofport')
+        assert len(_filter(vsctl, name)) == len(query.run(vsctl)) == 1
+
+        number = max(1, 1000 // n_ports)
+        rows.append((n_ports, 'list + filter', measure(
+            functools.partial(_filter, vsctl, name), number)))
+        rows.append((n_ports, 'find', measure(
+            functools.partial(query.run, vsctl), number)))
+        rows.append((n_ports, 'find + select', measure(
+            functools.partial(projected.run, vsctl), number)))
+
+        vsctl.close()
+        server.stop()
+
+    report('Selecting an interface by name', rows,
+           ('rows', 'method', 'sec/call'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compares the memory usage and the parsing time of `Record`, the compact
+records generated by `compact_list_cmd_parser` and the lazy records generated
+by `lazy_list_cmd_parser`.
+
+'sec/select' is the time to parse and read 'name', '_uuid' and 'ofport' of
+all the records, which is the typical usage.
+"""
+
+import gc
+import tracemalloc
+
+from ovs_vsctl import compact_list_cmd_parser
+from ovs_vsctl import lazy_list_cmd_parser
+from ovs_vsctl import list_cmd_parser
+
+from benchmarks.common import measure
+from benchmarks.common import report
+from benchmarks.synthetic import interface_list_output
+
+
+def _memory(parser, output):
+    gc.collect()
+    tracemalloc.start()
+    records = parser(output)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return current
+
+
+def _select(parser, output):
+    return [(r.name, r._uuid, r.ofport)  # pylint: disable=protected-access
+            for r in parser(output)]
+
+
+def main():
+    rows = []
+    for n_rows in (1000, 10000, 100000):
+        output = interface_list_output(n_rows)
+        for name, parser in (('Record', list_cmd_parser),
+                             ('compact', compact_list_cmd_parser),
+                             ('lazy', lazy_list_cmd_parser)):
+            memory = _memory(parser, output)
+            rows.append((n_rows, name, memory // n_rows,
+                         measure(lambda: parser(output)),
+                         measure(lambda: _select(parser, output))))
+
+    report('list Interface', rows,
+           ('rows', 'record', 'bytes/row', 'sec/parse', 'sec/select'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measures the latency of spawning a stub 'ovs-vsctl' with each spawner of
+`ovs_vsctl.spawn` while the memory of the calling process grows, e.g. as
+in a large daemon managing OVS.
+
+'popen (fork)' forces 'subprocess.Popen' to use fork() instead of vfork()
+as a baseline of copying the page tables.
+"""
+
+import subprocess
+import tempfile
+
+from ovs_vsctl.spawn import ForkServerSpawner
+from ovs_vsctl.spawn import PopenSpawner
+from ovs_vsctl.spawn import PosixSpawnSpawner
+
+from benchmarks.common import make_stub
+from benchmarks.common import measure
+from benchmarks.common import report
+
+# Megabytes of the memory allocated in the calling process.
+RSS_SIZES = (0, 512, 2048)
+NUMBER = 50
+
+
+def _rss():
+    # Megabytes of the resident set of this process.
+    try:
+        with open('/proc/self/statm') as f:  # pylint: disable=invalid-name
+            pages = int(f.read().split()[1])
+    except OSError:
+        return None
+    return pages * 4096 // (1024 * 1024)
+
+
+class ForkPopenSpawner(PopenSpawner):
+    """
+    `PopenSpawner` which disables vfork() of 'subprocess' if possible.
+    """
+
+    @staticmethod
+    def run(args):
+        # pylint: disable=protected-access
+        use_vfork = getattr(subprocess, '_USE_VFORK', None)
+        subprocess._USE_VFORK = False
+        try:
+            return PopenSpawner.run(args)
+        finally:
+            subprocess._USE_VFORK = use_vfork
+
+
+def _spawn_time(spawner, args):
+    return min(spawner.run(args).spawn_time or 0 for _ in range(NUMBER))
+
+
+def main():
+    args = [make_stub(tempfile.mkdtemp(), 'ok\n')]
+    # Started while this process is small.
+    spawners = (
+        ('popen (fork)', ForkPopenSpawner()),
+        ('popen', PopenSpawner()),
+        ('posix_spawn', PosixSpawnSpawner()),
+        ('forkserver', ForkServerSpawner()),
+    )
+
+    rows = []
+    ballast = []
+    for size in RSS_SIZES:
+        if size:
+            # Touches the pages so that they are resident.
+            ballast.append(b'\x01' * (size * 1024 * 1024 - sum(
+                len(b) for b in ballast)))
+        rss = _rss()
+        for name, spawner in spawners:
+            elapsed = measure(lambda s=spawner: s.run(args), NUMBER)
+            rows.append((name, rss, elapsed, _spawn_time(spawner, args)))
+
+    for _, spawner in spawners:
+        spawner.close()
+
+    report('spawn latency vs parent RSS (%d calls)' % NUMBER, rows,
+           ('spawner', 'RSS MB', 'sec/call', 'spawn sec'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Helpers shared by benchmarks.
+"""
+
+import os
+import stat
+import time
+
+from ovs_vsctl import VSCtl
+from ovs_vsctl.fake_server import FakeOVSDBServer
+
+
+def make_stub(directory, stdout='', returncode=0, delay=0,
+              name='ovs-vsctl'):
+    """
+    Creates a stub 'ovs-vsctl' executable which prints the given `stdout`
+    regardless of the arguments.
+
+    :param directory: Directory to create the stub in.
+    :param stdout: str type outputs of the stub.
+    :param returncode: Exit code of the stub.
+    :param delay: Seconds to sleep before printing, emulating the latency
+     of OVSDB server.
+    :param name: File name of the stub.
+    :return: Path to the stub.
+    """
+    output_path = os.path.join(directory, '%s.out' % name)
+    with open(output_path, 'w') as f:  # pylint: disable=invalid-name
+        f.write(stdout)
+
+    path = os.path.join(directory, name)
+    with open(path, 'w') as f:  # pylint: disable=invalid-name
+        f.write('#!/bin/sh\n')
+        if delay:
+            f.write('sleep %f\n' % delay)
+        if returncode:
+            f.write("cat '%s'\n" % output_path)
+            f.write('exit %d\n' % returncode)
+        else:
+            f.write("exec cat '%s'\n" % output_path)
+    os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR)
+
+    return path
+
+
+def stub_vsctl(path, **kwargs):
+    """
+    Returns `VSCtl` which executes the stub at `path`.
+
+    :param path: Path to the stub created by `make_stub`.
+    :param kwargs: Keyword arguments for `VSCtl`.
+    :return: Instance of `VSCtl`.
+    """
+    vsctl = VSCtl('tcp', '127.0.0.1', 6640, **kwargs)
+    vsctl.ovs_vsctl_path = path
+    return vsctl
+
+
+def fake_server(n_ports=0, bridge='br0'):
+    """
+    Starts `FakeOVSDBServer` with a bridge which has `n_ports` ports.
+
+    :param n_ports: Number of ports (and interfaces) to add.
+    :param bridge: Bridge name.
+    :return: Started instance of `FakeOVSDBServer`.
+    """
+    server = FakeOVSDBServer()
+    server.add_bridge(bridge, ['%s-eth%d' % (bridge, i)
+                               for i in range(n_ports)])
+    server.start()
+    return server
+
+
+def server_vsctl(server, **kwargs):
+    """
+    Returns `VSCtl` which connects to the given `FakeOVSDBServer`.
+
+    :param server: Started instance of `FakeOVSDBServer`.
+    :param kwargs: Keyword arguments for `VSCtl`.
+    :return: Instance of `VSCtl`.
+    """
+    protocol, _, addr = server.ovsdb_addr.partition(':')
+    host, _, port = addr.rpartition(':')
+    return VSCtl(protocol, host.strip('[]'), int(port), **kwargs)
+
+
+def measure(func, number=1, repeat=3):
+    """
+    Returns the best seconds per call of `func` in `repeat` trials.
+
+    :param func: Callable to measure.
+    :param number: Number of calls in a trial.
+    :param repeat: Number of trials.
+    :return: Seconds per call.
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = (time.perf_counter() - start) / number
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def report(title, rows, headings):
+    """
+    Prints the benchmark results as a table.
+
+    :param title: Title of the benchmark.
+    :param rows: list of tuples of the results.
+    :param headings: Headings of the columns.
+    """
+    print(title)
+    widths = [max(len(str(h)), *(len(_cell(r[i])) for r in rows))
+              for i, h in enumerate(headings)]
+    print('  '.join(str(h).rjust(w) for h, w in zip(headings, widths)))
+    for row in rows:
+        print('  '.join(_cell(c).rjust(w) for c, w in zip(row, widths)))
+    print('')
+
+
+def _cell(value):
+    if isinstance(value, float):
+        return '%.6f' % value
+    return str(value)
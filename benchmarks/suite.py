@@ -0,0 +1,238 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark suite of the parsers and `VSCtl.run` round-trips which stores the
+results in JSON so that the regressions can be compared across commits.
+
+Example::
+
+    $ python -m benchmarks.suite --output before.json
+    $ git checkout <commit>
+    $ python -m benchmarks.suite --output after.json --compare before.json
+"""
+
+import argparse
+import functools
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from ovs_vsctl import find_cmd_parser
+from ovs_vsctl import get_cmd_parser
+from ovs_vsctl import lazy_list_cmd_parser
+from ovs_vsctl import line_parser
+from ovs_vsctl import list_cmd_parser
+from ovs_vsctl import show_cmd_parser
+from ovs_vsctl import string_list_cmd_parser
+from ovs_vsctl.parser import Record
+
+from benchmarks.common import make_stub
+from benchmarks.common import measure
+from benchmarks.common import report
+from benchmarks.common import stub_vsctl
+from benchmarks.synthetic import get_map_output
+from benchmarks.synthetic import get_set_output
+from benchmarks.synthetic import interface_list_output
+from benchmarks.synthetic import interface_records
+from benchmarks.synthetic import interface_string_output
+from benchmarks.synthetic import lines_output
+from benchmarks.synthetic import show_output
+
+SIZES = (10, 1000, 10000, 100000)
+
+# Version of the format of the results file.
+RESULTS_VERSION = 1
+
+# Tuples of benchmark name, generator of the inputs and function to measure.
+PARSER_BENCHMARKS = (
+    ('line_parser', lines_output, line_parser),
+    ('show_cmd_parser', show_output, show_cmd_parser),
+    ('list_cmd_parser', interface_list_output, list_cmd_parser),
+    ('find_cmd_parser', interface_list_output, find_cmd_parser),
+    ('lazy_list_cmd_parser', interface_list_output, lazy_list_cmd_parser),
+    ('string_list_cmd_parser', interface_string_output,
+     string_list_cmd_parser),
+    ('get_cmd_parser:set', get_set_output, get_cmd_parser),
+    ('get_cmd_parser:map', get_map_output, get_cmd_parser),
+    ('Record.parse', interface_records,
+     lambda records: [Record.parse(r) for r in records]),
+)
+
+
+def _number(n_rows):
+    # Calls the small inputs repeatedly to get the stable results.
+    return max(1, 1000 // n_rows)
+
+
+def _result(name, n_rows, seconds):
+    return {
+        'name': name,
+        'rows': n_rows,
+        'seconds': seconds,
+        'usec_per_row': seconds / n_rows * 1e6,
+    }
+
+
+def run_parsers(sizes=SIZES, repeat=3, pattern=''):
+    """
+    Measures the parsers with the synthetic outputs of each size.
+
+    :param sizes: Numbers of rows of the outputs.
+    :param repeat: Number of trials.
+    :param pattern: Runs only the benchmarks containing this in the name.
+    :return: list of dict of the results.
+    """
+    results = []
+    for name, generator, func in PARSER_BENCHMARKS:
+        if pattern not in name:
+            continue
+        for n_rows in sizes:
+            output = generator(n_rows)
+            seconds = measure(functools.partial(func, output),
+                              _number(n_rows), repeat)
+            results.append(_result(name, n_rows, seconds))
+    return results
+
+
+def run_round_trips(sizes=SIZES, repeat=3, pattern=''):
+    """
+    Measures `VSCtl.run` with the stub 'ovs-vsctl' which prints the
+    synthetic outputs of 'ovs-vsctl list Interface' of each size.
+
+    :param sizes: Numbers of rows of the outputs.
+    :param repeat: Number of trials.
+    :param pattern: Runs only the benchmarks containing this in the name.
+    :return: list of dict of the results.
+    """
+    benchmarks = (
+        ('VSCtl.run', lambda vsctl: vsctl.run(
+            'list Interface', table_format='list',
+            data_format='json').stdout.read()),
+        ('VSCtl.run:list_cmd_parser', lambda vsctl: vsctl.run(
+            'list Interface', parser=list_cmd_parser)),
+    )
+    results = []
+    tmpdir = tempfile.mkdtemp()
+    for n_rows in sizes:
+        vsctl = stub_vsctl(make_stub(tmpdir, interface_list_output(n_rows)))
+        for name, func in benchmarks:
+            if pattern not in name:
+                continue
+            seconds = measure(functools.partial(func, vsctl),
+                              _number(n_rows), repeat)
+            results.append(_result(name, n_rows, seconds))
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            universal_newlines=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(sizes=SIZES, repeat=3, pattern=''):
+    """
+    Runs all benchmarks and returns the results with the environment.
+
+    :param sizes: Numbers of rows of the outputs.
+    :param repeat: Number of trials.
+    :param pattern: Runs only the benchmarks containing this in the name.
+    :return: dict which can be serialized into JSON.
+    """
+    return {
+        'version': RESULTS_VERSION,
+        'commit': _git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': (run_parsers(sizes, repeat, pattern)
+                    + run_round_trips(sizes, repeat, pattern)),
+    }
+
+
+def compare(baseline, current):
+    """
+    Compares the results of `run_suite`.
+
+    :param baseline: Results to compare with.
+    :param current: Results of the current commit.
+    :return: list of tuples of name, rows, seconds of `baseline`, seconds
+     of `current` and ratio of them, for the benchmarks in both results.
+    """
+    seconds = dict(((r['name'], r['rows']), r['seconds'])
+                   for r in baseline['results'])
+    rows = []
+    for result in current['results']:
+        old = seconds.get((result['name'], result['rows']))
+        if old is None:
+            continue
+        rows.append((result['name'], result['rows'], old,
+                     result['seconds'], result['seconds'] / old))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.suite', description=__doc__.strip(),
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES,
+                        help='numbers of rows (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='number of trials (default: %(default)s)')
+    parser.add_argument('--filter', default='',
+                        help='runs only the benchmarks containing this')
+    parser.add_argument('--output', help='writes the results in JSON')
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help='compares with the results in JSON')
+    parser.add_argument('--threshold', type=float, default=None,
+                        help='exits with 1 if any ratio to BASELINE '
+                        'exceeds this, e.g. 1.2')
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.sizes, args.repeat, args.filter)
+    report('commit %s' % results['commit'],
+           [(r['name'], r['rows'], r['seconds'], r['usec_per_row'])
+            for r in results['results']],
+           ('benchmark', 'rows', 'sec/call', 'usec/row'))
+
+    if args.output:
+        with open(args.output, 'w') as f:  # pylint: disable=invalid-name
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write('\n')
+
+    if args.compare:
+        with open(args.compare) as f:  # pylint: disable=invalid-name
+            baseline = json.load(f)
+        rows = compare(baseline, results)
+        report('compared with commit %s' % baseline.get('commit'), rows,
+               ('benchmark', 'rows', 'baseline', 'current', 'ratio'))
+        if (args.threshold is not None
+                and any(r[-1] > args.threshold for r in rows)):
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,169 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Generators of synthetic but realistic outputs of 'ovs-vsctl' command.
+
+All generators are deterministic, so the outputs of the same size are
+identical across runs and commits.
+"""
+
+import json
+import uuid
+
+from ovs_vsctl import datum
+
+
+def _interface_cells(i):
+    """
+    Returns the list of column name and cell printed with '--data=json'
+    option of the `i`-th synthetic Interface row.
+    """
+    return [
+        ('_uuid', '["uuid","%s"]' % uuid.UUID(int=i)),
+        ('admin_state', '"up"'),
+        ('external_ids',
+         '["map",[["attached-mac","00:00:00:00:%02x:%02x"],'
+         '["iface-id","vm%d"],["iface-status","active"]]]'
+         % (i // 256 % 256, i % 256, i)),
+        ('link_speed', '10000000000'),
+        ('link_state', '"up"'),
+        ('mtu', '1500'),
+        ('name', '"tap%d"' % i),
+        ('ofport', '%d' % (i + 1)),
+        ('options', '["map",[]]'),
+        ('statistics',
+         '["map",[["rx_bytes",%d],["rx_packets",%d],'
+         '["tx_bytes",%d],["tx_packets",%d]]]'
+         % (i * 1000, i, i * 900, i)),
+        ('status', '["map",[["driver_name","tun"]]]'),
+        ('type', '""'),
+    ]
+
+
+def interface_list_output(n_rows):
+    """
+    Returns the synthetic outputs of 'ovs-vsctl list Interface' with
+    '--format=list' and '--data=json' options.
+
+    :param n_rows: Number of rows.
+    :return: str type outputs.
+    """
+    records = []
+    for i in range(n_rows):
+        records.append(''.join('%-20s: %s\n' % c
+                               for c in _interface_cells(i)))
+    return '\n'.join(records)
+
+
+def interface_json_output(n_rows):
+    """
+    Returns the synthetic outputs of 'ovs-vsctl list Interface' with
+    '--format=json' and '--data=json' options, which contains the same rows
+    as `interface_list_output`.
+
+    :param n_rows: Number of rows.
+    :return: str type outputs.
+    """
+    headings = [c for c, _ in _interface_cells(0)]
+    data = ','.join('[%s]' % ','.join(cell for _, cell in _interface_cells(i))
+                    for i in range(n_rows))
+    return '{"data":[%s],"headings":%s}\n' % (
+        data, json.dumps(headings, separators=(',', ':')))
+
+
+def interface_string_output(n_rows):
+    """
+    Returns the synthetic outputs of 'ovs-vsctl list Interface' with
+    '--format=list' and '--data=string' options, which contains the same
+    rows as `interface_list_output`.
+
+    :param n_rows: Number of rows.
+    :return: str type outputs.
+    """
+    records = []
+    for i in range(n_rows):
+        records.append(''.join(
+            '%-20s: %s\n' % (column, datum.to_string(json.loads(cell)))
+            for column, cell in _interface_cells(i)))
+    return '\n'.join(records)
+
+
+def interface_records(n_rows):
+    """
+    Returns the synthetic outputs of 'ovs-vsctl list Interface' with
+    '--format=list' and '--data=json' options split into each record, i.e.
+    the inputs of `ovs_vsctl.parser.Record.parse`.
+
+    :param n_rows: Number of rows.
+    :return: list of str type outputs of each record.
+    """
+    return [''.join('%-20s: %s\n' % c for c in _interface_cells(i))
+            for i in range(n_rows)]
+
+
+def lines_output(n_rows):
+    """
+    Returns the synthetic outputs of 'ovs-vsctl list-ports'.
+
+    :param n_rows: Number of ports.
+    :return: str type outputs.
+    """
+    return ''.join('tap%d\n' % i for i in range(n_rows))
+
+
+def get_set_output(n_rows):
+    """
+    Returns the synthetic outputs of 'ovs-vsctl get Bridge <bridge> ports'
+    which is the set of UUIDs.
+
+    :param n_rows: Number of elements.
+    :return: str type outputs.
+    """
+    return '[%s]\n' % ', '.join(str(uuid.UUID(int=i)) for i in range(n_rows))
+
+
+def get_map_output(n_rows):
+    """
+    Returns the synthetic outputs of
+    'ovs-vsctl get Interface <interface> external_ids' which is the map of
+    strings.
+
+    :param n_rows: Number of pairs.
+    :return: str type outputs.
+    """
+    return '{%s}\n' % ', '.join('key%d="value%d"' % (i, i)
+                                for i in range(n_rows))
+
+
+def show_output(n_rows, bridge='br0'):
+    """
+    Returns the synthetic outputs of 'ovs-vsctl show' for a bridge which has
+    `n_rows` ports.
+
+    :param n_rows: Number of ports.
+    :param bridge: Bridge name.
+    :return: str type outputs.
+    """
+    lines = ['%s' % uuid.UUID(int=0),
+             '    Bridge "%s"' % bridge,
+             '        Controller "tcp:127.0.0.1:6633"',
+             '        fail_mode: secure']
+    for i in range(n_rows):
+        lines.extend(['        Port "tap%d"' % i,
+                      '            tag: %d' % (i % 4094 + 1),
+                      '            Interface "tap%d"' % i])
+    lines.append('    ovs_version: "2.5.0"')
+    return '\n'.join(lines) + '\n'
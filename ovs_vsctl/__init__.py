@@ -25,4 +25,12 @@ from .parser import line_parser
 from .parser import show_cmd_parser
 from .parser import list_cmd_parser
 from .parser import find_cmd_parser
+from .parser import compact_list_cmd_parser
+from .parser import lazy_list_cmd_parser
+from .parser import iter_list_cmd_parser
+from .parser import record_class_parser
+from .parser import json_list_cmd_parser
+from .parser import json_columns_parser
+from .parser import string_value_parser
+from .parser import string_list_cmd_parser
 from .parser import get_cmd_parser
@@ -0,0 +1,267 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+APIs for execute 'ovs-vsctl' command on asyncio event loop.
+"""
+
+import asyncio
+from subprocess import PIPE
+import time
+import weakref
+
+from ovs_vsctl import utils
+from ovs_vsctl.backend import SubprocessBackend
+from ovs_vsctl.spawn import PopenSpawner
+from ovs_vsctl.vsctl import VSCtl
+
+DEFAULT_CONCURRENCY = 16
+
+# Default of 'timeout' of the coroutines, i.e. 'timeout' of the constructor,
+# because `None` means no timeout.
+_DEFAULT_TIMEOUT = object()
+
+
+async def _communicate(args):
+    """
+    Executes the command with asyncio subprocess and returns its result.
+
+    The command is killed if cancelled (e.g. timed out) while running.
+    """
+    start = time.perf_counter()
+    process = await asyncio.create_subprocess_exec(
+        *args, stdout=PIPE, stderr=PIPE)
+    spawn_time = time.perf_counter() - start
+    try:
+        stdout, stderr = await process.communicate()
+    except BaseException:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        raise
+
+    return utils.Process(args, process.returncode,
+                         stdout.decode('utf-8'), stderr.decode('utf-8'),
+                         spawn_time)
+
+
+class AsyncVSCtl():
+    """
+    Runner class for 'ovs-vsctl' command on asyncio event loop.
+
+    Wraps `ovs_vsctl.VSCtl` (available as `vsctl`) and provides `run()` and
+    `run_batch()` as coroutines, which take the same arguments as those of
+    `ovs_vsctl.VSCtl` except for `timeout` instead of `stream`. With the
+    default backend and spawner, 'ovs-vsctl' is spawned as asyncio
+    subprocess, and otherwise (e.g. with `ovs_vsctl.backend.JsonRpcBackend`
+    or `spawner='forkserver'`), the commands are executed in the default
+    executor of the event loop.
+
+    Example::
+
+        >>> import asyncio
+        >>> from ovs_vsctl import list_cmd_parser
+        >>> from ovs_vsctl.aio import AsyncVSCtl
+        >>> vsctl = AsyncVSCtl('tcp', '127.0.0.1', 6640, concurrency=32)
+        >>> async def main():
+        ...     return await asyncio.gather(*[
+        ...         vsctl.run('list port s%d' % i, parser=list_cmd_parser)
+        ...         for i in range(100)])
+        >>> asyncio.run(main())
+
+    :param protocol: `'tcp'`, `'ssl'`, and `'unix'` are available.
+    :param addr: IP address of switch to connect.
+    :param port: (TCP or SSL) port number to connect.
+    :param backend: Backend class (or callable) which executes commands.
+    :param cache: Instance of `ovs_vsctl.cache.ResultCache`, or `None`.
+    :param concurrency: Maximum number of commands executed at once.
+    :param timeout: Default timeout in seconds for each command. `None`
+     means no timeout.
+    :param metrics: Callable receiving `ovs_vsctl.metrics.Invocation`, or
+     `None`. Meaning is the same as `ovs_vsctl.VSCtl`.
+    :param ovs_vsctl_path: Path to 'ovs-vsctl' executable. Meaning is the
+     same as `ovs_vsctl.VSCtl`.
+    :param spawner: Strategy of spawning 'ovs-vsctl'. Meaning is the same
+     as `ovs_vsctl.VSCtl`.
+    :raise: * ValueError -- When the given parameter is invalid.
+    """
+
+    def __init__(self, protocol='tcp', addr='127.0.0.1', port=6640,
+                 backend=None, cache=None, concurrency=DEFAULT_CONCURRENCY,
+                 timeout=None, metrics=None, ovs_vsctl_path=None,
+                 spawner=None):
+        if concurrency < 1:
+            raise ValueError('Invalid concurrency: %s' % concurrency)
+        self.vsctl = VSCtl(protocol, addr, port, backend=backend,
+                           cache=cache, metrics=metrics,
+                           ovs_vsctl_path=ovs_vsctl_path, spawner=spawner)
+        self.concurrency = concurrency
+        self.timeout = timeout
+        # Semaphores are bound to the event loop, so created for each loop.
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    @property
+    def ovsdb_addr(self):
+        """
+        OVSDB server address formatted like '--db' option of 'ovs-vsctl'
+        command.
+        """
+        return self.vsctl.ovsdb_addr
+
+    @property
+    def ovs_vsctl_path(self):
+        """
+        Path to 'ovs-vsctl' executable. See `ovs_vsctl.VSCtl`.
+        """
+        return self.vsctl.ovs_vsctl_path
+
+    @ovs_vsctl_path.setter
+    def ovs_vsctl_path(self, value):
+        self.vsctl.ovs_vsctl_path = value
+
+    @property
+    def semaphore(self):
+        """
+        Semaphore limiting the number of commands executed at once on the
+        running event loop.
+
+        :raise: * RuntimeError -- When no event loop is running.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def run(self, command, table_format='list', data_format='string',
+                  parser=None, timeout=_DEFAULT_TIMEOUT, columns=None):
+        """
+        Executes ovs-vsctl command.
+
+        The same as `ovs_vsctl.VSCtl.run()` except for streaming mode which
+        is not available.
+
+        If cancelled, the spawned 'ovs-vsctl' is killed. Note that commands
+        executed in the executor (i.e. with the backend other than
+        `ovs_vsctl.backend.SubprocessBackend`) can not be interrupted and
+        run to completion in background.
+
+        :param command: Command to execute.
+        :param table_format: Table format. Meaning is the same as '--format'
+         option of 'ovs-vsctl' command.
+        :param data_format: Cell format in table. Meaning is the same as
+         '--data' option of 'ovs-vsctl' command.
+        :param parser: Parser class for the outputs. Meaning is the same as
+         `ovs_vsctl.VSCtl.run()`.
+        :param timeout: Timeout in seconds for this command including the
+         time waiting for the semaphore, or `None` for no timeout. Defaults
+         to `timeout` given to the constructor.
+        :param columns: Columns to print by 'list' or 'find' command.
+         Meaning is the same as `ovs_vsctl.VSCtl.run()`.
+        :return: Output of 'ovs-vsctl' command. If `parser` is not specified,
+         returns an instance of `ovs_vsctl.utils.Process`. If `parser` is
+         specified, the given `parser` is applied to parse the outputs.
+        :raise: * ovs_vsctl.exception.VSCtlCmdExecError -- When the given
+                  command fails.
+                * ovs_vsctl.exception.VSCtlCmdParseError -- When the given
+                  parser fails to parse the outputs.
+                * ValueError -- When `columns` is given to the command other
+                  than 'list' and 'find'.
+                * asyncio.TimeoutError -- When the given command times out.
+        """
+        vsctl = self.vsctl
+        prepared = vsctl.prepare(command, table_format, data_format,
+                                 parser, columns)
+
+        if vsctl.cache is not None:
+            try:
+                return vsctl.get_cached(prepared)
+            except KeyError:
+                pass
+
+        return await self._execute(prepared, timeout)
+
+    async def run_batch(self, commands, table_format='list',
+                        data_format='string', timeout=_DEFAULT_TIMEOUT):
+        """
+        Executes multiple ovs-vsctl commands in a single invocation of
+        'ovs-vsctl'.
+
+        The same as `ovs_vsctl.VSCtl.run_batch()`.
+
+        :param commands: list of tuples of command and parser.
+        :param table_format: Table format. Only `'list'` and `'json'` are
+         available.
+        :param data_format: Cell format in table.
+        :param timeout: Timeout in seconds. Meaning is the same as `run()`.
+        :return: list of the parsed outputs corresponding to `commands`.
+        :raise: * ovs_vsctl.exception.VSCtlCmdExecError -- When the given
+                  commands fail.
+                * ovs_vsctl.exception.VSCtlCmdParseError -- When the given
+                  parser fails to parse the outputs.
+                * ValueError -- When the given table format is not
+                  supported, or the parsers of the tables take different
+                  data formats.
+                * asyncio.TimeoutError -- When the given commands time out.
+        """
+        return await self._execute(
+            self.vsctl.prepare_batch(commands, table_format, data_format),
+            timeout)
+
+    async def _execute(self, prepared, timeout):
+        """
+        Executes the prepared command and reports its invocation (if
+        measured) to the metrics.
+        """
+        invocation = prepared.invocation
+        if invocation is None:
+            return await self._execute_and_finish(prepared, timeout)
+        try:
+            return await self._execute_and_finish(prepared, timeout)
+        except Exception as e:  # pylint: disable=invalid-name
+            invocation.error = e
+            raise
+        finally:
+            self.vsctl.metrics(invocation)
+
+    async def _execute_and_finish(self, prepared, timeout):
+        if timeout is _DEFAULT_TIMEOUT:
+            timeout = self.timeout
+        try:
+            process, wall = await asyncio.wait_for(
+                self._execute_limited(prepared.args), timeout)
+        finally:
+            self.vsctl.invalidate(prepared)
+        return self.vsctl.finish(prepared, process, wall)
+
+    async def _execute_limited(self, args):
+        vsctl = self.vsctl
+        async with self.semaphore:
+            start = time.perf_counter()
+            if (isinstance(vsctl.backend, SubprocessBackend)
+                    and isinstance(vsctl.spawner, PopenSpawner)):
+                process = await _communicate(args)
+            else:
+                loop = asyncio.get_running_loop()
+                process = await loop.run_in_executor(
+                    None, vsctl.backend.execute, args)
+            return process, time.perf_counter() - start
+
+    def close(self):
+        """
+        Releases the resources held by `vsctl`. See `ovs_vsctl.VSCtl`.
+        """
+        self.vsctl.close()
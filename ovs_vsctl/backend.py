@@ -0,0 +1,588 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Backends which execute 'ovs-vsctl' command arguments for `VSCtl`.
+
+A backend is a class (or callable) which takes an instance of `VSCtl` and
+returns an object providing `execute(args, stream=False)` and `close()`
+methods. `execute()` takes the full command arguments of 'ovs-vsctl' and
+returns an object which has the same interface as 'subprocess.Popen' after
+the process terminated. If `stream` is `True`, the returned object may be
+still running, and its `stdout` is read as a stream until `wait()`.
+"""
+
+import json
+import re
+
+from ovs_vsctl import datum
+from ovs_vsctl import exception
+from ovs_vsctl import jsonrpc
+from ovs_vsctl import utils
+from ovs_vsctl.schema import Schema
+
+# Options which apply to the whole 'ovs-vsctl' invocation.
+_GLOBAL_OPTIONS = ('--db', '--format', '--data', '--timeout', '--oneline')
+
+# Options of the emulated commands.
+_COMMAND_OPTIONS = {
+    'list': ('--columns',),
+    'find': ('--columns',),
+}
+
+# Table formats and cell formats supported by `JsonRpcBackend`.
+_TABLE_FORMATS = ('list', 'json')
+_DATA_FORMATS = ('json', 'string')
+
+# e.g.) 'name=br1', 'external_ids:iface-id="vm1"', 'tag!=100'
+_CONDITION = re.compile(
+    r'^(?P<column>[^:=!<>{}]+)'
+    r'(?::(?P<key>"(?:[^"\\]|\\.)*"|[^=!<>{}]*))?'
+    r'(?P<op>=|!=)(?P<value>.*)$')
+
+
+class SubprocessBackend():
+    """
+    Default backend which executes 'ovs-vsctl' command in a child process.
+
+    :param vsctl: Instance of `VSCtl`.
+    """
+
+    def __init__(self, vsctl):
+        self.vsctl = vsctl
+
+    def execute(self, args, stream=False):
+        """
+        Executes the given command arguments with `spawner` of `VSCtl`.
+
+        :param args: Command arguments of 'ovs-vsctl'.
+        :param stream: If `True`, returns without waiting for the command
+         to terminate. The streaming commands are always spawned with
+         'subprocess.Popen'.
+        :return: Instance of `ovs_vsctl.utils.Process` or
+         `ovs_vsctl.utils.StreamingProcess`.
+        """
+        if stream:
+            return utils.run(args, stream=True)
+        return self.vsctl.spawner.run(args)
+
+    def close(self):
+        """
+        Does nothing because no resource is held.
+        """
+
+
+class _Unsupported(Exception):
+    """
+    Raised when the command cannot be emulated by `JsonRpcBackend`.
+    """
+
+
+class _CommandError(Exception):
+    """
+    Raised when the emulated command fails like 'ovs-vsctl' does.
+    """
+
+    def __init__(self, message, returncode=1):
+        super().__init__(message)
+        self.returncode = returncode
+
+
+class JsonRpcBackend():
+    """
+    Backend which emulates read-only 'ovs-vsctl' commands over a
+    long-lived OVSDB JSON-RPC (RFC 7047) connection, instead of spawning
+    'ovs-vsctl' and re-downloading the tables for each command.
+
+    The outputs are formatted in the same way as 'ovs-vsctl' command, so
+    the parsers can be applied as they are.
+
+    Emulated commands are 'list', 'find', 'get', 'list-br', 'br-exists',
+    'list-ports' and 'list-ifaces' with '--format=list' or '--format=json'
+    and '--data=json' or '--data=string'. '--columns' option of 'list' and
+    'find' is also emulated. The other commands are executed by the
+    `fallback` backend.
+
+    Example::
+
+        >>> from ovs_vsctl import VSCtl
+        >>> from ovs_vsctl.backend import JsonRpcBackend
+        >>> vsctl = VSCtl('tcp', '127.0.0.1', 6640, backend=JsonRpcBackend)
+
+    :param vsctl: Instance of `VSCtl`.
+    :param timeout: Timeout in seconds for each request.
+    :param ssl_context: Instance of 'ssl.SSLContext' for 'ssl' protocol.
+    :param fallback: Backend class for the commands which cannot be
+     emulated. If `None`, such commands fail.
+    :param database: Database name.
+    """
+
+    def __init__(self, vsctl, timeout=None, ssl_context=None,
+                 fallback=SubprocessBackend, database='Open_vSwitch'):
+        self.connection = jsonrpc.Connection(
+            vsctl.ovsdb_addr, timeout=timeout, ssl_context=ssl_context)
+        self.fallback = fallback(vsctl) if fallback else None
+        self.database = database
+        self._schema = None
+
+    @property
+    def schema(self):
+        """
+        Returns `ovs_vsctl.schema.Schema` of the database, which is
+        retrieved at the first access.
+        """
+        if self._schema is None:
+            self._schema = Schema.from_json(
+                self.connection.get_schema(self.database))
+        return self._schema
+
+    def close(self):
+        """
+        Closes the connection to OVSDB server.
+        """
+        self.connection.close()
+        if self.fallback is not None:
+            self.fallback.close()
+
+    def execute(self, args, stream=False):
+        """
+        Executes the given command arguments.
+
+        :param args: Command arguments of 'ovs-vsctl'.
+        :param stream: Passed to the `fallback` backend. The emulated
+         commands always complete before returning.
+        :return: Instance of `ovs_vsctl.utils.Process`.
+        """
+        try:
+            options, commands = _parse_args(args[1:])
+            context = _Context(self, options)
+            for command in commands:
+                context.prepare(command)
+        except _Unsupported:
+            if self.fallback is None:
+                return utils.Process(
+                    args, 1, stderr='ovs-vsctl: unsupported command\n')
+            return self.fallback.execute(args, stream=stream)
+        except _CommandError as e:  # pylint: disable=invalid-name
+            return utils.Process(args, e.returncode,
+                                 stderr='ovs-vsctl: %s\n' % e)
+        except exception.VSCtlRpcError as e:  # pylint: disable=invalid-name
+            return utils.Process(args, 1, stderr='ovs-vsctl: %s\n' % e)
+
+        try:
+            context.fetch()
+            outputs = [context.run(command) for command in commands]
+            if '--oneline' in options:
+                outputs = [_oneline(name, output)
+                           for (_, name, _), output in zip(commands, outputs)]
+        except _CommandError as e:  # pylint: disable=invalid-name
+            stderr = 'ovs-vsctl: %s\n' % e if str(e) else ''
+            return utils.Process(args, e.returncode, stderr=stderr)
+        except exception.VSCtlRpcError as e:  # pylint: disable=invalid-name
+            return utils.Process(args, 1, stderr='ovs-vsctl: %s\n' % e)
+
+        return utils.Process(args, 0, stdout=''.join(outputs))
+
+
+def _oneline(name, output):
+    """
+    Formats the output of a command in a single line as '--oneline' option
+    does. Tables are printed as they are.
+    """
+    if name in utils.TABLE_COMMANDS:
+        return output
+    if output.endswith('\n'):
+        output = output[:-1]
+    return output.replace('\\', '\\\\').replace('\n', '\\n') + '\n'
+
+
+def _parse_args(args):
+    """
+    Splits the arguments of 'ovs-vsctl' into global options and commands.
+
+    :param args: Command arguments of 'ovs-vsctl' excluding the executable.
+    :return: tuple of dict of global options and list of commands. Each
+     command is a tuple of dict of options, command name and arguments.
+    """
+    options = {}
+    commands = []
+    segments = [[]]
+    for arg in args:
+        if arg == '--':
+            segments.append([])
+        else:
+            segments[-1].append(arg)
+
+    for segment in segments:
+        command_options = {}
+        while segment and segment[0].startswith('-'):
+            name, _, value = segment.pop(0).partition('=')
+            if name in _GLOBAL_OPTIONS:
+                options[name] = value
+            else:
+                command_options[name] = value
+        if not segment:
+            if command_options:
+                raise _Unsupported()
+            continue
+        commands.append((command_options, segment[0], segment[1:]))
+
+    if (options.get('--format', 'list') not in _TABLE_FORMATS
+            or options.get('--data', 'string') not in _DATA_FORMATS):
+        raise _Unsupported()
+
+    return options, commands
+
+
+class _Context():
+    """
+    Executes the emulated commands against a snapshot of the tables which
+    is fetched by a single 'transact' request. The tables read only by the
+    commands with '--columns' option are fetched with the needed columns.
+    """
+
+    def __init__(self, backend, options):
+        self.backend = backend
+        self.schema = backend.schema
+        self.table_format = options.get('--format', 'list')
+        self.data_format = options.get('--data', 'string')
+        self.tables = set()
+        self.rows = {}
+        # Options of the command being executed.
+        self.options = {}
+        # Columns to fetch of the tables read only with '--columns', and
+        # the tables read by the other commands (i.e. all columns needed).
+        self.projections = {}
+        self.full_tables = set()
+        self._touched = set()
+
+    def table(self, name):
+        """
+        Returns `TableSchema` of the given (abbreviated) table `name`.
+        """
+        try:
+            table = self.schema.find_table(name)
+        except ValueError as e:  # pylint: disable=invalid-name
+            raise _CommandError(str(e)) from e
+        self.tables.add(table.name)
+        self._touched.add(table.name)
+        return table
+
+    def prepare(self, command):
+        """
+        Validates the given command and registers the tables it reads.
+        """
+        options, name, args = command
+        if (name not in _COMMANDS
+                or set(options) - set(_COMMAND_OPTIONS.get(name, ()))):
+            raise _Unsupported()
+        prepare, _ = _COMMANDS[name]
+        self._touched = set()
+        prepare(self, args)
+
+        if not options.get('--columns'):
+            self.full_tables.update(self._touched)
+            return
+        self.options = options
+        table = self.table(args[0])
+        # Columns to find the rows and to evaluate the conditions.
+        columns = set(self.columns(table)) | {'_uuid'}
+        if 'name' in table.columns:
+            columns.add('name')
+        if name == 'find':
+            columns.update(_parse_condition(table, arg)[0]
+                           for arg in args[1:])
+        self.projections.setdefault(table.name, set()).update(columns)
+
+    def fetch(self):
+        """
+        Fetches all rows of the registered tables in a transaction.
+        """
+        tables = sorted(self.tables)
+        if not tables:
+            return
+        operations = []
+        for table in tables:
+            operation = {'op': 'select', 'table': table, 'where': []}
+            if table not in self.full_tables:
+                operation['columns'] = sorted(self.projections[table])
+            operations.append(operation)
+        # Only 'select', so safe to retry on a new connection.
+        results = self.backend.connection.transact(
+            self.backend.database, *operations, retry=True)
+        for table, result in zip(tables, results):
+            self.rows[table] = result['rows']
+
+    def run(self, command):
+        """
+        Executes the given command and returns its output.
+        """
+        self.options, name, args = command
+        _, run = _COMMANDS[name]
+        return run(self, args)
+
+    def find_row(self, table, record):
+        """
+        Finds the row identified by `record`, i.e. UUID, name or '.' for
+        the root table which has only one row.
+        """
+        rows = self.rows[table.name]
+        if record == '.' and len(rows) == 1:
+            return rows[0]
+        if utils.is_valid_uuid(record):
+            for row in rows:
+                if row['_uuid'][1] == record:
+                    return row
+        if 'name' in table.columns:
+            for row in rows:
+                if row['name'] == record:
+                    return row
+        raise _CommandError(
+            'no row "%s" in table %s' % (record, table.name))
+
+    def format_cell(self, value, column_type):
+        """
+        Formats the given cell in the data format.
+        """
+        if self.data_format == 'json':
+            return datum.dumps(value, column_type)
+        return datum.to_string(value, column_type)
+
+    def columns(self, table):
+        """
+        Returns the columns to print, i.e. the ones given by '--columns'
+        option if specified, otherwise all the columns.
+        """
+        value = self.options.get('--columns')
+        if not value:
+            return table.column_names()
+        columns = value.split(',')
+        for column in columns:
+            if column not in table.columns:
+                raise _CommandError(
+                    'Table %s does not contain a column whose name matches'
+                    ' "%s"' % (table.name, column))
+        return columns
+
+    def format_table(self, table, rows):
+        """
+        Formats the given rows in the table format.
+        """
+        columns = self.columns(table)
+        if self.table_format == 'json':
+            data = []
+            for row in rows:
+                cells = []
+                for column in columns:
+                    column_type = table.columns[column].type
+                    if self.data_format == 'json':
+                        cells.append(datum.to_json(row[column], column_type))
+                    else:
+                        cells.append(datum.to_string(row[column], column_type))
+                data.append(cells)
+            return json.dumps({'data': data, 'headings': columns},
+                              separators=(',', ':'), sort_keys=True,
+                              ensure_ascii=False) + '\n'
+
+        records = []
+        for row in rows:
+            records.append(''.join(
+                '%-20s: %s\n' % (column, self.format_cell(
+                    row[column], table.columns[column].type))
+                for column in columns))
+        return '\n'.join(records)
+
+
+def _prepare_table(context, args):
+    if not args:
+        raise _CommandError("'list' command requires at least 1 arguments")
+    context.table(args[0])
+
+
+def _prepare_get(context, args):
+    if len(args) < 3:
+        raise _CommandError("'get' command requires at least 3 arguments")
+    context.table(args[0])
+
+
+def _prepare_bridges(context, _):
+    for table in ('Open_vSwitch', 'Bridge', 'Port', 'Interface'):
+        context.table(table)
+
+
+def _prepare_find(context, args):
+    _prepare_table(context, args)
+    table = context.table(args[0])
+    for arg in args[1:]:
+        _parse_condition(table, arg)
+
+
+def _cmd_list(context, args):
+    table = context.table(args[0])
+    if len(args) == 1:
+        rows = context.rows[table.name]
+    else:
+        rows = [context.find_row(table, record) for record in args[1:]]
+    return context.format_table(table, rows)
+
+
+def _parse_condition(table, arg):
+    match = _CONDITION.match(arg)
+    if match is None:
+        raise _Unsupported()
+    column, key, operator, value = match.group('column', 'key', 'op',
+                                               'value')
+    if column not in table.columns:
+        raise _CommandError(
+            'Table %s does not contain a column whose name matches "%s"'
+            % (table.name, column))
+    column_type = table.columns[column].type
+    if value.startswith(('[', '{')):
+        raise _Unsupported()
+
+    try:
+        if key is not None:
+            if not column_type.is_map:
+                raise _CommandError(
+                    'cannot specify key to check for non-map column %s'
+                    % column)
+            key = datum.atom_from_string(key, column_type.key.type)
+            value = datum.atom_from_string(value, column_type.value.type)
+        elif column_type.is_map:
+            raise _Unsupported()
+        else:
+            value = datum.atom_from_string(value, column_type.key.type)
+    except ValueError as e:  # pylint: disable=invalid-name
+        raise _CommandError(str(e)) from e
+
+    return column, key, operator, value
+
+
+def _match_condition(row, condition):
+    column, key, operator, value = condition
+    items = datum.elements(row[column])
+    if key is not None:
+        matched = (key, value) in [tuple(i) for i in items]
+    else:
+        matched = items == [value]
+    return matched if operator == '=' else not matched
+
+
+def _cmd_find(context, args):
+    table = context.table(args[0])
+    conditions = [_parse_condition(table, arg) for arg in args[1:]]
+    rows = [row for row in context.rows[table.name]
+            if all(_match_condition(row, c) for c in conditions)]
+    return context.format_table(table, rows)
+
+
+def _cmd_get(context, args):
+    table = context.table(args[0])
+    row = context.find_row(table, args[1])
+    lines = []
+    for arg in args[2:]:
+        column, _, key = arg.partition(':')
+        if column not in table.columns:
+            raise _CommandError(
+                'Table %s does not contain a column whose name matches "%s"'
+                % (table.name, column))
+        column_type = table.columns[column].type
+        if not key:
+            lines.append(datum.to_string(row[column], column_type))
+            continue
+        if not column_type.is_map:
+            raise _CommandError(
+                'cannot specify key to get for non-map column %s' % column)
+        try:
+            key_atom = datum.atom_from_string(key, column_type.key.type)
+        except ValueError as e:  # pylint: disable=invalid-name
+            raise _CommandError(str(e)) from e
+        for atom, value in datum.elements(row[column]):
+            if atom == key_atom:
+                lines.append(
+                    datum.atom_to_string(value, column_type.value.type))
+                break
+        else:
+            raise _CommandError('no key "%s" in %s record "%s" column %s'
+                                % (key, table.name, args[1], column))
+    return ''.join(line + '\n' for line in lines)
+
+
+def _bridge_rows(context):
+    return dict((row['name'], row) for row in context.rows['Bridge'])
+
+
+def _find_bridge(context, name):
+    bridges = _bridge_rows(context)
+    if name not in bridges:
+        raise _CommandError('no bridge named %s' % name)
+    return bridges[name]
+
+
+def _referred_rows(context, row, column, table):
+    uuids = set(ref[1] for ref in datum.elements(row[column]))
+    return [r for r in context.rows[table] if r['_uuid'][1] in uuids]
+
+
+def _bridge_ports(context, bridge):
+    return [port for port in _referred_rows(context, bridge, 'ports', 'Port')
+            if port['name'] != bridge['name']]
+
+
+def _format_names(names):
+    return ''.join('%s\n' % name for name in sorted(names))
+
+
+def _cmd_list_br(context, _):
+    return _format_names(_bridge_rows(context))
+
+
+def _cmd_br_exists(context, args):
+    if args[0] not in _bridge_rows(context):
+        raise _CommandError('', returncode=2)
+    return ''
+
+
+def _cmd_list_ports(context, args):
+    bridge = _find_bridge(context, args[0])
+    return _format_names(port['name']
+                         for port in _bridge_ports(context, bridge))
+
+
+def _cmd_list_ifaces(context, args):
+    bridge = _find_bridge(context, args[0])
+    names = []
+    for port in _bridge_ports(context, bridge):
+        names.extend(iface['name'] for iface in _referred_rows(
+            context, port, 'interfaces', 'Interface'))
+    return _format_names(names)
+
+
+def _check_bridge_arg(context, args):
+    if len(args) != 1:
+        raise _CommandError('command requires exactly 1 argument')
+    _prepare_bridges(context, args)
+
+
+# Mapping of command name and tuple of preparation and execution functions.
+_COMMANDS = {
+    'list': (_prepare_table, _cmd_list),
+    'find': (_prepare_find, _cmd_find),
+    'get': (_prepare_get, _cmd_get),
+    'list-br': (_prepare_bridges, _cmd_list_br),
+    'br-exists': (_check_bridge_arg, _cmd_br_exists),
+    'list-ports': (_check_bridge_arg, _cmd_list_ports),
+    'list-ifaces': (_check_bridge_arg, _cmd_list_ifaces),
+}
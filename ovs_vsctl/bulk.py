@@ -0,0 +1,250 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+APIs for provisioning many ports (or any other items) by packing their
+commands into the transactions of 'ovs-vsctl' command.
+"""
+
+import shlex
+import time
+
+from ovs_vsctl.exception import VSCtlCmdExecError
+from ovs_vsctl.datum import atom_to_string
+from ovs_vsctl.datum import python_to_string
+
+DEFAULT_INITIAL_CHUNK = 16
+DEFAULT_MAX_CHUNK = 512
+# Upper bound of the total length of the command arguments, well below the
+# limit of the kernel (ARG_MAX, including the environment variables).
+DEFAULT_MAX_ARGS_SIZE = 128 * 1024
+DEFAULT_TARGET_LATENCY = 1.0
+
+
+def _column_args(columns):
+    for column, value in sorted(columns.items()):
+        if isinstance(value, dict):
+            # Sets each key so that the other keys are kept.
+            for key, atom in sorted(value.items()):
+                yield '%s:%s=%s' % (column, atom_to_string(key),
+                                    atom_to_string(atom))
+        else:
+            yield '%s=%s' % (column, python_to_string(value))
+
+
+def port_commands(bridge, port, may_exist=True, **columns):
+    """
+    Returns the commands which add the port and set the columns of its
+    interface, e.g. for `BulkProvisioner.provision()`.
+
+    Example::
+
+        >>> port_commands('br-int', 'vxlan0', type='vxlan',
+        ...               options={'remote_ip': '192.168.0.2'})
+        ['--may-exist add-port br-int vxlan0',
+         "set Interface vxlan0 'options:remote_ip=\"192.168.0.2\"' type=vxlan"]
+
+    :param bridge: Bridge name.
+    :param port: Port (and interface) name.
+    :param may_exist: If `True`, does not fail if the port already exists.
+    :param columns: Columns of Interface table. dict values are set for
+     each key (i.e. '<column>:<key>=<value>'), and list values are set as
+     sets.
+    :return: list of commands.
+    """
+    commands = ['%sadd-port %s %s' % ('--may-exist ' if may_exist else '',
+                                      shlex.quote(bridge), shlex.quote(port))]
+    if columns:
+        commands.append('set Interface %s %s' % (
+            shlex.quote(port),
+            ' '.join(shlex.quote(a) for a in _column_args(columns))))
+    return commands
+
+
+class ItemResult():  # pylint: disable=too-few-public-methods
+    """
+    Result of provisioning an item.
+
+    :param item: list of the commands of the item.
+    :param error: `ovs_vsctl.exception.VSCtlCmdExecError` if the commands
+     failed, otherwise `None`.
+    """
+
+    def __init__(self, item, error=None):
+        self.item = item
+        self.error = error
+
+    @property
+    def ok(self):  # pylint: disable=invalid-name
+        """
+        `True` if the commands succeeded, otherwise `False`.
+        """
+        return self.error is None
+
+    def __repr__(self):
+        if self.ok:
+            return '%s(item=%r)' % (self.__class__.__name__, self.item)
+        return '%s(item=%r, error=%r)' % (
+            self.__class__.__name__, self.item, self.error)
+
+
+class BulkProvisioner():
+    """
+    Executes the commands of many items (e.g. ports) in chunks, each of
+    which is a single invocation of 'ovs-vsctl' (i.e. a single
+    transaction) with the commands separated by '--'.
+
+    The chunk size adapts to the latency: doubled (up to `max_chunk`) when
+    a chunk completes within `target_latency`, and halved otherwise. The
+    chunks are also limited by the total length of the command arguments.
+    If a chunk fails, nothing in it is committed, and the chunk is bisected
+    to isolate the failing items and commit the others. The bisection stops
+    if both halves fail with the same error as the chunk, e.g. when
+    OVSDB server is not reachable, and the error is reported for all the
+    items in the chunk (including the items which would succeed if the
+    halves fail for the same reason by chance, e.g. referring to the same
+    missing bridge).
+
+    Example::
+
+        >>> from ovs_vsctl import VSCtl
+        >>> from ovs_vsctl.bulk import BulkProvisioner
+        >>> from ovs_vsctl.bulk import port_commands
+        >>> vsctl = VSCtl('tcp', '127.0.0.1', 6640)
+        >>> provisioner = BulkProvisioner(vsctl)
+        >>> results = provisioner.provision(
+        ...     [port_commands('br-int', 'tap%d' % i, type='internal')
+        ...      for i in range(500)])
+        >>> [r for r in results if not r.ok]
+        []
+
+    :param vsctl: Instance of `VSCtl`.
+    :param initial_chunk: Number of items in the first chunk.
+    :param max_chunk: Maximum number of items in a chunk.
+    :param max_args_size: Maximum total length of the command arguments in
+     a chunk (a single item exceeding it is executed alone).
+    :param target_latency: Seconds which an invocation should take.
+    :param timer: Function returning the current time in seconds.
+    :raise: * ValueError -- When the given parameter is invalid.
+    """
+
+    def __init__(self, vsctl, initial_chunk=DEFAULT_INITIAL_CHUNK,
+                 max_chunk=DEFAULT_MAX_CHUNK,
+                 max_args_size=DEFAULT_MAX_ARGS_SIZE,
+                 target_latency=DEFAULT_TARGET_LATENCY,
+                 timer=time.perf_counter):
+        if not 1 <= initial_chunk <= max_chunk:
+            raise ValueError('Invalid chunk sizes: %s, %s'
+                             % (initial_chunk, max_chunk))
+        self.vsctl = vsctl
+        self.chunk_size = initial_chunk
+        self.max_chunk = max_chunk
+        self.max_args_size = max_args_size
+        self.target_latency = target_latency
+        self.timer = timer
+        # Number of the invocations of 'ovs-vsctl'.
+        self.invocations = 0
+
+    def provision(self, items):
+        """
+        Executes the commands of the given items.
+
+        :param items: Iterable of the items, each of which is a command or
+         list of commands executed in the same transaction, e.g. the result
+         of `port_commands()`.
+        :return: list of `ItemResult` corresponding to `items`.
+        """
+        items = [[i] if isinstance(i, str) else list(i) for i in items]
+        sizes = [sum(len(a) + 1 for c in i for a in shlex.split(c))
+                 + 3 * len(i) for i in items]
+        results = [None] * len(items)
+
+        start = 0
+        while start < len(items):
+            end = start + 1
+            size = sizes[start]
+            while (end < len(items) and end - start < self.chunk_size
+                   and size + sizes[end] <= self.max_args_size):
+                size += sizes[end]
+                end += 1
+
+            began = self.timer()
+            if self._execute(items, start, end, results):
+                self._adapt(end - start, self.timer() - began)
+            start = end
+
+        return results
+
+    def _adapt(self, n_items, latency):
+        if latency > self.target_latency:
+            self.chunk_size = max(1, n_items // 2)
+        elif n_items >= self.chunk_size:
+            self.chunk_size = min(self.max_chunk, self.chunk_size * 2)
+
+    def _execute(self, items, start, end, results):
+        """
+        Executes items[start:end] in a single transaction, bisecting it if
+        failed. Returns `True` if succeeded without bisecting.
+        """
+        error = self._run(items, start, end, results)
+        if error is None:
+            return True
+        if end - start == 1:
+            results[start] = ItemResult(items[start], error=error)
+        else:
+            self._bisect(items, start, end, results, error)
+        return False
+
+    def _run(self, items, start, end, results):
+        """
+        Executes items[start:end] in a single transaction. Returns the
+        error if failed, otherwise `None`.
+        """
+        commands = [c for i in items[start:end] for c in i]
+        self.invocations += 1
+        try:
+            self.vsctl.run(' -- '.join(commands))
+        except VSCtlCmdExecError as e:  # pylint: disable=invalid-name
+            return e
+
+        for i in range(start, end):
+            results[i] = ItemResult(items[i])
+        return None
+
+    def _bisect(self, items, start, end, results, error):
+        """
+        Isolates the items which make items[start:end] fail with `error`.
+
+        If both halves fail with the same error, the failure is not
+        specific to the items (e.g. the connection to OVSDB server failed),
+        so the error is reported for all the items without bisecting
+        further.
+        """
+        middle = (start + end) // 2
+        halves = ((start, middle), (middle, end))
+        errors = [self._run(items, first, stop, results)
+                  for first, stop in halves]
+        if all(e is not None and str(e) == str(error) for e in errors):
+            for i in range(start, end):
+                results[i] = ItemResult(items[i], error=error)
+            return
+
+        for (first, stop), half_error in zip(halves, errors):
+            if half_error is None:
+                continue
+            if stop - first == 1:
+                results[first] = ItemResult(items[first], error=half_error)
+            else:
+                self._bisect(items, first, stop, results, half_error)
@@ -0,0 +1,322 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Read-through cache for the outputs of 'ovs-vsctl' command.
+"""
+
+from collections import OrderedDict
+import threading
+import time
+
+DEFAULT_MAXSIZE = 128
+DEFAULT_TTL = 1.0
+
+# Strong references between the tables of Open_vSwitch database. The rows
+# no longer referred by the others are deleted by OVSDB (e.g. the ports
+# and interfaces by 'set Bridge br0 ports=[]'), so the writes to a table
+# may delete the rows of the tables referred from it.
+_STRONG_REFERENCES = {
+    'open_vswitch': ('bridge', 'manager', 'ssl', 'datapath'),
+    'bridge': ('port', 'mirror', 'netflow', 'sflow', 'ipfix', 'controller',
+               'flow_table', 'autoattach'),
+    'port': ('interface', 'qos'),
+    'qos': ('queue',),
+    'datapath': ('ct_zone',),
+    'ct_zone': ('ct_timeout_policy',),
+}
+
+# Weak references between the tables. The references to the deleted rows
+# are removed from the referring rows by OVSDB.
+_WEAK_REFERENCES = {
+    'mirror': ('port',),
+    'flow_sample_collector_set': ('bridge', 'ipfix'),
+}
+
+
+def _canonical_table(table):
+    # 'ovs-vsctl' accepts the unique abbreviations of table names.
+    table = table.lower()
+    for name in _STRONG_REFERENCES:
+        if name.startswith(table):
+            return name
+    return table
+
+
+def _written_tables(tables):
+    """
+    Returns the tables which may be changed by the writes to the given
+    tables, following the strong references (and the weak references
+    referring to those tables).
+    """
+    written = set()
+    pending = [_canonical_table(t) for t in tables]
+    while pending:
+        table = pending.pop()
+        if table not in written:
+            written.add(table)
+            pending.extend(_STRONG_REFERENCES.get(table, ()))
+    written.update(table for table, referred in _WEAK_REFERENCES.items()
+                   if written.intersection(referred))
+    return written
+
+
+# Tables touched by adding or deleting bridges, ports and interfaces.
+_BRIDGE_TABLES = frozenset(['open_vswitch']) | _written_tables(['bridge'])
+
+# Read-only commands and the tables they read. `None` means all tables.
+_READ_COMMANDS = {
+    'show': None,
+    'list-br': ('bridge',),
+    'br-exists': ('bridge',),
+    'br-to-vlan': ('bridge',),
+    'br-to-parent': ('bridge',),
+    'br-get-external-id': ('bridge',),
+    'list-ports': ('bridge', 'port'),
+    'list-ifaces': ('bridge', 'port', 'interface'),
+    'port-to-br': ('bridge', 'port'),
+    'iface-to-br': ('bridge', 'port', 'interface'),
+    'get-controller': ('bridge', 'controller'),
+    'get-fail-mode': ('bridge',),
+    'get-manager': ('open_vswitch', 'manager'),
+    'get-ssl': ('open_vswitch', 'ssl'),
+}
+
+# Commands which mutate the tables other than the given table.
+_WRITE_COMMANDS = {
+    'init': ('open_vswitch',),
+    'add-br': _BRIDGE_TABLES,
+    'del-br': _BRIDGE_TABLES,
+    'add-port': _BRIDGE_TABLES,
+    'del-port': _BRIDGE_TABLES,
+    'add-bond': _BRIDGE_TABLES,
+    'add-bond-iface': _BRIDGE_TABLES,
+    'del-bond-iface': _BRIDGE_TABLES,
+    'br-set-external-id': ('bridge',),
+    'set-controller': ('bridge', 'controller'),
+    'del-controller': ('bridge', 'controller'),
+    'set-fail-mode': ('bridge',),
+    'del-fail-mode': ('bridge',),
+    'set-manager': ('open_vswitch', 'manager'),
+    'del-manager': ('open_vswitch', 'manager'),
+    'set-ssl': ('open_vswitch', 'ssl'),
+    'del-ssl': ('open_vswitch', 'ssl'),
+}
+
+# Database commands which take the table name as the first argument.
+_TABLE_READ_COMMANDS = ('list', 'find', 'get')
+_TABLE_WRITE_COMMANDS = ('set', 'add', 'remove', 'clear', 'create',
+                         'destroy')
+
+
+def _iter_commands(args):
+    """
+    Yields the tuple of command name and its arguments for each command
+    separated by '--' in `args`, skipping the options.
+    """
+    command = []
+    for arg in args:
+        if arg == '--':
+            if command:
+                yield command[0], command[1:]
+            command = []
+        elif not arg.startswith('-'):
+            command.append(arg)
+    if command:
+        yield command[0], command[1:]
+
+
+def command_tables(args):
+    """
+    Returns whether the given 'ovs-vsctl' command arguments are read-only
+    and the names of the tables they read or write. The written tables
+    include the tables whose rows may be deleted (or changed) by OVSDB as
+    the result, e.g. Port and Interface for the writes to Bridge.
+
+    Example::
+
+        >>> command_tables(['ovs-vsctl', '--db=tcp:127.0.0.1:6640',
+        ...                 'get', 'Port', 's1-eth1', 'tag'])
+        (True, frozenset({'port'}))
+        >>> command_tables(['ovs-vsctl', 'set', 'Port', 's1-eth1', 'tag=1'])
+        (False, frozenset({'port', 'interface', 'qos', 'queue', 'mirror'}))
+
+    :param args: Command arguments for 'ovs-vsctl' (the first element is
+     the path to the executable).
+    :return: Tuple of `True` if read-only and frozenset of lower cased table
+     names. The table names are `None` if the command may touch any table.
+    """
+    read_only = True
+    tables = set()
+    for name, cmd_args in _iter_commands(args[1:]):
+        if name in _TABLE_READ_COMMANDS:
+            touched = cmd_args[:1]
+        elif name in _TABLE_WRITE_COMMANDS:
+            read_only = False
+            touched = _written_tables(cmd_args[:1])
+        elif name in _READ_COMMANDS:
+            touched = _READ_COMMANDS[name]
+        elif name in _WRITE_COMMANDS:
+            read_only = False
+            touched = _WRITE_COMMANDS[name]
+        else:
+            # Unknown command, e.g. 'emer-reset', may touch any table.
+            return False, None
+
+        if touched is None:
+            tables = None
+        elif tables is not None:
+            tables.update(t.lower() for t in touched)
+
+    return read_only, (None if tables is None else frozenset(tables))
+
+
+def _overlaps(tables, other):
+    if tables is None or other is None:
+        return True
+    # 'ovs-vsctl' accepts the unique abbreviations of table names.
+    return any(t.startswith(o) or o.startswith(t)
+               for t in tables for o in other)
+
+
+class ResultCache():
+    """
+    LRU cache for the outputs of the read-only commands with TTL.
+
+    When a mutating command (e.g. 'set', 'add-port' or 'del-br') is
+    executed through `VSCtl` which has this cache, the cached outputs
+    reading the affected tables on the same target are invalidated.
+    The changes made by others are visible only after TTL expires.
+
+    The cached outputs are shared by the callers, so must not be modified.
+
+    Example::
+
+        >>> from ovs_vsctl import VSCtl
+        >>> from ovs_vsctl import get_cmd_parser
+        >>> from ovs_vsctl.cache import ResultCache
+        >>> cache = ResultCache(maxsize=1024, ttl=5)
+        >>> vsctl = VSCtl('tcp', '127.0.0.1', 6640, cache=cache)
+        >>> vsctl.run('get Port s1-eth1 tag', parser=get_cmd_parser)
+        100
+        >>> vsctl.run('get Port s1-eth1 tag', parser=get_cmd_parser)
+        100
+        >>> cache.hits, cache.misses
+        (1, 1)
+
+    :param maxsize: Maximum number of the cached outputs.
+    :param ttl: Seconds to keep the cached outputs.
+    :param timer: Function returning the current time in seconds.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, ttl=DEFAULT_TTL,
+                 timer=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def hit_ratio(self):
+        """
+        Ratio of the hits to the lookups, or 0.0 if not looked up yet.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / float(lookups) if lookups else 0.0
+
+    def get(self, target, args, parser):
+        """
+        Returns the cached output of the given command.
+
+        :param target: OVSDB server address, e.g. `VSCtl.ovsdb_addr`.
+        :param args: Command arguments for 'ovs-vsctl'.
+        :param parser: Parser applied to the outputs.
+        :return: Cached output.
+        :raise: * KeyError -- When not cached, expired or not cacheable.
+        """
+        key = (target, tuple(args), parser)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= self.timer():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                raise KeyError(key)
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, target, args, parser, output):
+        """
+        Caches the output of the given command if the command is read-only.
+
+        :param target: OVSDB server address, e.g. `VSCtl.ovsdb_addr`.
+        :param args: Command arguments for 'ovs-vsctl'.
+        :param parser: Parser applied to the outputs.
+        :param output: Output to cache.
+        """
+        read_only, tables = command_tables(args)
+        if not read_only:
+            return
+
+        key = (target, tuple(args), parser)
+        with self._lock:
+            self._entries[key] = (self.timer() + self.ttl, tables, output)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, target=None, tables=None):
+        """
+        Removes the cached outputs which read the given tables.
+
+        :param target: OVSDB server address. `None` means all targets.
+        :param tables: Iterable of table names. `None` means all tables.
+        """
+        if tables is not None:
+            tables = frozenset(t.lower() for t in tables)
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if ((target is None or key[0] == target)
+                        and _overlaps(entry[1], tables)):
+                    del self._entries[key]
+
+    def notify(self, target, args):
+        """
+        Invalidates the cached outputs affected by the executed command.
+
+        Does nothing if the command is read-only.
+
+        :param target: OVSDB server address, e.g. `VSCtl.ovsdb_addr`.
+        :param args: Command arguments for 'ovs-vsctl' executed.
+        """
+        read_only, tables = command_tables(args)
+        if not read_only:
+            self.invalidate(target, tables)
+
+    def clear(self):
+        """
+        Removes all the cached outputs and resets the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
@@ -0,0 +1,334 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Column-oriented representation of the outputs of 'ovs-vsctl list' and
+'ovs-vsctl find' command.
+
+The numeric columns are stored in NumPy arrays if NumPy is installed,
+otherwise in 'array.array', so that the aggregations over thousands of rows
+do not create Python objects for each row.
+"""
+
+from array import array
+import itertools
+
+from ovs_vsctl.parser import json_columns_parser
+from ovs_vsctl.parser import Record
+
+try:
+    import numpy  # pylint: disable=import-error
+except ImportError:
+    numpy = None  # pylint: disable=invalid-name
+
+# Type codes of 'array.array' (and dtypes of NumPy) for the numeric columns.
+_INTEGER = 'q'
+_REAL = 'd'
+_BOOLEAN = '?'
+
+if numpy is not None:
+    _DTYPES = {
+        _INTEGER: numpy.int64,
+        _REAL: numpy.float64,
+        _BOOLEAN: numpy.bool_,
+    }
+
+
+def _type_code(values):
+    types = set(type(v) for v in values)
+    if types == set([int]):
+        return _INTEGER
+    if types and types <= set([int, float]):
+        return _REAL
+    if types == set([bool]):
+        return _BOOLEAN
+    return None
+
+
+def _make_column(values):
+    """
+    Returns the tuple of the array of the given `values` if they are
+    numeric, otherwise the object array (or list if NumPy is not
+    available), and the mask of the rows where the values are missing.
+
+    If the numeric values are missing (i.e. `None`) in some rows, e.g. the
+    keys of the map columns, those rows are filled with zero keeping the
+    type of the array (e.g. int64 for integers) and are true in the mask.
+    Otherwise, the mask is `None`.
+    """
+    code = _type_code([v for v in values if v is not None])
+    missing = None
+    if numpy is not None:
+        if code is None:
+            column = numpy.empty(len(values), dtype=object)
+            for i, value in enumerate(values):
+                column[i] = value
+            return column, None
+        if None in values:
+            missing = numpy.array([v is None for v in values], dtype=bool)
+            values = [0 if v is None else v for v in values]
+        return numpy.array(values, dtype=_DTYPES[code]), missing
+
+    if code in (_INTEGER, _REAL):
+        if None in values:
+            missing = [v is None for v in values]
+        filled = [0 if v is None else v for v in values]
+        try:
+            return array(code, filled), missing
+        except OverflowError:
+            pass
+    return list(values), None
+
+
+def _take(column, indexes):
+    if isinstance(column, array):
+        return array(column.typecode, [column[i] for i in indexes])
+    return [column[i] for i in indexes]
+
+
+def _to_python(value):
+    # Converts NumPy scalars into Python objects.
+    if numpy is not None and isinstance(value, numpy.generic):
+        return value.item()
+    return value
+
+
+class ColumnarTable():
+    """
+    Table of OVSDB which stores the values column by column.
+
+    The map columns (e.g. 'statistics') are expanded into a column for each
+    key named '<column>:<key>' (e.g. 'statistics:rx_bytes') whose values are
+    `None` in the rows not containing the key. The numeric columns keep
+    their types (e.g. int64 for integers) and store zero in those rows,
+    which are tracked in `missing` instead. With NumPy, such columns are
+    returned as the masked arrays (`numpy.ma.MaskedArray`), so the
+    comparisons and the aggregations skip the missing rows.
+
+    Example::
+
+        >>> from ovs_vsctl import VSCtl
+        >>> from ovs_vsctl.columnar import columnar_parser
+        >>> vsctl = VSCtl('tcp', '127.0.0.1', 6640)
+        >>> table = vsctl.run('list interface', parser=columnar_parser)
+        >>> table.sum('statistics:rx_bytes')
+        1234567
+        >>> busy = table.filter(table['statistics:rx_bytes'] > 1000)
+        >>> busy['name']
+        array(['s1-eth1'], dtype=object)
+        >>> busy.to_records()
+        [Record(_uuid='ba7fee67-...', name='s1-eth1', ...)]
+
+    Note that the comparisons of the columns as above need NumPy. Without
+    NumPy, the columns are 'array.array' (or list) and the mask should be
+    built from `values()`, e.g.
+    `[v is not None and v > 1000 for v in table.values(name)]`.
+
+    :param columns: dict of column name and values (array or list).
+    :param maps: dict of map column name and list of its keys.
+    :param length: Number of rows. Defaults to the length of the columns.
+    :param missing: dict of column name and mask (bool array or list) of
+     the rows where the numeric values are missing.
+    """
+
+    def __init__(self, columns, maps=None, length=None, missing=None):
+        self.columns = columns
+        self.maps = maps or {}
+        self.missing = missing or {}
+        if length is None:
+            length = len(next(iter(columns.values()), ()))
+        self.length = length
+
+    @classmethod
+    def from_columns(cls, columns):
+        """
+        Creates the table from dict of column name and list of values, e.g.
+        the result of `ovs_vsctl.json_columns_parser`.
+
+        :param columns: dict of column name and list of values.
+        :return: `ColumnarTable` instance.
+        """
+        arrays = {}
+        maps = {}
+        missing = {}
+        length = 0
+
+        def _add(name, values):
+            arrays[name], mask = _make_column(values)
+            if mask is not None:
+                missing[name] = mask
+
+        for name, values in columns.items():
+            length = len(values)
+            if values and all(isinstance(v, dict) for v in values):
+                keys = sorted(set(k for v in values for k in v))
+                maps[name] = keys
+                for key in keys:
+                    _add('%s:%s' % (name, key), [v.get(key) for v in values])
+            else:
+                _add(name, values)
+
+        return cls(arrays, maps, length, missing)
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Creates the table from list of `ovs_vsctl.parser.Record`, e.g. the
+        result of `ovs_vsctl.list_cmd_parser`.
+
+        :param records: list of `Record` instances.
+        :return: `ColumnarTable` instance.
+        """
+        # pylint: disable=protected-access
+        rows = [dict(r._items()) for r in records]
+        names = sorted(set(n for row in rows for n in row))
+        return cls.from_columns(
+            dict((n, [row.get(n) for row in rows]) for n in names))
+
+    @property
+    def names(self):
+        """
+        Names of the columns including the expanded map columns.
+        """
+        return sorted(self.columns)
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, name):
+        column = self.columns[name]
+        mask = self.missing.get(name)
+        if mask is not None and numpy is not None:
+            # View of the column, not copied.
+            return numpy.ma.masked_array(column, mask)
+        return column
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    def values(self, name):
+        """
+        Returns the values of the given column as list of Python objects.
+
+        :param name: Column name, e.g. 'statistics:rx_bytes'.
+        :return: list of the values, `None` in the rows where missing.
+        """
+        column = self.columns[name]
+        if not isinstance(column, list):
+            column = column.tolist()
+        mask = self.missing.get(name)
+        if mask is None:
+            return column
+        return [None if m else v for v, m in zip(column, mask)]
+
+    def filter(self, mask):
+        """
+        Returns the table containing the rows where `mask` is true.
+
+        :param mask: Iterable of bool for each row, e.g. NumPy bool array.
+         The masked rows of `numpy.ma.MaskedArray` (e.g. the result of
+         comparing the column with missing values) are not selected.
+        :return: `ColumnarTable` instance.
+        """
+        if numpy is not None:
+            if isinstance(mask, numpy.ma.MaskedArray):
+                mask = mask.filled(False)
+            mask = numpy.asarray(mask, dtype=bool)
+            return ColumnarTable(
+                dict((n, c[mask]) for n, c in self.columns.items()),
+                self.maps, int(mask.sum()),
+                dict((n, m[mask]) for n, m in self.missing.items()))
+
+        indexes = [i for i, selected in enumerate(mask) if selected]
+        return ColumnarTable(
+            dict((n, _take(c, indexes)) for n, c in self.columns.items()),
+            self.maps, len(indexes),
+            dict((n, _take(m, indexes)) for n, m in self.missing.items()))
+
+    def sum(self, name, where=None):
+        """
+        Returns the total of the values of the given column, skipping the
+        missing values.
+
+        :param name: Column name, e.g. 'statistics:rx_bytes'.
+        :param where: Iterable of bool for each row. If specified, sums up
+         only the rows where `where` is true without copying the table as
+         `filter()` does.
+        :return: Total of the values, e.g. int for integers.
+        """
+        column = self.columns[name]
+        mask = self.missing.get(name)
+        if numpy is not None:
+            if isinstance(where, numpy.ma.MaskedArray):
+                where = where.filled(False)
+            if where is not None:
+                where = numpy.asarray(where, dtype=bool)
+            if mask is not None:
+                where = ~mask if where is None else where & ~mask
+            if where is not None:
+                column = column[where]
+            if column.dtype != object:
+                return _to_python(column.sum())
+        else:
+            if mask is not None:
+                present = (not m for m in mask)
+                where = (present if where is None else
+                         (w and p for w, p in zip(where, present)))
+            if where is not None:
+                column = itertools.compress(column, where)
+
+        return sum(v for v in column if v is not None)
+
+    def to_records(self):
+        """
+        Converts the table into list of `ovs_vsctl.parser.Record`, merging
+        the expanded map columns into dict.
+
+        :return: list of `Record` instances.
+        """
+        expanded = set('%s:%s' % (name, key)
+                       for name, keys in self.maps.items() for key in keys)
+        scalars = [n for n in self.columns if n not in expanded]
+        values = dict((n, self.values(n)) for n in self.columns)
+
+        records = []
+        for i in range(len(self)):
+            kwargs = dict((n, values[n][i]) for n in scalars)
+            for name, keys in self.maps.items():
+                pairs = {}
+                for key in keys:
+                    value = values['%s:%s' % (name, key)][i]
+                    if value is not None:
+                        pairs[key] = value
+                kwargs[name] = pairs
+            records.append(Record(**kwargs))
+        return records
+
+
+def columnar_parser(buf):
+    """
+    Parser for 'ovs-vsctl list' and 'ovs-vsctl find' command which returns
+    `ColumnarTable`.
+
+    Takes the outputs with '--format=json' and '--data=json' options the
+    same as `ovs_vsctl.json_columns_parser`.
+
+    :param buf: str type output of 'ovs-vsctl list' command.
+    :return: `ColumnarTable` instance.
+    """
+    return ColumnarTable.from_columns(json_columns_parser(buf))
+
+
+columnar_parser.table_format = 'json'
@@ -0,0 +1,229 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Conversions of OVSDB values (RFC 7047, section 5.1) into the formats which
+'ovs-vsctl' command prints with '--data=json' and '--data=string' options.
+"""
+
+import json
+import string
+
+from ovs_vsctl.utils import is_valid_uuid
+
+# Characters which are printed without quotes by 'ovs-vsctl'.
+_BARE_FIRST_CHARS = frozenset(string.ascii_letters + '_')
+_BARE_CHARS = frozenset(string.ascii_letters + '_-.')
+
+_ENCODER = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
+
+
+def elements(value):
+    """
+    Returns the elements of the given OVSDB `value` in <value> notation.
+
+    e.g.)
+      ["set",[1,2]]                   --> [1, 2]
+      ["map",[["k","v"]]]             --> [("k", "v")]
+      ["uuid","79c26f92-..."]         --> [["uuid", "79c26f92-..."]]
+      "br1"                           --> ["br1"]
+
+    :param value: <value> of OVSDB.
+    :return: list of atoms, or list of key-value tuples if a map.
+    """
+    if isinstance(value, list) and value:
+        if value[0] == 'set':
+            return list(value[1])
+        if value[0] == 'map':
+            return [tuple(pair) for pair in value[1]]
+    return [value]
+
+
+def is_map_value(value):
+    """
+    Returns `True` if the given OVSDB `value` is in <map> notation.
+
+    :param value: <value> of OVSDB.
+    :return: `True` if a map, else `False`.
+    """
+    return isinstance(value, list) and bool(value) and value[0] == 'map'
+
+
+def to_json(value, column_type=None):
+    """
+    Returns the given OVSDB `value` in the notation which 'ovs-vsctl' prints
+    with '--data=json' option, i.e. single element sets are printed as its
+    atom and maps are always printed as <map>.
+
+    :param value: <value> of OVSDB.
+    :param column_type: `ovs_vsctl.schema.ColumnType` of the column.
+    :return: Normalized <value>.
+    """
+    if is_map_value(value) or (column_type is not None and column_type.is_map):
+        return ['map', [list(pair) for pair in elements(value)]]
+
+    atoms = elements(value)
+    if len(atoms) == 1:
+        return atoms[0]
+    return ['set', atoms]
+
+
+def dumps(value, column_type=None):
+    """
+    Returns str representation of the given OVSDB `value` formatted in the
+    same way as 'ovs-vsctl --data=json'.
+
+    :param value: <value> of OVSDB.
+    :param column_type: `ovs_vsctl.schema.ColumnType` of the column.
+    :return: str type value.
+    """
+    return _ENCODER.encode(to_json(value, column_type))
+
+
+def string_needs_quotes(value):
+    """
+    Returns `True` if the given str `value` should be quoted in the
+    'ovs-vsctl --data=string' format.
+
+    :param value: str type value.
+    :return: `True` if needs quotes, else `False`.
+    """
+    if not value or value[0] not in _BARE_FIRST_CHARS:
+        return True
+    for char in value[1:]:
+        if char not in _BARE_CHARS:
+            return True
+    if value in ('true', 'false'):
+        return True
+    return is_valid_uuid(value)
+
+
+def atom_to_string(atom, atom_type=None):
+    """
+    Returns str representation of the given OVSDB `atom` in the
+    'ovs-vsctl --data=string' format.
+
+    :param atom: <atom> of OVSDB.
+    :param atom_type: Name of atomic type of `atom`, if known.
+    :return: str type value.
+    """
+    if isinstance(atom, list):
+        # ["uuid",<uuid>] or ["named-uuid",<id>]
+        return atom[1]
+    if isinstance(atom, bool):
+        return 'true' if atom else 'false'
+    if atom_type == 'real' or isinstance(atom, float):
+        return '%.*g' % (15, atom)
+    if isinstance(atom, int):
+        return '%d' % atom
+    if string_needs_quotes(atom):
+        return json.dumps(atom, ensure_ascii=False)
+    return atom
+
+
+def to_string(value, column_type=None):
+    """
+    Returns str representation of the given OVSDB `value` in the
+    'ovs-vsctl --data=string' format.
+
+    e.g.)
+      "br1"                             --> '"br1"'
+      ["set",[100,200]]                 --> '[100, 200]'
+      ["map",[["stp-enable","true"]]]   --> '{stp-enable="true"}'
+
+    :param value: <value> of OVSDB.
+    :param column_type: `ovs_vsctl.schema.ColumnType` of the column.
+    :return: str type value.
+    """
+    key_type = value_type = None
+    if column_type is not None:
+        key_type = column_type.key.type
+        if column_type.value is not None:
+            value_type = column_type.value.type
+
+    is_map = is_map_value(value) or (
+        column_type is not None and column_type.is_map)
+    items = elements(value)
+    if is_map:
+        body = ', '.join(
+            '%s=%s' % (atom_to_string(k, key_type),
+                       atom_to_string(v, value_type))
+            for k, v in items)
+    else:
+        body = ', '.join(atom_to_string(a, key_type) for a in items)
+
+    is_set = column_type is not None and column_type.n_max > 1
+    if is_map:
+        return '{%s}' % body
+    if is_set or len(items) != 1:
+        return '[%s]' % body
+    return body
+
+
+def python_to_string(value):
+    """
+    Returns str representation of the given Python value in the
+    'ovs-vsctl --data=string' format, e.g. for the arguments of 'set' and
+    'find' commands.
+
+    The value is in the same types as `ovs_vsctl.list_cmd_parser` returns,
+    i.e. atom, list (or tuple, set and `None` for empty) for sets and dict
+    for maps.
+
+    e.g.)
+      "br"                        --> 'br'
+      "br 1"                      --> '"br 1"'
+      [200, 100]                  --> '[100, 200]'
+      {"stp-enable": "true"}      --> '{stp-enable="true"}'
+
+    :param value: Python value.
+    :return: str type value.
+    """
+    if isinstance(value, dict):
+        return '{%s}' % ', '.join(
+            '%s=%s' % (atom_to_string(k), atom_to_string(v))
+            for k, v in sorted(value.items()))
+    if value is None or isinstance(value, (list, tuple, set, frozenset)):
+        return '[%s]' % ', '.join(
+            atom_to_string(a) for a in sorted(value or []))
+    return atom_to_string(value)
+
+
+def atom_from_string(buf, atom_type):
+    """
+    Parses the given `buf` as an atom in the 'ovs-vsctl --data=string'
+    format (e.g. a value of conditions of 'ovs-vsctl find' command).
+
+    :param buf: str type value.
+    :param atom_type: Name of atomic type.
+    :return: <atom> of OVSDB.
+    :raise: * ValueError -- When `buf` is not a valid atom.
+    """
+    if buf.startswith('"'):
+        buf = json.loads(buf)
+
+    if atom_type == 'integer':
+        return int(buf)
+    if atom_type == 'real':
+        return float(buf)
+    if atom_type == 'boolean':
+        if buf not in ('true', 'false'):
+            raise ValueError('"%s" is not a valid boolean' % buf)
+        return buf == 'true'
+    if atom_type == 'uuid':
+        if not is_valid_uuid(buf):
+            raise ValueError('"%s" is not a valid UUID' % buf)
+        return ['uuid', buf]
+    return buf
@@ -0,0 +1,312 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Schema-aware decoders for the outputs of 'ovs-vsctl' command.
+
+The decoders are compiled from the column types of OVSDB schema once, and
+convert each cell into the Python value of the column type without
+guessing, e.g. sets are always list even if containing a single element,
+and empty optional values are `None`.
+"""
+
+import json
+
+from ovs_vsctl.parser import _iter_lines
+from ovs_vsctl.parser import _record_value_parser
+from ovs_vsctl.parser import _scan_string_value
+from ovs_vsctl.parser import Record
+from ovs_vsctl.schema import Schema
+
+_EMPTY_SET = '["set",[]]'
+
+
+def _json_string(buf):
+    if '\\' in buf:
+        return json.loads(buf)
+    # No escape sequences, strips the quotes.
+    return buf[1:-1]
+
+
+# Decoders of atoms printed with '--data=json' option.
+_JSON_ATOM_DECODERS = {
+    'integer': int,
+    'real': float,
+    'boolean': lambda buf: buf == 'true',
+    'string': _json_string,
+    # e.g.) ["uuid","79c26f92-86f9-485f-945d-5786c8147f53"]
+    'uuid': lambda buf: buf[len('["uuid","'):-len('"]')],
+}
+
+# Converters of atoms decoded by 'json.loads'.
+_JSON_ELEMENT_DECODERS = {
+    'integer': None,
+    'real': float,
+    'boolean': None,
+    'string': None,
+    'uuid': lambda atom: atom[1],
+}
+
+
+def _string_string(buf):
+    if buf.startswith('"'):
+        return json.loads(buf)
+    return buf
+
+
+# Decoders of atoms printed with '--data=string' option.
+_STRING_ATOM_DECODERS = {
+    'integer': int,
+    'real': float,
+    'boolean': lambda buf: buf == 'true',
+    'string': _string_string,
+    'uuid': lambda buf: buf,
+}
+
+
+def _string_elements(buf, kind, key, value=None):
+    """
+    Returns the given set (if `kind` is '[') or map (if `kind` is '{')
+    printed with '--data=string' option, converting the atoms with `key`
+    (and `value` for the values of maps).
+    """
+    buf = buf.strip()
+    if buf[:1] != kind:
+        raise ValueError('Invalid value: %s' % buf)
+    return _scan_string_value(buf, key, value)
+
+
+def json_decoder(column_type):
+    """
+    Compiles the decoder of the cells printed with '--data=json' option for
+    the given column type.
+
+    :param column_type: `ovs_vsctl.schema.ColumnType` of the column.
+    :return: Function which takes a cell in str type and returns the value
+     in Python object: list for sets, dict for maps, `None` for empty
+     optional values, otherwise the atom.
+    """
+    key_type = column_type.key.type
+
+    if column_type.is_map:
+        key = _JSON_ELEMENT_DECODERS[key_type]
+        value = _JSON_ELEMENT_DECODERS[column_type.value.type]
+
+        def _map(buf):
+            # e.g.) ["map",[["stp-enable","true"]]]
+            pairs = json.loads(buf)[1]
+            if key is None and value is None:
+                return dict(pairs)
+            return dict(((k if key is None else key(k)),
+                         (v if value is None else value(v)))
+                        for k, v in pairs)
+        return _map
+
+    atom = _JSON_ATOM_DECODERS[key_type]
+    if column_type.n_max > 1:
+        element = _JSON_ELEMENT_DECODERS[key_type]
+
+        def _set(buf):
+            if not buf.startswith('["set",'):
+                # Single element sets are printed as the atom.
+                return [atom(buf)]
+            # e.g.) ["set",[100,200]]
+            atoms = json.loads(buf)[1]
+            if element is None:
+                return atoms
+            return [element(a) for a in atoms]
+        return _set
+
+    if column_type.n_min == 0:
+        def _optional(buf):
+            if buf == _EMPTY_SET:
+                return None
+            return atom(buf)
+        return _optional
+
+    return atom
+
+
+def string_decoder(column_type, key=False):
+    """
+    Compiles the decoder of the values printed with '--data=string' option
+    (e.g. outputs of 'ovs-vsctl get') for the given column type.
+
+    :param column_type: `ovs_vsctl.schema.ColumnType` of the column.
+    :param key: If `True`, compiles the decoder for the values of map
+     (i.e. 'ovs-vsctl get <table> <record> <column>:<key>').
+    :return: Function which takes a value in str type and returns the
+     value in Python object.
+    :raise: * ValueError -- When `key` is `True` for non-map column.
+    """
+    if key:
+        if not column_type.is_map:
+            raise ValueError('Keys are available only for map columns')
+        return _STRING_ATOM_DECODERS[column_type.value.type]
+
+    atom = _STRING_ATOM_DECODERS[column_type.key.type]
+
+    if column_type.is_map:
+        value = _STRING_ATOM_DECODERS[column_type.value.type]
+
+        def _map(buf):
+            # e.g.) {stp-enable="true", stp-priority="100"}
+            return _string_elements(buf, '{', atom, value)
+        return _map
+
+    if column_type.n_max > 1:
+        def _set(buf):
+            # e.g.) [100, 200]
+            return _string_elements(buf, '[', atom)
+        return _set
+
+    if column_type.n_min == 0:
+        def _optional(buf):
+            if buf == '[]':
+                return None
+            return atom(buf)
+        return _optional
+
+    return atom
+
+
+class SchemaDecoder():
+    """
+    Parsers using the decoders compiled for each column of OVSDB schema.
+
+    The parsers are created once for each table (and column) and reused,
+    so can be used as the key of `ovs_vsctl.cache.ResultCache`.
+
+    Example::
+
+        >>> from ovs_vsctl import VSCtl
+        >>> from ovs_vsctl.decoder import SchemaDecoder
+        >>> decoder = SchemaDecoder.load(
+        ...     '/usr/share/openvswitch/vswitch.ovsschema')
+        >>> vsctl = VSCtl('tcp', '127.0.0.1', 6640)
+        >>> vsctl.run('list Port',
+        ...           parser=decoder.list_cmd_parser('Port'))
+        [Record(_uuid='ba7fee67-...', ..., tag=None, trunks=[], ...)]
+        >>> vsctl.run('get Port s1-eth1 trunks',
+        ...           parser=decoder.get_cmd_parser('Port', 'trunks'))
+        [100]
+
+    :param schema: `ovs_vsctl.schema.Schema` instance.
+    """
+
+    def __init__(self, schema):
+        self.schema = schema
+        self._decoders = {}
+        self._parsers = {}
+
+    @classmethod
+    def load(cls, path):
+        """
+        Creates the decoder from OVSDB schema file.
+
+        :param path: Path to the schema file, e.g. 'vswitch.ovsschema'.
+        :return: `SchemaDecoder` instance.
+        """
+        return cls(Schema.load(path))
+
+    def decoders(self, table):
+        """
+        Returns the decoders of the cells printed with '--data=json' option
+        for each column of the given table.
+
+        :param table: (Abbreviated) table name.
+        :return: dict of column name and decoder.
+        :raise: * ValueError -- When the table is not found.
+        """
+        table_schema = self.schema.find_table(table)
+        decoders = self._decoders.get(table_schema.name)
+        if decoders is None:
+            decoders = dict((name, json_decoder(column.type))
+                            for name, column in table_schema.columns.items())
+            self._decoders[table_schema.name] = decoders
+        return decoders
+
+    def list_cmd_parser(self, table):
+        """
+        Returns the parser for 'ovs-vsctl list' and 'ovs-vsctl find' command
+        on the given table.
+
+        The parser is the same as `ovs_vsctl.list_cmd_parser`, except that
+        the values are decoded with the column types. The columns which are
+        not in the schema are decoded as `ovs_vsctl.list_cmd_parser` does.
+
+        :param table: (Abbreviated) table name.
+        :return: Parser function.
+        :raise: * ValueError -- When the table is not found.
+        """
+        key = ('list', self.schema.find_table(table).name)
+        parser = self._parsers.get(key)
+        if parser is None:
+            parser = self._list_cmd_parser(self.decoders(table))
+            self._parsers[key] = parser
+        return parser
+
+    @staticmethod
+    def _list_cmd_parser(decoders):
+        def _parser(buf):
+            records = []
+            kwargs = {}
+            for line in _iter_lines(buf):
+                column, _, value = line.partition(':')
+                if not value:
+                    # Assumption: Each record is separated by empty line.
+                    if kwargs:
+                        records.append(Record(**kwargs))
+                        kwargs = {}
+                    continue
+                column = column.rstrip()
+                value = value.strip()
+                decoder = decoders.get(column)
+                if decoder is None:
+                    kwargs[column] = _record_value_parser(value)
+                else:
+                    kwargs[column] = decoder(value)
+            if kwargs:
+                records.append(Record(**kwargs))
+            return records
+        return _parser
+
+    def get_cmd_parser(self, table, column, key=None):
+        """
+        Returns the parser for 'ovs-vsctl get' command on the given column.
+
+        :param table: (Abbreviated) table name.
+        :param column: Column name.
+        :param key: If not `None`, returns the parser for the value of the
+         given key of the map column (i.e. '<column>:<key>').
+        :return: Parser function.
+        :raise: * ValueError -- When the table or column is not found, or
+                  `key` is given for non-map column.
+        """
+        table_schema = self.schema.find_table(table)
+        if column not in table_schema.columns:
+            raise ValueError('%s does not contain a column whose name '
+                             'matches "%s"' % (table_schema.name, column))
+
+        cache_key = ('get', table_schema.name, column, key is not None)
+        parser = self._parsers.get(cache_key)
+        if parser is None:
+            decoder = string_decoder(table_schema.columns[column].type,
+                                     key=key is not None)
+
+            def parser(buf):
+                return decoder(buf.strip('\n'))
+            self._parsers[cache_key] = parser
+        return parser
@@ -29,3 +29,10 @@ class VSCtlCmdParseError(Exception):
     Raised when user specified parser fails to parse the outputs of
     'ovs-vsctl' command.
     """
+
+
+class VSCtlRpcError(Exception):
+    """
+    Raised when OVSDB server returns an error for JSON-RPC request or
+    the connection to OVSDB server fails.
+    """
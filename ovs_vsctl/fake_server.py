@@ -0,0 +1,729 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+In-memory fake of 'ovsdb-server' for testing and benchmarking without
+Open vSwitch.
+
+Example::
+
+    >>> from ovs_vsctl.fake_server import FakeOVSDBServer
+    >>> server = FakeOVSDBServer()
+    >>> server.start()
+    >>> server.add_bridge('br1', ['port1', 'port2'])
+    >>> server.ovsdb_addr
+    'tcp:127.0.0.1:41523'
+    >>> server.stop()
+"""
+
+import json
+import os
+import socket
+import threading
+import uuid
+
+try:
+    import socketserver
+except ImportError:  # Python 2
+    import SocketServer as socketserver  # pylint: disable=import-error
+
+from ovs_vsctl import datum
+from ovs_vsctl.jsonrpc import JsonStream
+from ovs_vsctl.jsonrpc import RECV_SIZE
+from ovs_vsctl.jsonrpc import parse_address
+from ovs_vsctl.schema import Schema
+
+
+def _set(key, n_min=0, n_max='unlimited'):
+    return {'type': {'key': key, 'min': n_min, 'max': n_max}}
+
+
+def _map(key='string', value='string'):
+    return {'type': {'key': key, 'value': value,
+                     'min': 0, 'max': 'unlimited'}}
+
+
+def _ref(table, n_min=0, n_max='unlimited'):
+    return _set({'type': 'uuid', 'refTable': table}, n_min, n_max)
+
+
+# Subset of 'vswitch.ovsschema' of Open vSwitch.
+VSWITCH_SCHEMA = {
+    'name': 'Open_vSwitch',
+    'version': '7.12.1',
+    'tables': {
+        'Open_vSwitch': {
+            'isRoot': True,
+            'maxRows': 1,
+            'columns': {
+                'bridges': _ref('Bridge'),
+                'cur_cfg': {'type': 'integer'},
+                'external_ids': _map(),
+                'next_cfg': {'type': 'integer'},
+                'other_config': _map(),
+                'ovs_version': _set('string', 0, 1),
+            },
+        },
+        'Bridge': {
+            'isRoot': True,
+            'indexes': [['name']],
+            'columns': {
+                'datapath_type': {'type': 'string'},
+                'external_ids': _map(),
+                'fail_mode': _set('string', 0, 1),
+                'name': {'type': 'string'},
+                'other_config': _map(),
+                'ports': _ref('Port'),
+                'protocols': _set('string'),
+                'status': _map(),
+                'stp_enable': {'type': 'boolean'},
+            },
+        },
+        'Port': {
+            'indexes': [['name']],
+            'columns': {
+                'bond_mode': _set('string', 0, 1),
+                'external_ids': _map(),
+                'fake_bridge': {'type': 'boolean'},
+                'interfaces': _ref('Interface', 1),
+                'name': {'type': 'string'},
+                'other_config': _map(),
+                'statistics': _map('string', 'integer'),
+                'status': _map(),
+                'tag': _set('integer', 0, 1),
+                'trunks': _set('integer', 0, 4096),
+                'vlan_mode': _set('string', 0, 1),
+            },
+        },
+        'Interface': {
+            'indexes': [['name']],
+            'columns': {
+                'admin_state': _set('string', 0, 1),
+                'error': _set('string', 0, 1),
+                'external_ids': _map(),
+                'link_speed': _set('integer', 0, 1),
+                'link_state': _set('string', 0, 1),
+                'mac_in_use': _set('string', 0, 1),
+                'mtu': _set('integer', 0, 1),
+                'name': {'type': 'string'},
+                'ofport': _set('integer', 0, 1),
+                'ofport_request': _set('integer', 0, 1),
+                'options': _map(),
+                'other_config': _map(),
+                'statistics': _map('string', 'integer'),
+                'status': _map(),
+                'type': {'type': 'string'},
+            },
+        },
+    },
+}
+
+_DEFAULT_ATOMS = {
+    'integer': 0,
+    'real': 0.0,
+    'boolean': False,
+    'string': '',
+}
+
+
+def _default_value(column_type):
+    if column_type.n_min == 1 and column_type.n_max == 1:
+        return _DEFAULT_ATOMS.get(column_type.key.type)
+    if column_type.is_map:
+        return ['map', []]
+    return ['set', []]
+
+
+def _canonical(value, column_type):
+    """
+    Converts the given <value> into the notation stored in the database,
+    i.e. scalars as atoms, sets and maps always in <set> and <map>.
+    """
+    items = datum.elements(value)
+    if column_type.is_map:
+        return ['map', sorted(([k, v] for k, v in items),
+                              key=lambda x: json.dumps(x[0]))]
+    if column_type.n_min == 1 and column_type.n_max == 1:
+        return items[0]
+    return ['set', sorted(items, key=json.dumps)]
+
+
+def _comparable(value):
+    items = datum.elements(value)
+    return frozenset(json.dumps(i, sort_keys=True) for i in items)
+
+
+class OVSDBError(Exception):
+    """
+    Error of OVSDB operations, reported as <error> in the result.
+    """
+
+    def __init__(self, error, details=''):
+        super().__init__(error)
+        self.error = error
+        self.details = details
+
+
+class FakeOVSDBServer():
+    """
+    Fake 'ovsdb-server' which serves a single database on memory.
+
+    Supports 'list_dbs', 'get_schema', 'echo', 'transact', 'monitor' and
+    'monitor_cancel' methods with 'select', 'insert', 'update', 'mutate',
+    'delete' and 'comment' operations. The changes made by transactions and
+    the data manipulation APIs are notified to the monitors.
+
+    :param address: Address to listen on formatted like '--db' option of
+     'ovs-vsctl' command. Port number 0 means an ephemeral port.
+    :param schema: dict type value of <database-schema>. Defaults to a
+     subset of 'vswitch.ovsschema'.
+    """
+
+    def __init__(self, address='tcp:127.0.0.1:0', schema=None):
+        self.address = address
+        self.schema_json = schema or VSWITCH_SCHEMA
+        self.schema = Schema.from_json(self.schema_json)
+        self.tables = dict((name, {}) for name in self.schema.tables)
+        self.requests = 0
+        self.lock = threading.RLock()
+        # (connection, monitor ID) --> {table: columns}
+        self._monitors = {}
+        self._connections = set()
+        self._server = None
+        self._thread = None
+
+        if 'Open_vSwitch' in self.tables:
+            self.insert('Open_vSwitch', {'ovs_version': '2.5.0'})
+
+    @property
+    def ovsdb_addr(self):
+        """
+        Returns the address to connect formatted like '--db' option of
+        'ovs-vsctl' command.
+        """
+        if self._server is None:
+            return self.address
+        if self._server.address_family == socket.AF_UNIX:
+            return 'unix:%s' % self._server.server_address
+        host, port = self._server.server_address[:2]
+        if ':' in host:
+            return 'tcp:[%s]:%d' % (host, port)
+        return 'tcp:%s:%d' % (host, port)
+
+    def start(self):
+        """
+        Starts serving in a background thread.
+        """
+        protocol, address = parse_address(self.address)
+        if protocol == 'unix':
+            if os.path.exists(address):
+                os.unlink(address)
+            server_class = _UnixServer
+        elif ':' in address[0]:
+            server_class = _TCP6Server
+        else:
+            server_class = _TCPServer
+        self._server = server_class(address, _Handler, self)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.05,))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def drop_connections(self):
+        """
+        Closes the connections of all the clients from the server side, e.g.
+        to emulate the clients disconnected by the inactivity probes.
+        """
+        with self.lock:
+            connections = list(self._connections)
+        for connection in connections:
+            connection.shutdown()
+
+    def stop(self):
+        """
+        Stops serving and closes the listening socket.
+        """
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        if self._server.address_family == socket.AF_UNIX:
+            os.unlink(self._server.server_address)
+        self._server = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *_):
+        self.stop()
+
+    # Data manipulation APIs for test fixtures.
+
+    def insert(self, table, row, row_uuid=None):
+        """
+        Inserts a row into the database directly.
+
+        :param table: Table name.
+        :param row: dict of column name and <value>.
+        :param row_uuid: UUID of the new row. Generated if omitted.
+        :return: UUID of the inserted row.
+        """
+        with self.lock:
+            txn = _Transaction(self.tables)
+            row_uuid = self._insert(txn.writable(table), table, row, row_uuid)
+            self._commit(txn)
+            return row_uuid
+
+    def add_bridge(self, name, ports=(), **columns):
+        """
+        Adds a bridge, its local port and the given ports with interfaces
+        of the same name as 'ovs-vsctl add-br' and 'add-port' do.
+
+        :param name: Bridge name.
+        :param ports: Names of the ports to add.
+        :param columns: Other columns of the bridge.
+        :return: UUID of the added bridge.
+        """
+        with self.lock:
+            port_uuids = [self.add_port(port)
+                          for port in (name,) + tuple(ports)]
+            row = dict(columns, name=name,
+                       ports=['set', [['uuid', u] for u in port_uuids]])
+            bridge_uuid = self.insert('Bridge', row)
+            txn = _Transaction(self.tables)
+            root = next(iter(txn.writable('Open_vSwitch').values()))
+            root['bridges'] = _canonical(
+                ['set', datum.elements(root['bridges'])
+                 + [['uuid', bridge_uuid]]],
+                self.schema.tables['Open_vSwitch'].columns['bridges'].type)
+            self._commit(txn)
+            return bridge_uuid
+
+    def add_port(self, name, **columns):
+        """
+        Adds a port with an interface of the same name. The port is not
+        attached to any bridge.
+
+        :param name: Port and interface name.
+        :param columns: Other columns of the interface.
+        :return: UUID of the added port.
+        """
+        with self.lock:
+            iface_uuid = self.insert('Interface', dict(columns, name=name))
+            return self.insert('Port', {'name': name,
+                                        'interfaces': ['uuid', iface_uuid]})
+
+    # OVSDB JSON-RPC methods.
+
+    def handle(self, msg, connection=None):
+        """
+        Handles the given JSON-RPC request and returns the response.
+
+        :param msg: dict type value of JSON-RPC request.
+        :param connection: Connection which received `msg`, which has
+         `send(msg)` method to send the notifications. Required for
+         'monitor' method.
+        :return: dict type value of JSON-RPC response, or `None` if `msg`
+         is not a request or the response has been sent.
+        """
+        method = msg.get('method')
+        if method is None or msg.get('id') is None:
+            return None
+
+        self.requests += 1
+        params = msg.get('params', [])
+        result = error = None
+        if method == 'echo':
+            result = params
+        elif method == 'list_dbs':
+            result = [self.schema.name]
+        elif method == 'get_schema':
+            if params[0] != self.schema.name:
+                error = 'unknown database'
+            else:
+                result = self.schema_json
+        elif method == 'transact':
+            result = self.transact(params[0], params[1:])
+        elif method == 'monitor' and connection is not None:
+            with self.lock:
+                try:
+                    result = self.monitor(connection, *params)
+                except OVSDBError as e:  # pylint: disable=invalid-name
+                    error = e.error
+                # Sends the initial rows before the updates.
+                connection.send(
+                    {'id': msg['id'], 'result': result, 'error': error})
+            return None
+        elif method == 'monitor_cancel' and connection is not None:
+            with self.lock:
+                key = (connection, json.dumps(params[0]))
+                if self._monitors.pop(key, None) is None:
+                    error = 'unknown monitor'
+                else:
+                    result = {}
+        else:
+            error = 'unknown method'
+
+        return {'id': msg['id'], 'result': result, 'error': error}
+
+    def transact(self, database, operations):
+        """
+        Executes the given `operations` atomically.
+
+        :param database: Database name.
+        :param operations: list of <operation>s.
+        :return: list of results of `operations`.
+        """
+        if database != self.schema.name:
+            return [{'error': 'unknown database'}]
+
+        with self.lock:
+            txn = _Transaction(self.tables)
+            results = []
+            for operation in operations:
+                try:
+                    results.append(self._execute(txn, operation))
+                except OVSDBError as e:  # pylint: disable=invalid-name
+                    results.append({'error': e.error, 'details': e.details})
+                    return results
+            self._commit(txn)
+            return results
+
+    def monitor(self, connection, database, monitor_id, requests):
+        """
+        Registers the monitor of the given tables and returns their rows.
+
+        :param connection: Connection to send the notifications.
+        :param database: Database name.
+        :param monitor_id: JSON value identifying the monitor.
+        :param requests: dict of table name and <monitor-request> (or list
+         of them). Only 'columns' member is supported.
+        :return: <table-updates> containing the rows as 'new'.
+        :raise: * OVSDBError -- When the given parameters are invalid.
+        """
+        if database != self.schema.name:
+            raise OVSDBError('unknown database')
+        key = (connection, json.dumps(monitor_id))
+        if key in self._monitors:
+            raise OVSDBError('duplicate monitor ID')
+
+        tables = {}
+        for table, request in requests.items():
+            if table not in self.tables:
+                raise OVSDBError('unknown table', table)
+            if isinstance(request, dict):
+                request = [request]
+            columns = set()
+            for req in request:
+                for column in req.get(
+                        'columns', self.schema.tables[table].columns):
+                    self._column_type(table, column)
+                    columns.add(column)
+            tables[table] = columns
+
+        with self.lock:
+            self._monitors[key] = (monitor_id, tables)
+            return self._table_updates(
+                tables, dict((t, dict((u, (None, r))
+                                      for u, r in self.tables[t].items()))
+                             for t in tables))
+
+    def connect(self, connection):
+        """
+        Registers the given connection of a client.
+
+        :param connection: Connection which has been accepted.
+        """
+        with self.lock:
+            self._connections.add(connection)
+
+    def disconnect(self, connection):
+        """
+        Removes the given connection and the monitors registered by it.
+
+        :param connection: Connection which has been closed.
+        """
+        with self.lock:
+            self._connections.discard(connection)
+            for key in list(self._monitors):
+                if key[0] is connection:
+                    del self._monitors[key]
+
+    def _commit(self, txn):
+        """
+        Applies the given transaction and notifies the changes to the
+        monitors.
+        """
+        changes = {}
+        for table in txn.copied:
+            old_rows = self.tables[table]
+            new_rows = txn.tables[table]
+            changed = {}
+            for row_uuid in set(old_rows) | set(new_rows):
+                old, new = old_rows.get(row_uuid), new_rows.get(row_uuid)
+                if old != new:
+                    changed[row_uuid] = (old, new)
+            if changed:
+                changes[table] = changed
+        self.tables = txn.tables
+
+        for (connection, _), (monitor_id, tables) in list(
+                self._monitors.items()):
+            updates = self._table_updates(tables, changes)
+            if updates:
+                connection.send({'id': None, 'method': 'update',
+                                 'params': [monitor_id, updates]})
+
+    @staticmethod
+    def _table_updates(tables, changes):
+        """
+        Returns <table-updates> of the given changes of rows for the
+        monitored columns of `tables`.
+        """
+        updates = {}
+        for table, columns in tables.items():
+            row_updates = {}
+            for row_uuid, (old, new) in changes.get(table, {}).items():
+                update = {}
+                if old is not None:
+                    update['old'] = dict(
+                        (c, old[c]) for c in columns
+                        if new is None or old[c] != new[c])
+                    if new is not None and not update['old']:
+                        # No changes in the monitored columns.
+                        continue
+                if new is not None:
+                    update['new'] = dict((c, new[c]) for c in columns)
+                row_updates[row_uuid] = update
+            if row_updates:
+                updates[table] = row_updates
+        return updates
+
+    def _execute(self, txn, operation):
+        name = operation.get('op')
+        if name == 'comment':
+            return {}
+
+        table = operation.get('table')
+        if table not in self.tables:
+            raise OVSDBError('unknown table', table)
+        where = operation.get('where', [])
+
+        if name == 'select':
+            columns = operation.get('columns')
+            return {'rows': [
+                dict((c, v) for c, v in row.items()
+                     if columns is None or c in columns)
+                for row in self._where(txn.tables, table, where)]}
+        if name == 'insert':
+            row = txn.resolve(operation.get('row', {}))
+            row_uuid = self._insert(txn.writable(table), table, row)
+            if 'uuid-name' in operation:
+                txn.named_uuids[operation['uuid-name']] = row_uuid
+            return {'uuid': ['uuid', row_uuid]}
+
+        uuids = [r['_uuid'][1] for r in self._where(txn.tables, table, where)]
+        rows = txn.writable(table) if uuids else {}
+        if name == 'update':
+            values = self._check_row(
+                table, txn.resolve(operation.get('row', {})))
+            for row_uuid in uuids:
+                rows[row_uuid].update(values)
+                rows[row_uuid]['_version'] = ['uuid', str(uuid.uuid4())]
+        elif name == 'mutate':
+            for row_uuid in uuids:
+                self._mutate(table, rows[row_uuid],
+                             operation.get('mutations', []))
+        elif name == 'delete':
+            for row_uuid in uuids:
+                del rows[row_uuid]
+        else:
+            raise OVSDBError('unknown operation', name)
+
+        return {'count': len(uuids)}
+
+    def _column_type(self, table, column):
+        try:
+            return self.schema.tables[table].columns[column].type
+        except KeyError as e:  # pylint: disable=invalid-name
+            raise OVSDBError('unknown column', column) from e
+
+    def _check_row(self, table, row):
+        return dict((c, _canonical(v, self._column_type(table, c)))
+                    for c, v in row.items())
+
+    def _insert(self, rows, table, row, row_uuid=None):
+        table_schema = self.schema.tables[table]
+        new_row = dict((c, _default_value(s.type))
+                       for c, s in table_schema.columns.items())
+        new_row.update(self._check_row(table, row))
+        row_uuid = row_uuid or str(uuid.uuid4())
+        new_row['_uuid'] = ['uuid', row_uuid]
+        new_row['_version'] = ['uuid', str(uuid.uuid4())]
+        rows[row_uuid] = new_row
+        return row_uuid
+
+    def _where(self, tables, table, where):
+        rows = []
+        for row in tables[table].values():
+            for column, function, value in where:
+                if not self._match(table, row, column, function, value):
+                    break
+            else:
+                rows.append(row)
+        return rows
+
+    def _match(self, table, row, column, function, value):
+        self._column_type(table, column)
+        actual = row[column]
+        if function in ('<', '<=', '>', '>='):
+            return {'<': actual < value, '<=': actual <= value,
+                    '>': actual > value, '>=': actual >= value}[function]
+
+        actual, value = _comparable(actual), _comparable(value)
+        if function == '==':
+            return actual == value
+        if function == '!=':
+            return actual != value
+        if function == 'includes':
+            return value <= actual
+        if function == 'excludes':
+            return not value & actual
+        raise OVSDBError('unknown function', function)
+
+    def _mutate(self, table, row, mutations):
+        for column, mutator, value in mutations:
+            column_type = self._column_type(table, column)
+            items = datum.elements(row[column])
+            if mutator == 'insert':
+                items = items + [i for i in datum.elements(value)
+                                 if i not in items]
+            elif mutator == 'delete':
+                removes = datum.elements(value)
+                if column_type.is_map:
+                    # Deletes by keys or by key-value pairs.
+                    items = [i for i in items
+                             if i not in removes and i[0] not in removes]
+                else:
+                    items = [i for i in items if i not in removes]
+            else:
+                raise OVSDBError('unknown mutator', mutator)
+            tag = 'map' if column_type.is_map else 'set'
+            row[column] = _canonical([tag, items], column_type)
+        row['_version'] = ['uuid', str(uuid.uuid4())]
+
+
+class _Transaction():
+    """
+    Working copy of the tables during a transaction. Tables are copied at
+    the first modification so that the aborted transaction leaves the
+    database untouched.
+    """
+
+    def __init__(self, tables):
+        self.tables = dict(tables)
+        self.named_uuids = {}
+        self.copied = set()
+
+    def writable(self, table):
+        """
+        Returns rows of the given `table` which are safe to modify.
+        """
+        if table not in self.copied:
+            self.tables[table] = dict(
+                (u, dict(r)) for u, r in self.tables[table].items())
+            self.copied.add(table)
+        return self.tables[table]
+
+    def resolve(self, value):
+        """
+        Replaces ["named-uuid",<id>] in `value` with the actual UUIDs.
+        """
+        if isinstance(value, dict):
+            return dict((k, self.resolve(v)) for k, v in value.items())
+        if isinstance(value, list):
+            if len(value) == 2 and value[0] == 'named-uuid':
+                return ['uuid', self.named_uuids[value[1]]]
+            return [self.resolve(v) for v in value]
+        return value
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def setup(self):
+        self._send_lock = threading.Lock()
+        self.server.ovsdb.connect(self)
+
+    def shutdown(self):
+        """
+        Shuts down the connection, which ends `handle()`.
+        """
+        try:
+            self.request.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def send(self, msg):
+        """
+        Sends the given JSON-RPC message to the client.
+        """
+        data = json.dumps(msg, separators=(',', ':')).encode('utf-8')
+        with self._send_lock:
+            try:
+                self.request.sendall(data)
+            except OSError:
+                # Disconnected, removed from the monitors when detected.
+                pass
+
+    def handle(self):
+        stream = JsonStream()
+        try:
+            while True:
+                try:
+                    data = self.request.recv(RECV_SIZE)
+                except OSError:
+                    return
+                if not data:
+                    return
+                for msg in stream.feed(data):
+                    response = self.server.ovsdb.handle(msg, self)
+                    if response is not None:
+                        self.send(response)
+        finally:
+            self.server.ovsdb.disconnect(self)
+
+
+class _ServerMixin():  # pylint: disable=too-few-public-methods
+    """
+    Keeps `FakeOVSDBServer` for the handlers.
+    """
+
+    def __init__(self, address, handler_class, ovsdb):
+        self.ovsdb = ovsdb
+        super().__init__(address, handler_class)
+
+
+class _TCPServer(_ServerMixin, socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class _TCP6Server(_TCPServer):
+    address_family = socket.AF_INET6
+
+
+class _UnixServer(_ServerMixin, socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
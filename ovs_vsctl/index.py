@@ -0,0 +1,247 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tables of `ovs_vsctl.parser.Record` with indexes on the columns, which
+look up the records by dict access instead of 'ovs-vsctl find' command or
+the linear scan over the outputs of 'ovs-vsctl list' command.
+"""
+
+
+def _atom(value):
+    """
+    Returns the hashable form of the given atom, i.e. the UUID string for
+    the UUID parsed by `list_cmd_parser` (e.g.
+    ['uuid', '79c26f92-86f9-485f-945d-5786c8147f53']).
+    """
+    if isinstance(value, list) and len(value) == 2 and value[0] == 'uuid':
+        return value[1]
+    return value
+
+
+def _key_function(index):
+    """
+    Returns the function which takes a record and returns the list of the
+    keys of the given index.
+    """
+    column, _, key = index.partition(':')
+
+    def _keys(record):
+        value = getattr(record, column, None)
+        if key:
+            if not isinstance(value, dict):
+                return ()
+            value = value.get(key)
+        if value is None:
+            return ()
+        value = _atom(value)
+        if isinstance(value, dict):
+            # Indexes each key of maps.
+            return value
+        if isinstance(value, list):
+            # Indexes each element of sets.
+            return [_atom(v) for v in value]
+        return (value,)
+    return _keys
+
+
+class IndexedTable():
+    """
+    Table of `ovs_vsctl.parser.Record` with unique and non-unique indexes.
+
+    The indexes are declared with the column names, or '<column>:<key>' for
+    the values of the map columns (e.g. 'external_ids:iface-id').
+    Each element of the set columns (and each key of the map columns) is
+    indexed, and the records whose value is empty are not indexed.
+
+    Example::
+
+        >>> from ovs_vsctl import VSCtl
+        >>> from ovs_vsctl import list_cmd_parser
+        >>> from ovs_vsctl.index import IndexedTable
+        >>> vsctl = VSCtl('tcp', '127.0.0.1', 6640)
+        >>> interfaces = IndexedTable(
+        ...     vsctl.run('list Interface', parser=list_cmd_parser),
+        ...     unique=['_uuid', 'name'], multi=['external_ids:iface-id'])
+        >>> interfaces.get('name', 's1-eth1')
+        Record(_uuid='ba7fee67-...', ..., name='s1-eth1', ...)
+        >>> interfaces.find('external_ids:iface-id', 'vm1-port')
+        [Record(_uuid='ba7fee67-...', ...)]
+        >>> interfaces.rebuild(
+        ...     vsctl.run('list Interface', parser=list_cmd_parser))
+
+    :param records: Iterable of `Record` instances.
+    :param unique: Indexes whose key identifies a record.
+    :param multi: Indexes whose key may be shared by multiple records.
+    :raise: * ValueError -- When the key of an unique index is duplicated.
+    """
+
+    def __init__(self, records=(), unique=(), multi=()):
+        # id(record) --> record, keeping the order of the records.
+        self._records = {}
+        # index --> (key function, unique, {key: record or [records]})
+        self._indexes = {}
+        for index in unique:
+            self._indexes[index] = (_key_function(index), True, {})
+        for index in multi:
+            self._indexes[index] = (_key_function(index), False, {})
+        self.rebuild(records)
+
+    @property
+    def records(self):
+        """
+        List of the records.
+        """
+        return list(self._records.values())
+
+    @property
+    def indexes(self):
+        """
+        Names of the indexes.
+        """
+        return sorted(self._indexes)
+
+    def __len__(self):
+        return len(self._records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __contains__(self, record):
+        return id(record) in self._records
+
+    def add_index(self, index, unique=False):
+        """
+        Adds the index and builds it from the current records.
+
+        :param index: Column name, or '<column>:<key>'.
+        :param unique: If `True`, the key identifies a record.
+        :raise: * ValueError -- When the index already exists, or the key
+                  of the unique index is duplicated.
+        """
+        if index in self._indexes:
+            raise ValueError('Index %s already exists' % index)
+        keys = _key_function(index)
+        entries = self._build(self._records.values(), keys, unique, index)
+        self._indexes[index] = (keys, unique, entries)
+
+    def rebuild(self, records):
+        """
+        Replaces all the records with the given ones (e.g. a fresh output of
+        'ovs-vsctl list' command) and rebuilds the indexes.
+
+        If failed, the table is left unchanged.
+
+        :param records: Iterable of `Record` instances.
+        :raise: * ValueError -- When the key of an unique index is
+                  duplicated.
+        """
+        records = dict((id(r), r) for r in records)
+        indexes = dict(
+            (index, (keys, unique,
+                     self._build(records.values(), keys, unique, index)))
+            for index, (keys, unique, _) in self._indexes.items())
+        self._records = records
+        self._indexes = indexes
+
+    @staticmethod
+    def _build(records, keys, unique, index):
+        entries = {}
+        if unique:
+            for record in records:
+                for key in keys(record):
+                    if entries.setdefault(key, record) is not record:
+                        raise ValueError(
+                            'Duplicate key %r in index %s' % (key, index))
+        else:
+            for record in records:
+                for key in keys(record):
+                    entries.setdefault(key, []).append(record)
+        return entries
+
+    def add(self, record):
+        """
+        Adds the record to the table and the indexes.
+
+        :param record: `Record` instance.
+        :raise: * ValueError -- When the record is already contained, or
+                  the key of an unique index is duplicated.
+        """
+        if id(record) in self._records:
+            raise ValueError('Record is already contained: %r' % record)
+        for index, (keys, unique, entries) in self._indexes.items():
+            if unique:
+                for key in keys(record):
+                    if key in entries:
+                        raise ValueError(
+                            'Duplicate key %r in index %s' % (key, index))
+
+        self._records[id(record)] = record
+        for keys, unique, entries in self._indexes.values():
+            for key in keys(record):
+                if unique:
+                    entries[key] = record
+                else:
+                    entries.setdefault(key, []).append(record)
+
+    def remove(self, record):
+        """
+        Removes the record from the table and the indexes.
+
+        :param record: `Record` instance contained in the table.
+        :raise: * ValueError -- When the record is not contained.
+        """
+        if self._records.pop(id(record), None) is not record:
+            raise ValueError('Record is not contained: %r' % record)
+
+        for keys, unique, entries in self._indexes.values():
+            for key in keys(record):
+                if unique:
+                    del entries[key]
+                    continue
+                records = [r for r in entries[key] if r is not record]
+                if records:
+                    entries[key] = records
+                else:
+                    del entries[key]
+
+    def get(self, index, key):
+        """
+        Returns the record of the given key in the unique index.
+
+        :param index: Name of the unique index.
+        :param key: Value of the column.
+        :return: `Record` instance.
+        :raise: * KeyError -- When the index or key is not found.
+                * ValueError -- When the index is not unique.
+        """
+        _, unique, entries = self._indexes[index]
+        if not unique:
+            raise ValueError('Index %s is not unique' % index)
+        return entries[key]
+
+    def find(self, index, key):
+        """
+        Returns the records of the given key in the index.
+
+        :param index: Name of the index.
+        :param key: Value of the column.
+        :return: list of `Record` instances, empty if not found.
+        :raise: * KeyError -- When the index is not found.
+        """
+        _, unique, entries = self._indexes[index]
+        if unique:
+            return [entries[key]] if key in entries else []
+        return list(entries.get(key, ()))
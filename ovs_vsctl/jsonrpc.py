@@ -0,0 +1,342 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+OVSDB management protocol (RFC 7047) client over JSON-RPC.
+"""
+
+import codecs
+import itertools
+import json
+import re
+import socket
+import threading
+
+from ovs_vsctl import exception
+
+_WHITESPACES = re.compile(r'\s*')
+
+RECV_SIZE = 65536
+
+
+def parse_address(ovsdb_addr):
+    """
+    Parses OVSDB server address formatted like '--db' option of 'ovs-vsctl'
+    command.
+
+    Example::
+
+        >>> parse_address('tcp:127.0.0.1:6640')
+        ('tcp', ('127.0.0.1', 6640))
+        >>> parse_address('tcp:[::1]:6640')
+        ('tcp', ('::1', 6640))
+        >>> parse_address('unix:/var/run/openvswitch/db.sock')
+        ('unix', '/var/run/openvswitch/db.sock')
+
+    :param ovsdb_addr: OVSDB server address.
+    :return: tuple of protocol and address for 'socket.connect'.
+    :raise: * ValueError -- When the given address is invalid.
+    """
+    protocol, _, addr = ovsdb_addr.partition(':')
+    if protocol == 'unix':
+        return protocol, addr
+    if protocol not in ('tcp', 'ssl'):
+        raise ValueError('Unsupported protocol: %s' % protocol)
+
+    host, _, port = addr.rpartition(':')
+    if host.startswith('['):
+        host = host[1:-1]
+
+    return protocol, (host, int(port))
+
+
+class JsonStream():  # pylint: disable=too-few-public-methods
+    """
+    Splits the stream of JSON texts into the JSON objects.
+
+    OVSDB JSON-RPC has no framing, so the received data is decoded when it
+    ends with the end of a JSON object, and is kept until completed
+    otherwise.
+    """
+
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json_decoder = json.JSONDecoder()
+        self._chunks = []
+
+    def feed(self, data):
+        """
+        Feeds the received `data` and returns the completed JSON objects.
+
+        :param data: bytes type value received.
+        :return: list of decoded JSON objects.
+        """
+        text = self._decoder.decode(data)
+        self._chunks.append(text)
+        if not text.rstrip().endswith('}'):
+            return []
+
+        buf = ''.join(self._chunks)
+        self._chunks = []
+        objs = []
+        pos = 0
+        while True:
+            pos = _WHITESPACES.match(buf, pos).end()
+            if pos == len(buf):
+                break
+            try:
+                obj, pos = self._json_decoder.raw_decode(buf, pos)
+            except ValueError:
+                # Incomplete, waits for the remaining.
+                self._chunks.append(buf[pos:])
+                break
+            objs.append(obj)
+        return objs
+
+
+class _ConnectionLost(exception.VSCtlRpcError):
+    """
+    Raised when the connection is closed by OVSDB server or broken.
+    """
+
+
+class Connection():
+    """
+    Connection to OVSDB server.
+
+    The connection is established at the first request and kept open until
+    `close()` is called. If the connection is lost, reconnects at the next
+    request.
+
+    Note that the messages from OVSDB server (e.g. the inactivity probes)
+    are handled only while waiting for the responses, so OVSDB server may
+    close the connection left idle. The requests with `retry=True` are
+    retried once on a new connection in such case.
+
+    :param ovsdb_addr: OVSDB server address formatted like '--db' option of
+     'ovs-vsctl' command.
+    :param timeout: Timeout in seconds for each request.
+    :param ssl_context: Instance of 'ssl.SSLContext' for 'ssl' protocol.
+    """
+
+    def __init__(self, ovsdb_addr, timeout=None, ssl_context=None):
+        self.protocol, self.address = parse_address(ovsdb_addr)
+        self.timeout = timeout
+        self.ssl_context = ssl_context
+        self.notification_handler = None
+        self._sock = None
+        self._stream = None
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+
+    def connect(self):
+        """
+        Connects to OVSDB server if not connected yet.
+
+        :raise: * ovs_vsctl.exception.VSCtlRpcError -- When failed to
+                  connect.
+        """
+        if self._sock is not None:
+            return
+
+        try:
+            if self.protocol == 'unix':
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.settimeout(self.timeout)
+                sock.connect(self.address)
+            else:
+                sock = socket.create_connection(self.address, self.timeout)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                if self.protocol == 'ssl':
+                    # Imported here because 'ssl' is slow to import.
+                    import ssl  # pylint: disable=import-outside-toplevel
+                    context = self.ssl_context or ssl.create_default_context()
+                    sock = context.wrap_socket(
+                        sock, server_hostname=self.address[0])
+        except OSError as e:  # pylint: disable=invalid-name
+            # Including 'ssl.SSLError'.
+            raise exception.VSCtlRpcError(
+                'Failed to connect to %s: %s' % (self.address, e))
+
+        self._sock = sock
+        self._stream = JsonStream()
+
+    def close(self):
+        """
+        Closes the connection to OVSDB server.
+        """
+        sock, self._sock, self._stream = self._sock, None, None
+        if sock is not None:
+            try:
+                # Wakes up the thread waiting in `receive()`.
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+
+    def _send(self, msg):
+        sock = self._sock
+        if sock is None:
+            raise exception.VSCtlRpcError('Connection closed')
+        sock.sendall(
+            json.dumps(msg, separators=(',', ':')).encode('utf-8'))
+
+    def _recv(self):
+        sock, stream = self._sock, self._stream
+        if sock is None:
+            raise exception.VSCtlRpcError('Connection closed')
+        while True:
+            data = sock.recv(RECV_SIZE)
+            if not data:
+                raise _ConnectionLost('Connection closed by OVSDB server')
+            msgs = stream.feed(data)
+            if msgs:
+                return msgs
+
+    def _dispatch(self, msg):
+        """
+        Handles the request or the notification from OVSDB server.
+        """
+        if msg.get('method') == 'echo' and msg.get('id') is not None:
+            self._send({'id': msg['id'], 'result': msg['params'],
+                        'error': None})
+        elif msg.get('method') is not None and msg.get('id') is None:
+            if self.notification_handler is not None:
+                self.notification_handler(msg['method'], msg['params'])
+
+    def call(self, method, *params, retry=False):
+        """
+        Sends JSON-RPC request and waits for its response.
+
+        :param method: Method name, e.g. `'transact'`.
+        :param params: Parameters of the method.
+        :param retry: If `True`, the request is sent again on a new
+         connection when the kept connection turns out to be lost, e.g.
+         closed by OVSDB server while idle. Only for the requests safe to
+         repeat, e.g. read-only 'transact'.
+        :return: 'result' of the response.
+        :raise: * ovs_vsctl.exception.VSCtlRpcError -- When the request
+                  fails.
+        """
+        with self._lock:
+            reused = self._sock is not None
+            try:
+                response = self._request(method, params)
+            except _ConnectionLost:
+                if not (retry and reused):
+                    raise
+                response = self._request(method, params)
+
+        if response.get('error') is not None:
+            raise exception.VSCtlRpcError(response['error'])
+        return response['result']
+
+    def _request(self, method, params):
+        self.connect()
+        msg_id = next(self._ids)
+        try:
+            self._send({'method': method, 'params': list(params),
+                        'id': msg_id})
+            return self._wait_response(msg_id)
+        except socket.timeout as e:  # pylint: disable=invalid-name
+            self.close()
+            raise exception.VSCtlRpcError(
+                'Failed to communicate with OVSDB server: %s' % e) from e
+        except OSError as e:  # pylint: disable=invalid-name
+            self.close()
+            raise _ConnectionLost(
+                'Failed to communicate with OVSDB server: %s' % e) from e
+        except ValueError as e:  # pylint: disable=invalid-name
+            self.close()
+            raise exception.VSCtlRpcError(
+                'Failed to communicate with OVSDB server: %s' % e) from e
+        except exception.VSCtlRpcError:
+            self.close()
+            raise
+
+    def receive(self):
+        """
+        Waits for the messages from OVSDB server and dispatches the
+        notifications (e.g. 'update' of 'monitor') to `notification_handler`.
+
+        Intended to be called repeatedly by a thread dedicated to the
+        notifications. `close()` interrupts the waiting thread.
+
+        :raise: * ovs_vsctl.exception.VSCtlRpcError -- When not connected
+                  or the connection is lost.
+        """
+        with self._lock:
+            try:
+                msgs = self._recv()
+                for msg in msgs:
+                    if 'method' in msg:
+                        self._dispatch(msg)
+            except (OSError, ValueError) as e:  # pylint: disable=invalid-name
+                self.close()
+                raise exception.VSCtlRpcError(
+                    'Failed to communicate with OVSDB server: %s' % e)
+            except exception.VSCtlRpcError:
+                self.close()
+                raise
+
+    def _wait_response(self, msg_id):
+        while True:
+            for msg in self._recv():
+                if 'method' in msg:
+                    self._dispatch(msg)
+                elif msg.get('id') == msg_id:
+                    return msg
+
+    def transact(self, database, *operations, retry=False):
+        """
+        Sends 'transact' request and returns the results of operations.
+
+        :param database: Database name.
+        :param operations: <operation>s of the transaction.
+        :param retry: If `True`, retries once on a new connection when the
+         kept connection is lost. See `call()`.
+        :return: list of results corresponding to `operations`.
+        :raise: * ovs_vsctl.exception.VSCtlRpcError -- When the transaction
+                  fails.
+        """
+        results = self.call('transact', database, *operations, retry=retry)
+        for result in results:
+            if result is not None and 'error' in result:
+                raise exception.VSCtlRpcError(
+                    '%s: %s' % (result['error'], result.get('details', '')))
+        return results
+
+    def monitor(self, database, monitor_id, requests):
+        """
+        Sends 'monitor' request and returns the initial contents of the
+        monitored tables. The changes are notified to
+        `notification_handler` as 'update' method afterward.
+
+        :param database: Database name.
+        :param monitor_id: JSON value identifying the monitor in the
+         notifications.
+        :param requests: dict of table name and <monitor-request>.
+        :return: dict type value of <table-updates>.
+        """
+        return self.call('monitor', database, monitor_id, requests)
+
+    def get_schema(self, database):
+        """
+        Returns the schema of the given `database`.
+
+        :param database: Database name.
+        :return: dict type value of <database-schema>.
+        """
+        return self.call('get_schema', database, retry=True)
@@ -0,0 +1,273 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Metrics of the invocations of 'ovs-vsctl' command.
+
+`ovs_vsctl.VSCtl` takes the function called with `Invocation` after each
+invocation (e.g. `MetricsRegistry` instance) as `metrics` parameter.
+Without it, nothing is measured.
+"""
+
+import bisect
+import threading
+
+# Upper bounds in seconds of the buckets of the latency histograms.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Histograms: (name, attribute of Invocation, help)
+_HISTOGRAMS = (
+    ('ovs_vsctl_spawn_seconds', 'spawn',
+     "Time spent in spawning 'ovs-vsctl'."),
+    ('ovs_vsctl_wall_seconds', 'wall',
+     "Wall time until 'ovs-vsctl' exits (or the backend returns)."),
+    ('ovs_vsctl_parse_seconds', 'parse',
+     'Time spent in parsing the outputs.'),
+)
+
+# Counters: (name, help)
+_COUNTERS = (
+    ('ovs_vsctl_invocations_total', 'Number of the invocations.'),
+    ('ovs_vsctl_failures_total', 'Number of the failed invocations.'),
+    ('ovs_vsctl_stdout_chars_total', 'Size of the outputs in characters.'),
+    ('ovs_vsctl_stderr_chars_total',
+     'Size of the error outputs in characters.'),
+)
+
+
+class Invocation():  # pylint: disable=too-few-public-methods
+    """
+    Measurements of an invocation of 'ovs-vsctl' command.
+
+    The measurements which are not taken are `None`, e.g. `spawn` with
+    `ovs_vsctl.backend.JsonRpcBackend` and `parse` without parser.
+
+    :param args: Command arguments executed.
+    :param verb: Command name, e.g. `'list'`. The names of the commands
+     executed by `VSCtl.run_batch()` are joined with `','`.
+    :param parser: Name of the parser, or `None`.
+    """
+
+    def __init__(self, args, verb, parser=None):
+        self.args = args
+        self.verb = verb
+        self.parser = parser
+        # Seconds spent in spawning the command.
+        self.spawn = None
+        # Seconds until the command exits.
+        self.wall = None
+        # Seconds spent in parsing the outputs.
+        self.parse = None
+        # Characters of the outputs, or 0 if the backend returns the streams
+        # whose size is unknown without reading.
+        self.stdout_size = 0
+        self.stderr_size = 0
+        self.returncode = None
+        # Exception raised by the command or the parser.
+        self.error = None
+
+    @property
+    def failed(self):
+        """
+        `True` if the command or the parser failed.
+        """
+        return self.error is not None or self.returncode != 0
+
+
+class Histogram():
+    """
+    Histogram of the observed values.
+
+    :param buckets: Sorted upper bounds of the buckets.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        # The last one is the count of the values over all the buckets.
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        """
+        Adds the given value.
+
+        :param value: Observed value.
+        """
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self):
+        """
+        Returns the counts of the values less than or equal to each bucket
+        (and '+Inf') as Prometheus histograms do.
+
+        :return: list of tuples of the upper bound and count.
+        """
+        results = []
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            results.append((bound, total))
+        return results
+
+
+def _labels(verb, parser, *extra):
+    labels = [('verb', verb or ''), ('parser', parser or '')]
+    labels.extend(extra)
+    return '{%s}' % ','.join(
+        '%s="%s"' % (k, str(v).replace('\\', '\\\\').replace('"', '\\"'))
+        for k, v in labels)
+
+
+def _bound(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(value)
+
+
+class MetricsRegistry():
+    """
+    Aggregates `Invocation` into the histograms and counters for each
+    command name and parser.
+
+    Example::
+
+        >>> from ovs_vsctl import VSCtl
+        >>> from ovs_vsctl import list_cmd_parser
+        >>> from ovs_vsctl.metrics import MetricsRegistry
+        >>> registry = MetricsRegistry()
+        >>> vsctl = VSCtl('tcp', '127.0.0.1', 6640, metrics=registry)
+        >>> vsctl.run('list Port', parser=list_cmd_parser)
+        [Record(_uuid='ba7fee67-...', ...)]
+        >>> print(registry.to_prometheus())
+        # HELP ovs_vsctl_spawn_seconds Time spent in spawning 'ovs-vsctl'.
+        # TYPE ovs_vsctl_spawn_seconds histogram
+        ovs_vsctl_spawn_seconds_bucket{verb="list",...,le="0.0005"} 0
+        ...
+
+    :param buckets: Upper bounds in seconds of the buckets of the latency
+     histograms.
+    :param callbacks: Functions called with each `Invocation`, e.g. to
+     forward the measurements to other monitoring systems.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, callbacks=()):
+        self.buckets = tuple(sorted(buckets))
+        self.callbacks = list(callbacks)
+        # (name, verb, parser) --> Histogram or int
+        self.histograms = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, invocation):
+        self.observe(invocation)
+
+    def observe(self, invocation):
+        """
+        Adds the measurements of the given invocation.
+
+        :param invocation: `Invocation` instance.
+        """
+        verb, parser = invocation.verb, invocation.parser
+        with self._lock:
+            for name, attr, _ in _HISTOGRAMS:
+                value = getattr(invocation, attr)
+                if value is None:
+                    continue
+                key = (name, verb, parser)
+                histogram = self.histograms.get(key)
+                if histogram is None:
+                    histogram = Histogram(self.buckets)
+                    self.histograms[key] = histogram
+                histogram.observe(value)
+
+            for name, value in (
+                    ('ovs_vsctl_invocations_total', 1),
+                    ('ovs_vsctl_failures_total', int(invocation.failed)),
+                    ('ovs_vsctl_stdout_chars_total', invocation.stdout_size),
+                    ('ovs_vsctl_stderr_chars_total', invocation.stderr_size)):
+                key = (name, verb, parser)
+                self.counters[key] = self.counters.get(key, 0) + value
+
+        for callback in self.callbacks:
+            callback(invocation)
+
+    def histogram(self, name, verb, parser=None):
+        """
+        Returns the histogram of the given name, command and parser.
+
+        :param name: Histogram name, e.g. `'ovs_vsctl_wall_seconds'`.
+        :param verb: Command name.
+        :param parser: Parser name.
+        :return: `Histogram` instance.
+        :raise: * KeyError -- When nothing has been observed.
+        """
+        return self.histograms[(name, verb, parser)]
+
+    def counter(self, name, verb, parser=None):
+        """
+        Returns the value of the counter of the given name, command and
+        parser.
+
+        :param name: Counter name, e.g. `'ovs_vsctl_invocations_total'`.
+        :param verb: Command name.
+        :param parser: Parser name.
+        :return: Value of the counter, 0 if nothing has been observed.
+        """
+        return self.counters.get((name, verb, parser), 0)
+
+    def to_prometheus(self):
+        """
+        Returns the metrics in Prometheus text exposition format.
+
+        :return: str type metrics.
+        """
+        lines = []
+        with self._lock:
+            for name, _, doc in _HISTOGRAMS:
+                lines.append('# HELP %s %s' % (name, doc))
+                lines.append('# TYPE %s histogram' % name)
+                for (key, verb, parser), histogram in sorted(
+                        self.histograms.items(), key=_sort_key):
+                    if key != name:
+                        continue
+                    for bound, count in histogram.cumulative_counts():
+                        lines.append('%s_bucket%s %d' % (
+                            name, _labels(verb, parser, ('le', _bound(bound))),
+                            count))
+                    lines.append('%s_sum%s %r' % (
+                        name, _labels(verb, parser), histogram.sum))
+                    lines.append('%s_count%s %d' % (
+                        name, _labels(verb, parser), histogram.count))
+
+            for name, doc in _COUNTERS:
+                lines.append('# HELP %s %s' % (name, doc))
+                lines.append('# TYPE %s counter' % name)
+                for (key, verb, parser), value in sorted(
+                        self.counters.items(), key=_sort_key):
+                    if key == name:
+                        lines.append('%s%s %d' % (
+                            name, _labels(verb, parser), value))
+
+        return '\n'.join(lines) + '\n'
+
+
+def _sort_key(item):
+    # `None` parser is not comparable with str.
+    (name, verb, parser), _ = item
+    return name, verb or '', parser or ''
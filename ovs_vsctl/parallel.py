@@ -0,0 +1,139 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Parallel parser for the large outputs of 'ovs-vsctl list' and 'ovs-vsctl
+find' command, which parses the chunks of the records in worker processes.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import functools
+import os
+import threading
+
+from ovs_vsctl.parser import list_cmd_parser
+
+# Size in characters of the outputs below which the outputs are parsed in
+# the calling process. Sending the chunks and the records between the
+# processes costs about 2/3 of parsing them, plus a few milliseconds for
+# each call (see benchmarks/bench_parallel.py), which are not paid off for
+# the smaller outputs (about 2000 records of Interface table).
+DEFAULT_MIN_SIZE = 1024 * 1024
+
+# Worker processes shared by the calls without `executor`:
+# number of processes --> ProcessPoolExecutor
+_EXECUTORS = {}
+_EXECUTORS_LOCK = threading.Lock()
+
+
+def split_records(buf, n_chunks):
+    """
+    Splits the output of 'ovs-vsctl list' command into at most `n_chunks`
+    chunks of about the same size on the boundaries of the records.
+
+    Parsing each chunk with `list_cmd_parser()` and concatenating the
+    results is equivalent to parsing `buf` at once.
+
+    :param buf: str type output of 'ovs-vsctl list' command.
+    :param n_chunks: Number of chunks.
+    :return: list of str type chunks.
+    """
+    chunks = []
+    start = 0
+    for i in range(1, n_chunks):
+        # Assumption: Each record is separated by empty line.
+        pos = buf.find('\n\n', max(start, len(buf) * i // n_chunks))
+        if pos < 0:
+            break
+        chunks.append(buf[start:pos])
+        start = pos + 2
+    chunks.append(buf[start:])
+    return chunks
+
+
+def _executor(processes):
+    with _EXECUTORS_LOCK:
+        executor = _EXECUTORS.get(processes)
+        if executor is None:
+            executor = ProcessPoolExecutor(max_workers=processes)
+            _EXECUTORS[processes] = executor
+        return executor
+
+
+def shutdown():
+    """
+    Terminates the worker processes shared by `parallel_list_cmd_parser()`.
+    They are started again at the next call.
+    """
+    with _EXECUTORS_LOCK:
+        executors = list(_EXECUTORS.values())
+        _EXECUTORS.clear()
+    for executor in executors:
+        executor.shutdown()
+
+
+def parallel_list_cmd_parser(buf, processes=None, min_size=DEFAULT_MIN_SIZE,
+                             compact=False, executor=None):
+    """
+    Parser for 'ovs-vsctl list' and 'ovs-vsctl find' command which parses
+    the large outputs in parallel.
+
+    The outputs are split into a chunk for each process on the boundaries
+    of the records, and the chunks are parsed by `list_cmd_parser()` in the
+    worker processes. The records are returned in the original order. The
+    outputs smaller than `min_size`, or with a single process, are parsed
+    in the calling process because sending the records back from the
+    workers costs more than parsing them.
+
+    The worker processes are started at the first call and shared by the
+    following calls until `shutdown()` is called, unless `executor` is
+    given.
+
+    Example::
+
+        >>> import functools
+        >>> from ovs_vsctl import VSCtl
+        >>> from ovs_vsctl.parallel import parallel_list_cmd_parser
+        >>> vsctl = VSCtl('tcp', '127.0.0.1', 6640)
+        >>> records = vsctl.run(
+        ...     'list Interface',
+        ...     parser=functools.partial(parallel_list_cmd_parser,
+        ...                              processes=4))
+
+    :param buf: str type output of 'ovs-vsctl list' command.
+    :param processes: Number of worker processes. Defaults to the number of
+     CPUs.
+    :param min_size: Minimum size in characters of `buf` to parse in
+     parallel.
+    :param compact: If `True`, returns the compact records (see
+     `compact_list_cmd_parser()`). The equal values are shared only within
+     each chunk.
+    :param executor: Instance of 'concurrent.futures.ProcessPoolExecutor' to
+     parse the chunks in.
+    :return: list of `Record` instances.
+    """
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if processes <= 1 or len(buf) < min_size:
+        return list_cmd_parser(buf, compact=compact)
+
+    if executor is None:
+        executor = _executor(processes)
+    chunks = split_records(buf, processes)
+    records = []
+    for chunk_records in executor.map(
+            functools.partial(list_cmd_parser, compact=compact), chunks):
+        records.extend(chunk_records)
+    return records
@@ -17,9 +17,20 @@
 Parsers for 'ovs-vsctl' command outputs.
 """
 
+import functools
+from io import StringIO
 import json
+import re
 
-from ovs_vsctl.utils import is_valid_uuid
+
+def _iter_lines(buf):
+    """
+    Returns iterable of lines of the given `buf` which is str or iterable
+    of lines (e.g. outputs in streaming mode).
+    """
+    if isinstance(buf, str):
+        return StringIO(buf)
+    return buf
 
 
 def line_parser(buf):
@@ -27,13 +38,15 @@ def line_parser(buf):
     Parses the given `buf` as str representation of list of values
     (e.g. 'ovs-vsctl list-br' command).
 
-    :param buf: str type value containing values list.
+    :param buf: str type value containing values list, or iterable of
+     lines.
     :return:  list of parsed values.
     """
     values = []
-    for line in buf.split('\n'):
-        if line:
-            values.append(line.strip())
+    for line in _iter_lines(buf):
+        value = line.strip()
+        if value:
+            values.append(value)
     return values
 
 
@@ -43,7 +56,8 @@ def show_cmd_parser(buf):
 
     Currently, parses ONLY 'ovs_version' column.
 
-    :param buf: str type output of 'ovs-vsctl show' command.
+    :param buf: str type output of 'ovs-vsctl show' command, or iterable
+     of lines.
     :return: dict type value of 'ovs-vsctl show' command.
     """
     outputs = {}
@@ -133,12 +147,22 @@ class Record():  # pylint: disable=too-few-public-methods
         :param buf: Record in str type.
         :return: `Record` instance.
         """
+        # Splits buf containing the record info into rows
+        return cls.from_rows(buf.split('\n'))
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        Parses the given `rows` as iterable of str containing a row.
+
+        :param rows: Iterable of rows in str type.
+        :return: `Record` instance.
+        """
         kwargs = {}
 
-        # Splits buf containing the record info into rows
-        for row in buf.split('\n'):
+        for row in rows:
             # Skips empty.
-            if not row:
+            if not row.strip():
                 continue
 
             column, value = _record_row_parser(row)
@@ -147,18 +171,196 @@ class Record():  # pylint: disable=too-few-public-methods
 
         return cls(**kwargs)
 
+    def _items(self):
+        return self.__dict__.items()
+
     def __repr__(self):
         def _sort(items):
             return sorted(items, key=lambda x: x[0])
 
         return ('%s(' % self.__class__.__name__
                 + ', '.join(['%s=%s' % (k, repr(v))
-                             for k, v in _sort(self.__dict__.items())]) + ')')
+                             for k, v in _sort(self._items())]) + ')')
 
     __str__ = __repr__
 
 
-def list_cmd_parser(buf):
+class CompactRecord(Record):
+    """
+    Base class of the compact `Record` classes generated by
+    `compact_record_class()`.
+
+    The columns are stored in `__slots__` instead of `__dict__`, so
+    `vars()` of the instances is always empty.
+    """
+    __slots__ = ()
+
+    def __init__(self, **kwargs):  # pylint: disable=super-init-not-called
+        for column, value in kwargs.items():
+            setattr(self, column, value)
+
+    @classmethod
+    def from_values(cls, values):
+        """
+        Creates a record from the values in the order of the columns.
+
+        :param values: Iterable of values corresponding to `__slots__`.
+        :return: Instance of this class.
+        """
+        record = cls.__new__(cls)
+        for column, value in zip(cls.__slots__, values):
+            setattr(record, column, value)
+        return record
+
+    def _items(self):
+        return [(column, getattr(self, column))
+                for column in self.__slots__ if hasattr(self, column)]
+
+    def __reduce__(self):
+        # The generated classes can not be found by name when unpickled.
+        items = self._items()
+        return _make_compact_record, (tuple(c for c, _ in items),
+                                      [v for _, v in items])
+
+
+class LazyRecord(Record):
+    """
+    `Record` which decodes the value of each column at the first access.
+
+    The raw values are kept until decoded, and the decoded values are
+    stored as the attributes, so `vars()` of the instances contains only
+    the columns which have been accessed. `repr()` and pickling decode all
+    the columns.
+    """
+    __slots__ = ('_raw',)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._raw = {}
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        Parses the given `rows` as iterable of str containing a row without
+        decoding the values.
+
+        :param rows: Iterable of rows in str type.
+        :return: `LazyRecord` instance.
+        """
+        record = cls()
+        raw = record._raw  # pylint: disable=protected-access
+
+        for row in rows:
+            # Skips empty.
+            if not row.strip():
+                continue
+
+            column, value = _record_row_parser(row)
+            raw[column] = value
+
+        return record
+
+    def __getattr__(self, name):
+        # Called only when the column is not decoded yet.
+        if name == '_raw':
+            raise AttributeError(name)
+        try:
+            value = _record_value_parser(self._raw[name])
+        except KeyError:
+            raise AttributeError(
+                "'%s' object has no attribute '%s'"
+                % (self.__class__.__name__, name))
+        self.__dict__[name] = value
+        self._raw.pop(name, None)
+        return value
+
+    def _items(self):
+        for column in list(self._raw):
+            getattr(self, column)
+        return self.__dict__.items()
+
+    def __reduce__(self):
+        return self.__class__, (), dict(self._items())
+
+
+# Cache of the classes generated by compact_record_class().
+_COMPACT_RECORD_CLASSES = {}
+
+
+def compact_record_class(columns):
+    """
+    Returns the compact `Record` class which has the given columns.
+
+    The class is generated at the first call for each set of columns and
+    reused afterward. The generated classes are named 'Record' so that the
+    str representation of the records is the same as `Record`.
+
+    :param columns: Iterable of column names.
+    :return: Subclass of `CompactRecord`.
+    :raise: * ValueError -- When the column names are not identifiers.
+    """
+    columns = tuple(columns)
+    cls = _COMPACT_RECORD_CLASSES.get(columns)
+    if cls is None:
+        if not all(c.isidentifier() for c in columns):
+            raise ValueError('Invalid column names: %s' % (columns,))
+        cls = type('Record', (CompactRecord,), {'__slots__': columns})
+        _COMPACT_RECORD_CLASSES[columns] = cls
+    return cls
+
+
+def _make_compact_record(columns, values):
+    return compact_record_class(columns).from_values(values)
+
+
+def _intern(memo, value):
+    """
+    Returns the str equal to `value` in `memo` (or registers `value` if not
+    found), so that the repeated values and map keys share a single object.
+    """
+    if isinstance(value, str):
+        return memo.setdefault(value, value)
+    if isinstance(value, list):
+        return [_intern(memo, v) for v in value]
+    if isinstance(value, dict):
+        return dict((_intern(memo, k), _intern(memo, v))
+                    for k, v in value.items())
+    return value
+
+
+def _compact_record(rows, memo):
+    """
+    Parses the given `rows` into the compact record interning the values
+    into `memo`.
+    """
+    columns = []
+    values = []
+    for row in rows:
+        # Skips empty.
+        if not row.strip():
+            continue
+
+        column, value = _record_row_parser(row)
+        columns.append(column)
+        values.append(_intern(memo, _record_value_parser(value)))
+
+    try:
+        cls = compact_record_class(columns)
+    except ValueError:
+        return Record(**dict(zip(columns, values)))
+    return cls.from_values(values)
+
+
+def _split_records(buf):
+    """
+    Returns the records in the output of 'ovs-vsctl list' command, i.e. an
+    empty list if no record is found.
+    """
+    # Assumption: Each record is separated by empty line.
+    return [record for record in buf.split('\n\n') if record.strip()]
+
+
+def list_cmd_parser(buf, compact=False, lazy=False):
     """
     Parser for 'ovs-vsctl list' and 'ovs-vsctl find' command.
 
@@ -166,12 +368,25 @@ def list_cmd_parser(buf):
     ovs-vsctl find' command with '--format=list' and '--data=json' options.
 
     :param buf: str type output of 'ovs-vsctl list' command.
-    :return: list of `Record` instances.
+    :param compact: If `True`, returns the compact records (see
+     `compact_list_cmd_parser()`).
+    :param lazy: If `True`, returns the lazy records (see
+     `lazy_list_cmd_parser()`).
+    :return: list of `Record` instances, empty if no record is found.
+    :raise: * ValueError -- When both `compact` and `lazy` are `True`.
     """
+    if compact and lazy:
+        raise ValueError('compact and lazy are mutually exclusive')
+    if lazy:
+        return [LazyRecord.parse(record) for record in _split_records(buf)]
+    if compact:
+        memo = {}
+        return [_compact_record(record.split('\n'), memo)
+                for record in _split_records(buf)]
+
     records = []
 
-    # Assumption: Each record is separated by empty line.
-    for record in buf.split('\n\n'):
+    for record in _split_records(buf):
         records.append(Record.parse(record))
 
     return records
@@ -180,41 +395,474 @@ def list_cmd_parser(buf):
 find_cmd_parser = list_cmd_parser  # pylint: disable=invalid-name
 
 
+def compact_list_cmd_parser(buf):
+    """
+    Memory efficient parser for 'ovs-vsctl list' and 'ovs-vsctl find'
+    command.
+
+    The same as `list_cmd_parser()`, but the records are instances of the
+    classes generated by `compact_record_class()` for each set of columns,
+    which store the columns in `__slots__`. Additionally, the repeated str
+    values (e.g. map keys and enum values) share a single object.
+
+    :param buf: str type output of 'ovs-vsctl list' command.
+    :return: list of `CompactRecord` instances.
+    """
+    return list_cmd_parser(buf, compact=True)
+
+
+def record_columns(record_class):
+    """
+    Returns the columns declared by the given record class as `__slots__`.
+
+    :param record_class: Subclass of `CompactRecord`.
+    :return: tuple of column names.
+    :raise: * ValueError -- When `record_class` declares no columns.
+    """
+    columns = getattr(record_class, '__slots__', ())
+    if isinstance(columns, str):
+        columns = (columns,)
+    if not columns:
+        raise ValueError('No columns declared in %s' % record_class.__name__)
+    return tuple(columns)
+
+
+def record_class_parser(record_class):
+    """
+    Returns the parser for 'ovs-vsctl list' and 'ovs-vsctl find' command
+    which creates the instances of the given record class.
+
+    `record_class` is a subclass of `CompactRecord` declaring the columns
+    as `__slots__`. The other columns in the outputs are ignored. The
+    returned parser has `columns` attribute, so `VSCtl.run()` fetches only
+    the declared columns with '--columns' option.
+
+    Example::
+
+        >>> from ovs_vsctl import VSCtl
+        >>> from ovs_vsctl import record_class_parser
+        >>> from ovs_vsctl.parser import CompactRecord
+        >>> class Interface(CompactRecord):
+        ...     __slots__ = ('name', 'ofport')
+        >>> vsctl = VSCtl('tcp', '127.0.0.1', 6640)
+        >>> vsctl.run('list Interface', parser=record_class_parser(Interface))
+        [Interface(name='s1-eth1', ofport=1), Interface(name='s1-eth2', ...)]
+
+    :param record_class: Subclass of `CompactRecord`.
+    :return: Parser function.
+    :raise: * ValueError -- When `record_class` declares no columns.
+    """
+    columns = record_columns(record_class)
+    declared = frozenset(columns)
+
+    def _parser(buf):
+        records = []
+        for record in _split_records(buf):
+            kwargs = {}
+            for row in record.split('\n'):
+                # Skips empty.
+                if not row.strip():
+                    continue
+                column, value = _record_row_parser(row)
+                if column in declared:
+                    kwargs[column] = _record_value_parser(value)
+            records.append(record_class(**kwargs))
+        return records
+
+    _parser.__name__ = 'record_class_parser(%s)' % record_class.__name__
+    _parser.columns = columns
+    return _parser
+
+
+def lazy_list_cmd_parser(buf):
+    """
+    Parser for 'ovs-vsctl list' and 'ovs-vsctl find' command which decodes
+    the values on demand.
+
+    The same as `list_cmd_parser()`, but the records are `LazyRecord`
+    instances which decode each column at the first access, so that the
+    callers reading a few columns (e.g. 'name' and 'ofport') do not pay
+    for decoding the large columns (e.g. 'statistics').
+
+    Example::
+
+        >>> from ovs_vsctl import VSCtl
+        >>> from ovs_vsctl import lazy_list_cmd_parser
+        >>> vsctl = VSCtl('tcp', '127.0.0.1', 6640)
+        >>> records = vsctl.run('list interface',
+        ...                     parser=lazy_list_cmd_parser)
+        >>> [(r.name, r.ofport) for r in records]
+        [('s1-eth1', 1), ('s1-eth2', 2)]
+
+    :param buf: str type output of 'ovs-vsctl list' command.
+    :return: list of `LazyRecord` instances.
+    """
+    return list_cmd_parser(buf, lazy=True)
+
+
+def iter_list_cmd_parser(buf, compact=False, lazy=False):
+    """
+    Incremental parser for 'ovs-vsctl list' and 'ovs-vsctl find' command.
+
+    Yields each `Record` as soon as its terminating empty line is read, so
+    that only a single record is held in memory at once when `buf` is a
+    stream (e.g. file object or the outputs in streaming mode of
+    `VSCtl.run`).
+
+    Example::
+
+        >>> from ovs_vsctl import VSCtl
+        >>> from ovs_vsctl import iter_list_cmd_parser
+        >>> vsctl = VSCtl('tcp', '127.0.0.1', 6640)
+        >>> for record in vsctl.run('list interface', stream=True,
+        ...                         parser=iter_list_cmd_parser):
+        ...     print(record.name)
+
+    :param buf: str type output of 'ovs-vsctl list' command, or iterable
+     of lines.
+    :param compact: If `True`, yields the compact records (see
+     `compact_list_cmd_parser()`).
+    :param lazy: If `True`, yields the lazy records (see
+     `lazy_list_cmd_parser()`).
+    :return: generator of `Record` instances.
+    :raise: * ValueError -- When both `compact` and `lazy` are `True`.
+    """
+    if compact and lazy:
+        raise ValueError('compact and lazy are mutually exclusive')
+    if lazy:
+        from_rows = LazyRecord.from_rows
+    elif compact:
+        memo = {}
+        from_rows = functools.partial(_compact_record, memo=memo)
+    else:
+        from_rows = Record.from_rows
+
+    rows = []
+    for line in _iter_lines(buf):
+        if line.strip():
+            rows.append(line)
+        elif rows:
+            # Assumption: Each record is separated by empty line.
+            yield from_rows(rows)
+            rows = []
+
+    if rows:
+        yield from_rows(rows)
+
+
+def _json_cell_parser(cell):
+    """
+    Converts the cell of the table printed with '--data=json' option into
+    the same value as `_record_value_parser` returns.
+    """
+    if isinstance(cell, list):
+        if cell[0] == 'map':
+            return dict(cell[1])
+        # UUID or Set type
+        return cell[1]
+    return cell
+
+
+def _load_json_table(buf):
+    if not isinstance(buf, str):
+        buf = ''.join(buf)
+    return json.loads(buf)
+
+
+def json_list_cmd_parser(buf):
+    """
+    Parser for 'ovs-vsctl list' and 'ovs-vsctl find' command which takes
+    the outputs with '--format=json' and '--data=json' options.
+
+    The same as `list_cmd_parser`, but decodes the whole outputs at once and
+    is not confused by the values containing new-lines. `VSCtl.run` prints
+    the outputs in JSON format for this parser.
+
+    Example::
+
+        >>> from ovs_vsctl import VSCtl
+        >>> from ovs_vsctl import json_list_cmd_parser
+        >>> vsctl = VSCtl('tcp', '127.0.0.1', 6640)
+        >>> vsctl.run('list port', parser=json_list_cmd_parser)
+        [Record(_uuid='ba7fee67-2e97-470a-9df5-446d72fa1645', ...)]
+
+    :param buf: str type output of 'ovs-vsctl list' command.
+    :return: list of `Record` instances.
+    """
+    table = _load_json_table(buf)
+    headings = table['headings']
+
+    return [Record(**dict(zip(headings, map(_json_cell_parser, row))))
+            for row in table['data']]
+
+
+json_list_cmd_parser.table_format = 'json'
+
+
+def json_columns_parser(buf):
+    """
+    Column-oriented parser for 'ovs-vsctl list' and 'ovs-vsctl find'
+    command which takes the outputs with '--format=json' and '--data=json'
+    options.
+
+    Example::
+
+        >>> from ovs_vsctl import VSCtl
+        >>> from ovs_vsctl import json_columns_parser
+        >>> vsctl = VSCtl('tcp', '127.0.0.1', 6640)
+        >>> columns = vsctl.run('list interface', parser=json_columns_parser)
+        >>> columns['name']
+        ['s1-eth1', 's1-eth2']
+
+    :param buf: str type output of 'ovs-vsctl list' command.
+    :return: dict of column name and list of values of the column in the
+     order of the rows.
+    """
+    table = _load_json_table(buf)
+    headings = table['headings']
+    columns = list(zip(*table['data'])) or [()] * len(headings)
+
+    return dict((heading, [_json_cell_parser(cell) for cell in column])
+                for heading, column in zip(headings, columns))
+
+
+json_columns_parser.table_format = 'json'
+
+
+# Characters which are not in the bare atoms printed with '--data=string'
+# option (e.g. numbers, booleans, UUIDs and strings consisting of letters,
+# digits, '_', '-' and '.'), i.e. the whitespaces, quotes and separators.
+_NON_BARE_CHAR = re.compile(r'[\s"\[\]{}=,]')
+
+_CLOSERS = {'[': ']', '{': '}'}
+
+_BARE_ATOMS = {'true': True, 'false': False}
+
+
+def _string_atom(buf):
+    """
+    Converts the given atom printed with '--data=string' option into Python
+    object.
+    """
+    char = buf[0]
+    if char == '"':
+        if '\\' in buf:
+            return json.loads(buf)
+        # No escape sequences, strips the quotes.
+        return buf[1:-1]
+    # Bare atoms starting with digits are numbers or UUIDs.
+    if char in '-.0123456789' and not (len(buf) == 36 and buf[8] == '-'):
+        try:
+            return int(buf)
+        except ValueError:
+            return float(buf)
+    return _BARE_ATOMS.get(buf, buf)
+
+
+def _quote_end(buf, pos):
+    """
+    Returns the position of the closing quote of the quoted string starting
+    at `pos`, or -1 if not closed.
+    """
+    end = buf.find('"', pos + 1)
+    while end != -1 and buf[end - 1] == '\\':
+        # The quote is escaped if preceded by an odd number of '\\'.
+        start = end - 1
+        while buf[start - 1] == '\\':
+            start -= 1
+        if (end - start) % 2 == 0:
+            break
+        end = buf.find('"', end + 1)
+    return end
+
+
+def _next_atom(buf, pos, end, separator):
+    """
+    Reads the atom after the whitespaces from `pos` and ending before `end`
+    or the given `separator`, and returns the tuple of the atom (e.g.
+    '"br1"' or '100') and the position after it and the following
+    whitespaces.
+    """
+    while pos < end and buf[pos].isspace():
+        pos += 1
+    if pos == end:
+        # e.g.) '[1, ]'
+        raise ValueError('Missing atom: %s' % buf)
+    if buf[pos] == '"':
+        stop = _quote_end(buf, pos) + 1
+        if not 0 < stop <= end:
+            raise ValueError('Unterminated string: %s' % buf)
+        atom = buf[pos:stop]
+        while stop < end and buf[stop].isspace():
+            stop += 1
+        return atom, stop
+
+    stop = buf.find(separator, pos, end) if separator else -1
+    if stop == -1:
+        stop = end
+    atom = buf[pos:stop].rstrip()
+    if not _is_bare(atom):
+        raise ValueError('Invalid value: %s' % buf)
+    return atom, stop
+
+
+def _is_bare(atom):
+    return atom != '' and _NON_BARE_CHAR.search(atom) is None
+
+
+def _scan_string_value(buf, key=_string_atom, value=_string_atom):
+    """
+    Scans the given value printed with '--data=string' option in a single
+    pass, and builds the Python object directly: list for sets, dict for
+    maps, otherwise the atom.
+
+    Each atom is found by searching for the separator expected next (',' or
+    '=') or the closing quote, and is converted with `key` (or `value` for
+    the values of maps) as it is, e.g. '"br1"' or '100'. The atoms which
+    are not simply followed by the separator (e.g. with the whitespaces or
+    the escape sequences) are read by `_next_atom()`.
+
+    :raise: * ValueError -- When `buf` is not a valid value.
+    """
+    buf = buf.strip()
+    kind = buf[:1]
+    if kind not in _CLOSERS:
+        atom, pos = _next_atom(buf, 0, len(buf), None)
+        if pos != len(buf):
+            raise ValueError('Invalid value: %s' % buf)
+        return key(atom)
+
+    end = len(buf) - 1
+    if buf[end] != _CLOSERS[kind]:
+        raise ValueError('Invalid value: %s' % buf)
+    pos = 1
+    while buf[pos].isspace():
+        pos += 1
+    if pos == end:
+        return [] if kind == '[' else {}
+
+    if kind == '[':
+        separator = next_separator = ','
+        convert = next_convert = key
+    else:
+        separator, next_separator = '=', ','
+        convert, next_convert = key, value
+    find = buf.find
+    atoms = []
+    while True:
+        if buf[pos] == '"':
+            stop = find('"', pos + 1) + 1
+            if (0 < stop <= end and buf[stop - 2] != '\\'
+                    and (stop == end or buf[stop] == separator)):
+                atom = buf[pos:stop]
+            else:
+                atom, stop = _next_atom(buf, pos, end, separator)
+        else:
+            stop = find(separator, pos, end)
+            if stop == -1:
+                stop = end
+            atom = buf[pos:stop]
+            # Most of the bare atoms are UUIDs, integers or names.
+            if not (atom.replace('-', '').isalnum() or _is_bare(atom)):
+                atom, stop = _next_atom(buf, pos, end, separator)
+        atoms.append(convert(atom))
+
+        if stop == end:
+            break
+        if buf[stop] != separator:
+            raise ValueError('Invalid value: %s' % buf)
+        # The other whitespaces are skipped by `_next_atom()`.
+        pos = stop + 2 if buf[stop + 1] == ' ' else stop + 1
+        separator, next_separator = next_separator, separator
+        convert, next_convert = next_convert, convert
+
+    if kind == '[':
+        return atoms
+    if separator == '=':
+        # The value of the last pair is missing, e.g. '{a}'.
+        raise ValueError('Missing value: %s' % buf)
+    atoms = iter(atoms)
+    return dict(zip(atoms, atoms))
+
+
+def string_value_parser(buf):
+    """
+    Parses the given `buf` as a value printed with '--data=string' option of
+    'ovs-vsctl' command, e.g. the outputs of 'ovs-vsctl get' command and the
+    cells of 'ovs-vsctl list' command.
+
+    The value is tokenized in a single pass without rewriting `buf`, and
+    the atoms are converted into Python objects directly: sets into list,
+    maps into dict, quoted strings into str (unescaped), and bare atoms
+    into int, float, bool or str (e.g. UUIDs). The keys of maps are
+    converted in the same way, e.g. `{1: 'a'}` for '{1="a"}'. The
+    separators in the quoted strings (e.g. '", "' or '=') are kept as they
+    are.
+
+    Example::
+
+        >>> string_value_parser('{stp-enable="true", "a=b"="c, d"}')
+        {'stp-enable': 'true', 'a=b': 'c, d'}
+        >>> string_value_parser('[100, 200]')
+        [100, 200]
+
+    :param buf: str type value.
+    :return: python object corresponding to the value type.
+    :raise: * ValueError -- When `buf` is not a valid value.
+    """
+    if not buf.strip():
+        return ''
+    return _scan_string_value(buf)
+
+
+def string_list_cmd_parser(buf):
+    """
+    Parser for 'ovs-vsctl list' and 'ovs-vsctl find' command with
+    '--data=string' option.
+
+    The same as `list_cmd_parser()`, except that the cells are parsed with
+    `string_value_parser()`, e.g. single element sets are the atom.
+    `VSCtl.run()` executes the command with '--data=string' option for this
+    parser.
+
+    :param buf: str type output of 'ovs-vsctl list' command, or iterable
+     of lines.
+    :return: list of `Record` instances.
+    """
+    records = []
+    kwargs = {}
+    for line in _iter_lines(buf):
+        column, _, value = line.partition(':')
+        if not value.strip():
+            # Assumption: Each record is separated by empty line.
+            if kwargs:
+                records.append(Record(**kwargs))
+                kwargs = {}
+            continue
+        kwargs[column.strip()] = string_value_parser(value)
+    if kwargs:
+        records.append(Record(**kwargs))
+    return records
+
+
+string_list_cmd_parser.data_format = 'string'
+
+
 def get_cmd_parser(buf):
     """
     Parser for 'ovs-vsctl get' command.
 
-    `buf` must be the str type and the output of 'ovs-vsctl get' command.
-
-    Assumption: The output is mostly formatted in json, except for 'uuid'
-    and 'key' of map type value.
+    `buf` must be the str type and the output of 'ovs-vsctl get' command,
+    which is always printed with '--data=string' format.
+    See `string_value_parser()` for the conversions.
 
     :param buf: value of 'ovs-vsctl get' command.
-    :return: python object corresponding to the value type of row.
+    :return: python object corresponding to the value type of row, or the
+     given `buf` stripped if it is not a single value (e.g. the outputs
+     of multiple columns).
     """
     buf = buf.strip('\n')
     try:
-        value = json.loads(buf)
-        return value
+        return string_value_parser(buf)
     except ValueError:
-        # Handles in the following.
-        pass
-
-    value = buf  # Default value
-    if is_valid_uuid(buf):
-        # UUID type
-        pass  # Uses the default
-    elif buf.startswith('['):
-        # Set type (might be containing UUIDs)
-        # e.g.)
-        #   [<UUID>, <UUID>]
-        buf = buf.replace('[', '["').replace(', ', '", "').replace(']', '"]')
-        value = json.loads(buf)
-    elif buf.startswith('{'):
-        # Map type
-        # e.g.)
-        #   {stp-enable="true", stp-priority="100"}
-        buf = buf.replace('{', '{"').replace('=', '": ').replace(', ', ', "')
-        value = json.loads(buf)
-
-    return value
+        return buf
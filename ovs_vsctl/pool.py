@@ -0,0 +1,175 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+APIs for execute 'ovs-vsctl' command across many switches in parallel.
+"""
+
+from concurrent.futures import as_completed
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+
+from ovs_vsctl.vsctl import VSCtl
+
+DEFAULT_MAX_WORKERS = 32
+
+_EXECUTORS = {
+    'thread': ThreadPoolExecutor,
+    'process': ProcessPoolExecutor,
+}
+
+
+class TargetResult():  # pylint: disable=too-few-public-methods
+    """
+    Result of the command executed on a target.
+
+    :param target: Tuple of protocol, address and port of the target.
+    :param output: Output of the command, the same as `VSCtl.run()`.
+    :param error: Exception raised while executing the command, e.g.
+     `ovs_vsctl.exception.VSCtlCmdExecError`.
+    """
+
+    def __init__(self, target, output=None, error=None):
+        self.target = target
+        self.output = output
+        self.error = error
+
+    @property
+    def ok(self):  # pylint: disable=invalid-name
+        """
+        `True` if the command succeeded, otherwise `False`.
+        """
+        return self.error is None
+
+    def __repr__(self):
+        if self.ok:
+            return '%s(target=%r, output=%r)' % (
+                self.__class__.__name__, self.target, self.output)
+        return '%s(target=%r, error=%r)' % (
+            self.__class__.__name__, self.target, self.error)
+
+
+def _run_target(factory, target, command, kwargs):
+    """
+    Executes `command` on the given `target` and returns `TargetResult`.
+
+    Defined at module level so that it can be sent to the worker processes.
+    """
+    try:
+        vsctl = factory(*target)
+        try:
+            output = vsctl.run(command, **kwargs)
+        finally:
+            vsctl.close()
+    except Exception as e:  # pylint: disable=invalid-name
+        return TargetResult(target, error=e)
+
+    return TargetResult(target, output=output)
+
+
+class VSCtlPool():
+    """
+    Executor of 'ovs-vsctl' command across many targets in parallel.
+
+    Example::
+
+        >>> from ovs_vsctl import list_cmd_parser
+        >>> from ovs_vsctl.pool import VSCtlPool
+        >>> targets = [('tcp', '192.168.0.%d' % i, 6640)
+        ...            for i in range(1, 255)]
+        >>> with VSCtlPool(max_workers=64) as pool:
+        ...     for result in pool.run(targets, 'list bridge',
+        ...                            parser=list_cmd_parser):
+        ...         if result.ok:
+        ...             print(result.target, len(result.output))
+        ...         else:
+        ...             print(result.target, result.error)
+
+    :param max_workers: Maximum number of commands executed at once.
+    :param executor: `'thread'` or `'process'`. With `'process'`, the
+     parser, the outputs and `factory` must be picklable.
+    :param factory: Callable which takes protocol, address and port, and
+     returns an instance of `ovs_vsctl.VSCtl`. Defaults to `VSCtl`.
+     'functools.partial' is useful for giving options, e.g.
+     `partial(VSCtl, backend=JsonRpcBackend)`.
+    :raise: * ValueError -- When the given executor is not supported.
+    """
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, executor='thread',
+                 factory=VSCtl):
+        if executor not in _EXECUTORS:
+            raise ValueError('Unsupported executor: %s' % executor)
+        self.max_workers = max_workers
+        self.factory = factory
+        self._executor = _EXECUTORS[executor](max_workers=max_workers)
+
+    def run(self, targets, command, table_format='list',
+            data_format='string', parser=None, columns=None):
+        """
+        Executes ovs-vsctl command on each of `targets`.
+
+        The failure on a target (including the failure to send the command
+        to or to receive the output from the worker process) does not abort
+        the others, and is reported as `error` of the result.
+
+        :param targets: Iterable of tuples of protocol, address and port.
+        :param command: Command to execute. Meaning is the same as
+         `VSCtl.run()`.
+        :param table_format: Table format. Meaning is the same as
+         `VSCtl.run()`.
+        :param data_format: Cell format in table. Meaning is the same as
+         `VSCtl.run()`.
+        :param parser: Parser class for the outputs. Meaning is the same as
+         `VSCtl.run()`.
+        :param columns: Column names to print. Meaning is the same as
+         `VSCtl.run()`.
+        :return: generator of `TargetResult` in the order of completion.
+         The pending commands are cancelled when the generator is closed.
+        """
+        kwargs = {
+            'table_format': table_format,
+            'data_format': data_format,
+            'parser': parser,
+            'columns': columns,
+        }
+        futures = dict(
+            (self._executor.submit(_run_target, self.factory, tuple(target),
+                                   command, kwargs), tuple(target))
+            for target in targets)
+
+        try:
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:  # pylint: disable=invalid-name
+                    # e.g.) The arguments or the outputs are not picklable
+                    # with the process executor.
+                    result = TargetResult(futures[future], error=e)
+                yield result
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def close(self):
+        """
+        Shuts down the workers after the submitted commands completed.
+        """
+        self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
@@ -0,0 +1,181 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Builder of the conditions of 'ovs-vsctl find' command, so that the records
+are selected by 'ovs-vsctl' (or OVSDB server) instead of fetching the whole
+table.
+"""
+
+import re
+import shlex
+
+from ovs_vsctl.datum import atom_to_string
+from ovs_vsctl.datum import python_to_string
+from ovs_vsctl.parser import find_cmd_parser
+
+# Operators of the conditions. The ones in braces compare sets and maps,
+# e.g. '{>=}' means that the column contains all the given elements.
+OPERATORS = frozenset([
+    '=', '!=', '<', '>', '<=', '>=',
+    '{=}', '{!=}', '{<}', '{>}', '{<=}', '{>=}', '{in}', '{not-in}',
+])
+
+_COLUMN = re.compile(r'^[A-Za-z_][A-Za-z0-9_-]*$')
+
+
+def _check_column(column):
+    if not isinstance(column, str) or not _COLUMN.match(column):
+        raise ValueError('Invalid column name: %r' % (column,))
+
+
+def _condition(column, operator, value, key=None):
+    _check_column(column)
+    if operator not in OPERATORS:
+        raise ValueError('Unsupported operator: %s' % operator)
+    if key is None:
+        return '%s%s%s' % (column, operator, python_to_string(value))
+    return '%s:%s%s%s' % (column, atom_to_string(key), operator,
+                          python_to_string(value))
+
+
+class Query():
+    """
+    Query of the records of a table executed by 'ovs-vsctl find' command.
+
+    The methods return a new query with the condition (or columns) added,
+    so a query can be shared as the base of the other queries. The values
+    are formatted and quoted for 'ovs-vsctl', so any str (e.g. including
+    spaces and quotes) can be given as is.
+
+    Example::
+
+        >>> from ovs_vsctl import VSCtl
+        >>> from ovs_vsctl.query import Query
+        >>> vsctl = VSCtl('tcp', '127.0.0.1', 6640)
+        >>> query = (Query('Interface', type='internal')
+        ...          .where('external_ids', '=', 'vm 1', key='iface-id')
+        ...          .where('ofport', '>', 0)
+        ...          .select('name', 'ofport'))
+        >>> query.args()
+        ['find', 'Interface', 'type=internal',
+         'external_ids:iface-id="vm 1"', 'ofport>0']
+        >>> query.run(vsctl)
+        [Record(name='tap1', ofport=1)]
+
+    :param table: Table name.
+    :param equals: Columns and values which the records should have. dict
+     values are compared for each key, i.e. the same as
+     `where(column, '=', value, key=key)` for each key.
+    :raise: * ValueError -- When the given column name is invalid.
+    """
+
+    def __init__(self, table, **equals):
+        _check_column(table)
+        self.table = table
+        self.conditions = []
+        self.columns = None
+        for column, value in sorted(equals.items()):
+            if isinstance(value, dict):
+                for key, atom in sorted(value.items()):
+                    self.conditions.append(
+                        _condition(column, '=', atom, key))
+            else:
+                self.conditions.append(_condition(column, '=', value))
+
+    def _copy(self):
+        query = Query(self.table)
+        query.conditions = list(self.conditions)
+        query.columns = self.columns
+        return query
+
+    def where(self, column, operator, value, key=None):
+        """
+        Returns the query with the given condition added.
+
+        :param column: Column name.
+        :param operator: One of `OPERATORS`.
+        :param value: Value to compare with, i.e. atom, list for sets (or
+         `None` for empty) and dict for maps.
+        :param key: Key of the map column to compare the value of.
+        :return: `Query` instance.
+        :raise: * ValueError -- When the given column name or operator is
+                  invalid.
+        """
+        condition = _condition(column, operator, value, key)
+        query = self._copy()
+        query.conditions.append(condition)
+        return query
+
+    def contains(self, column, values):
+        """
+        Returns the query with the condition that the set (or map) column
+        contains all the given elements (or items).
+
+        :param column: Column name.
+        :param values: list of elements, or dict of items.
+        :return: `Query` instance.
+        """
+        if not isinstance(values, dict):
+            values = list(values)
+        return self.where(column, '{>=}', values)
+
+    def select(self, *columns):
+        """
+        Returns the query which fetches only the given columns.
+
+        :param columns: Column names.
+        :return: `Query` instance.
+        :raise: * ValueError -- When the given column name is invalid.
+        """
+        for column in columns:
+            _check_column(column)
+        query = self._copy()
+        query.columns = tuple(columns)
+        return query
+
+    def args(self):
+        """
+        Returns the arguments of 'ovs-vsctl find' command without the
+        columns to fetch (see `run()`).
+
+        :return: list of str type arguments.
+        """
+        return ['find', self.table] + self.conditions
+
+    def command(self):
+        """
+        Returns the command for `VSCtl.run()` without the columns to fetch.
+
+        :return: str type command.
+        """
+        return ' '.join(shlex.quote(a) for a in self.args())
+
+    def run(self, vsctl, parser=find_cmd_parser):
+        """
+        Executes the query.
+
+        :param vsctl: Instance of `VSCtl`.
+        :param parser: Parser for the outputs. If `select()` is not called,
+         `columns` attribute of the parser is respected (e.g.
+         `record_class_parser()`).
+        :return: The parsed outputs, e.g. list of `Record` instances.
+        :raise: * ovs_vsctl.exception.VSCtlCmdExecError -- When the command
+                  fails, e.g. the column does not exist.
+        """
+        return vsctl.run(self.command(), parser=parser, columns=self.columns)
+
+    def __repr__(self):
+        return '%s(%r)' % (self.__class__.__name__, self.command())
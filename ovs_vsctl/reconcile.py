@@ -0,0 +1,262 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Reconciliation of the bridges, ports and interfaces towards the desired
+state with the minimal commands of 'ovs-vsctl'.
+"""
+
+import shlex
+
+from ovs_vsctl.datum import atom_to_string
+from ovs_vsctl.datum import python_to_string
+from ovs_vsctl.parser import Record
+from ovs_vsctl.parser import list_cmd_parser
+from ovs_vsctl.reference import ReferenceResolver
+
+_TABLES = ('Bridge', 'Port', 'Interface')
+
+
+def _normalize(value):
+    """
+    Returns the comparable form of the given column value, e.g. single
+    element sets are parsed as the atom by `list_cmd_parser`.
+    """
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple, set, frozenset)):
+        value = sorted(value)
+        if len(value) == 1:
+            return value[0]
+    return value
+
+
+def _records(value):
+    # Reference columns are linked to a Record, or a list of Records.
+    if isinstance(value, Record):
+        return [value]
+    return [r for r in value or [] if isinstance(r, Record)]
+
+
+def _column_commands(table, name, columns, record=None):
+    """
+    Returns the commands which update the columns of the given record (or
+    of the record created just before if `record` is `None`) to `columns`.
+
+    Map columns are updated for each key, so the keys which are not
+    changed are not touched.
+    """
+    args = []
+    removed = []
+    for column, value in sorted(columns.items()):
+        actual = getattr(record, column, None) if record is not None else None
+        if isinstance(value, dict):
+            actual = actual if isinstance(actual, dict) else {}
+            for key, atom in sorted(value.items()):
+                if key not in actual or actual[key] != atom:
+                    args.append('%s:%s=%s' % (column, atom_to_string(key),
+                                              atom_to_string(atom)))
+            removed.extend((column, key)
+                           for key in sorted(set(actual) - set(value)))
+        elif record is None or _normalize(actual) != _normalize(value):
+            args.append('%s=%s' % (column, python_to_string(value)))
+
+    commands = []
+    if args:
+        commands.append('set %s %s %s' % (
+            table, shlex.quote(name), ' '.join(shlex.quote(a) for a in args)))
+    for column, key in removed:
+        commands.append('remove %s %s %s %s' % (
+            table, shlex.quote(name), column,
+            shlex.quote(atom_to_string(key))))
+    return commands
+
+
+class State():  # pylint: disable=too-few-public-methods
+    """
+    Actual state of the bridges, ports and interfaces.
+
+    :param bridges: list of `Record` of Bridge table, whose 'ports' and
+     their 'interfaces' are linked to `Record` instances.
+    """
+
+    def __init__(self, bridges):
+        # Bridge name --> Record
+        self.bridges = dict((b.name, b) for b in bridges)
+        # Port name --> (Bridge Record, Port Record)
+        self.ports = {}
+        for bridge in bridges:
+            for port in _records(bridge.ports):
+                self.ports[port.name] = (bridge, port)
+
+
+class Reconciler():
+    """
+    Reconciles the bridges, ports and interfaces with the desired state.
+
+    The actual state is fetched by a single invocation of 'ovs-vsctl'
+    (with `VSCtl.run_batch()`), and the differences are applied by a single
+    transaction. So if nothing has changed, `reconcile()` costs a single
+    read and no write.
+
+    The desired state is a dict of the bridge names and their specs::
+
+        {
+            'br-int': {
+                # Columns of Bridge table.
+                'columns': {'fail_mode': 'secure'},
+                'ports': {
+                    'tap0': {
+                        # Columns of Port table.
+                        'columns': {'tag': 10},
+                        # Interface names and their columns, defaults to
+                        # an interface of the same name as the port.
+                        'interfaces': {
+                            'tap0': {'type': 'internal',
+                                     'external_ids': {'iface-id': 'vm1'}},
+                        },
+                    },
+                },
+            },
+        }
+
+    Only the specified columns are compared. Map columns (e.g.
+    'external_ids') are compared for each key, and the keys not specified
+    are removed. The values should be the types of the column, e.g. str
+    for the values of 'options'.
+
+    The ports which are not specified are deleted from the specified
+    bridges, except the local port of the bridge. The bridges which are not
+    specified are deleted only if `delete_bridges` is `True`.
+
+    Example::
+
+        >>> from ovs_vsctl import VSCtl
+        >>> from ovs_vsctl.reconcile import Reconciler
+        >>> vsctl = VSCtl('tcp', '127.0.0.1', 6640)
+        >>> reconciler = Reconciler(vsctl)
+        >>> reconciler.reconcile({'s1': {'ports': {'s1-eth1': {}}}})
+        ['--may-exist add-br s1', '--may-exist add-port s1 s1-eth1']
+        >>> reconciler.reconcile({'s1': {'ports': {'s1-eth1': {}}}})
+        []
+
+    :param vsctl: Instance of `VSCtl`.
+    :param delete_bridges: If `True`, deletes the bridges not specified.
+    """
+
+    def __init__(self, vsctl, delete_bridges=False):
+        self.vsctl = vsctl
+        self.delete_bridges = delete_bridges
+
+    def fetch(self):
+        """
+        Fetches the actual state by a single invocation.
+
+        :return: `State` instance.
+        """
+        bridges, ports, interfaces = self.vsctl.run_batch(
+            [('list %s' % t, list_cmd_parser) for t in _TABLES])
+        resolver = ReferenceResolver(self.vsctl)
+        resolver.records = dict((getattr(r, '_uuid'), r)
+                                for r in ports + interfaces)
+        # All the referred records are fetched, so no invocation here.
+        resolver.resolve('Bridge', bridges, depth=2)
+        return State(bridges)
+
+    def plan(self, desired, state):
+        """
+        Returns the commands which reconcile `state` with `desired`.
+
+        :param desired: dict of the desired state.
+        :param state: `State` instance of the actual state.
+        :return: list of the commands, empty if nothing to change.
+        """
+        deletions = []
+        commands = []
+
+        if self.delete_bridges:
+            deletions.extend('del-br %s' % shlex.quote(name)
+                             for name in sorted(state.bridges)
+                             if name not in desired)
+
+        for br_name, br_spec in sorted(desired.items()):
+            bridge = state.bridges.get(br_name)
+            if bridge is None:
+                commands.append('--may-exist add-br %s' % shlex.quote(br_name))
+            commands.extend(_column_commands(
+                'Bridge', br_name, br_spec.get('columns', {}), bridge))
+
+            port_specs = br_spec.get('ports', {})
+            if bridge is not None:
+                deletions.extend(
+                    'del-port %s %s' % (shlex.quote(br_name),
+                                        shlex.quote(p.name))
+                    for p in sorted(_records(bridge.ports),
+                                    key=lambda p: p.name)
+                    if p.name not in port_specs and p.name != br_name)
+
+            for port_name, port_spec in sorted(port_specs.items()):
+                commands.extend(self._port_commands(
+                    br_name, port_name, port_spec, state, deletions))
+
+        # A moved port may be deleted twice, as a port to delete from its
+        # bridge and as a port to move.
+        return list(dict.fromkeys(deletions)) + commands
+
+    @staticmethod
+    def _port_commands(br_name, port_name, spec, state, deletions):
+        iface_specs = spec.get('interfaces') or {port_name: {}}
+        bridge, port = state.ports.get(port_name, (None, None))
+        interfaces = dict((i.name, i) for i in _records(
+            port.interfaces if port is not None else None))
+
+        if port is not None and (bridge.name != br_name
+                                 or set(interfaces) != set(iface_specs)):
+            # Moved to the other bridge, or the interfaces are changed.
+            deletions.append('del-port %s %s' % (
+                shlex.quote(bridge.name), shlex.quote(port_name)))
+            port = None
+            interfaces = {}
+
+        commands = []
+        if port is None:
+            if list(iface_specs) == [port_name]:
+                commands.append('--may-exist add-port %s %s' % (
+                    shlex.quote(br_name), shlex.quote(port_name)))
+            else:
+                commands.append('add-bond %s %s %s' % (
+                    shlex.quote(br_name), shlex.quote(port_name),
+                    ' '.join(shlex.quote(i) for i in sorted(iface_specs))))
+        commands.extend(_column_commands(
+            'Port', port_name, spec.get('columns', {}), port))
+        for iface_name, columns in sorted(iface_specs.items()):
+            commands.extend(_column_commands(
+                'Interface', iface_name, columns or {},
+                interfaces.get(iface_name)))
+        return commands
+
+    def reconcile(self, desired):
+        """
+        Reconciles the actual state with `desired` by a single transaction.
+
+        :param desired: dict of the desired state.
+        :return: list of the executed commands, empty if nothing changed.
+        :raise: * ovs_vsctl.exception.VSCtlCmdExecError -- When the
+                  transaction fails. Nothing is changed in this case.
+        """
+        commands = self.plan(desired, self.fetch())
+        if commands:
+            self.vsctl.run(' -- '.join(commands))
+        return commands
@@ -0,0 +1,235 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Resolution of the UUID references between the records (e.g. 'ports' of
+Bridge and 'interfaces' of Port) in batches, instead of 'ovs-vsctl get' or
+'ovs-vsctl list' command for each reference.
+"""
+
+from ovs_vsctl.parser import list_cmd_parser
+from ovs_vsctl.utils import is_valid_uuid
+
+# Reference columns of 'Open_vSwitch' database:
+# {table: {column: referred table}}
+DEFAULT_REFERENCES = {
+    'Open_vSwitch': {
+        'bridges': 'Bridge',
+        'manager_options': 'Manager',
+        'ssl': 'SSL',
+    },
+    'Bridge': {
+        'controller': 'Controller',
+        'ipfix': 'IPFIX',
+        'mirrors': 'Mirror',
+        'netflow': 'NetFlow',
+        'ports': 'Port',
+        'sflow': 'sFlow',
+    },
+    'Port': {
+        'interfaces': 'Interface',
+        'qos': 'QoS',
+    },
+    'Mirror': {
+        'output_port': 'Port',
+        'select_dst_port': 'Port',
+        'select_src_port': 'Port',
+    },
+    'QoS': {
+        'queues': 'Queue',
+    },
+}
+
+
+def _uuid(atom):
+    """
+    Returns the UUID of the given atom, or `None` if not UUID.
+    """
+    if isinstance(atom, list) and len(atom) == 2 and atom[0] == 'uuid':
+        # The elements of sets and maps parsed by `list_cmd_parser`, e.g.
+        # ['uuid', '79c26f92-86f9-485f-945d-5786c8147f53']
+        atom = atom[1]
+    if isinstance(atom, str) and is_valid_uuid(atom):
+        return atom
+    return None
+
+
+def _elements(value):
+    """
+    Returns the atoms in the value of a reference column, i.e. the atom
+    itself for single references, list for sets and dict for maps.
+    """
+    if isinstance(value, dict):
+        return list(value.values())
+    if isinstance(value, list) and _uuid(value) is None:
+        return value
+    return [value]
+
+
+def _uuids(value):
+    return [u for u in (_uuid(a) for a in _elements(value)) if u is not None]
+
+
+class ReferenceResolver():
+    """
+    Resolver of the UUID references between the records parsed by
+    `ovs_vsctl.list_cmd_parser` (or its variants).
+
+    The referred records are fetched level by level: the unresolved UUIDs
+    of each level are collected for each table and fetched with a single
+    invocation of `VSCtl.run_batch()`. Then the UUIDs in the reference
+    columns are replaced with the referred `Record` instances, keeping the
+    shape of the values (single value, list for sets and dict for maps).
+    The fetched records are cached until `clear()` is called, so the
+    records referred from multiple records are shared.
+
+    Example::
+
+        >>> from ovs_vsctl import VSCtl
+        >>> from ovs_vsctl import list_cmd_parser
+        >>> from ovs_vsctl.reference import ReferenceResolver
+        >>> vsctl = VSCtl('tcp', '127.0.0.1', 6640)
+        >>> resolver = ReferenceResolver(vsctl)
+        >>> bridges = resolver.resolve(
+        ...     'Bridge', vsctl.run('list Bridge', parser=list_cmd_parser))
+        >>> [i.ofport for p in bridges[0].ports for i in p.interfaces]
+        [65534, 1, 2]
+
+    :param vsctl: Instance of `VSCtl` to fetch the records.
+    :param references: dict of table name and dict of reference column and
+     referred table. Defaults to `DEFAULT_REFERENCES`.
+    :param parser: Parser for the fetched records.
+    """
+
+    def __init__(self, vsctl, references=None, parser=list_cmd_parser):
+        self.vsctl = vsctl
+        self.references = (DEFAULT_REFERENCES if references is None
+                           else references)
+        self.parser = parser
+        # UUID --> Record
+        self.records = {}
+        # UUIDs of the records whose references are resolved.
+        self._linked = set()
+
+    @classmethod
+    def from_schema(cls, vsctl, schema, parser=list_cmd_parser):
+        """
+        Creates the resolver of all the reference columns in the given
+        schema.
+
+        :param vsctl: Instance of `VSCtl` to fetch the records.
+        :param schema: `ovs_vsctl.schema.Schema` instance.
+        :param parser: Parser for the fetched records.
+        :return: `ReferenceResolver` instance.
+        """
+        references = {}
+        for table in schema.tables.values():
+            for column in table.columns.values():
+                ref_table = (column.type.key.ref_table
+                             or (column.type.value is not None
+                                 and column.type.value.ref_table))
+                if ref_table:
+                    references.setdefault(
+                        table.name, {})[column.name] = ref_table
+        return cls(vsctl, references, parser)
+
+    def clear(self):
+        """
+        Drops the cached records, e.g. when the database has been changed.
+        """
+        self.records = {}
+        self._linked = set()
+
+    def resolve(self, table, records, depth=None):
+        """
+        Replaces the UUIDs in the reference columns of the given records
+        (and of the referred records recursively) with `Record` instances.
+
+        :param table: Table name of `records`.
+        :param records: list of `Record` instances of `table`, which are
+         updated in place.
+        :param depth: Maximum number of the references to follow. `None`
+         means no limit.
+        :return: `records`.
+        :raise: * ovs_vsctl.exception.VSCtlCmdExecError -- When failed to
+                  fetch the referred records, e.g. a referred record has
+                  been deleted.
+        """
+        pending = [(table, records)]
+        while pending and depth != 0:
+            self._fetch(pending)
+            pending = self._link(pending)
+            if depth is not None:
+                depth -= 1
+        return records
+
+    def _fetch(self, pending):
+        """
+        Fetches the records referred from `pending` which are not cached
+        yet.
+        """
+        missing = {}
+        for table, records in pending:
+            references = self.references.get(table, {})
+            for record in records:
+                for column, ref_table in references.items():
+                    for uuid in _uuids(getattr(record, column, None)):
+                        if uuid not in self.records:
+                            missing.setdefault(ref_table, set()).add(uuid)
+        if not missing:
+            return
+
+        tables = sorted(missing)
+        outputs = self.vsctl.run_batch(
+            [('list %s %s' % (t, ' '.join(sorted(missing[t]))), self.parser)
+             for t in tables])
+        for fetched in outputs:
+            for record in fetched:
+                self.records[getattr(record, '_uuid')] = record
+
+    def _link(self, pending):
+        """
+        Replaces the UUIDs in `pending` with the cached records, and
+        returns the referred records to link in the next level.
+        """
+        referred = {}
+        for table, records in pending:
+            references = self.references.get(table, {})
+            for record in records:
+                uuid = getattr(record, '_uuid', None)
+                if uuid is not None:
+                    self.records.setdefault(uuid, record)
+                    self._linked.add(uuid)
+                for column, ref_table in references.items():
+                    value = getattr(record, column, None)
+                    if value is None:
+                        continue
+                    setattr(record, column, self._linked_value(value))
+                    for ref_uuid in _uuids(value):
+                        if (ref_uuid in self.records
+                                and ref_uuid not in self._linked):
+                            referred.setdefault(ref_table, {})[ref_uuid] = (
+                                self.records[ref_uuid])
+        return [(t, list(r.values())) for t, r in sorted(referred.items())]
+
+    def _linked_value(self, value):
+        if isinstance(value, dict):
+            return dict((k, self._linked_atom(v)) for k, v in value.items())
+        if isinstance(value, list) and _uuid(value) is None:
+            return [self._linked_atom(v) for v in value]
+        return self._linked_atom(value)
+
+    def _linked_atom(self, atom):
+        return self.records.get(_uuid(atom), atom)
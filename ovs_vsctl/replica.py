@@ -0,0 +1,332 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+In-memory replica of OVSDB tables kept up to date with 'monitor' method of
+OVSDB management protocol (RFC 7047), instead of polling 'ovs-vsctl list'.
+"""
+
+import logging
+import threading
+
+from ovs_vsctl import datum
+from ovs_vsctl import exception
+from ovs_vsctl import jsonrpc
+from ovs_vsctl.parser import _json_cell_parser
+from ovs_vsctl.parser import Record
+from ovs_vsctl.schema import Schema
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_RETRY_INTERVAL = 1.0
+
+# ID of the monitor in 'update' notifications.
+_MONITOR_ID = 'ovs_vsctl.replica'
+
+
+def _same_record(record, other):
+    # pylint: disable=protected-access
+    return dict(record._items()) == dict(other._items())
+
+
+class Replica():
+    """
+    Replica of OVSDB tables on the target of `VSCtl`.
+
+    Downloads the rows of the given tables once with 'monitor' request, and
+    applies the 'update' notifications in a background thread, so that the
+    reads are served from memory without requests to OVSDB server.
+    If the connection is lost, reconnects and downloads the rows again.
+
+    The rows are `ovs_vsctl.parser.Record` which has the same values as
+    `ovs_vsctl.list_cmd_parser` returns. The records are replaced with new
+    instances when updated, so must not be modified.
+
+    Example::
+
+        >>> from ovs_vsctl import VSCtl
+        >>> from ovs_vsctl.replica import Replica
+        >>> vsctl = VSCtl('tcp', '127.0.0.1', 6640)
+        >>> def on_change(table, old, new):
+        ...     print(table, old, new)
+        >>> replica = Replica(vsctl, ['Port', 'Interface'],
+        ...                   columns={'Interface': ['name', 'ofport']},
+        ...                   callbacks=[on_change])
+        >>> replica.start()
+        Port None Record(_uuid='ba7fee67-...', name='s1-eth1', ...)
+        ...
+        >>> replica.get('Interface', 's1-eth1').ofport
+        1
+        >>> replica.stop()
+
+    :param vsctl: Instance of `VSCtl` whose target is replicated.
+    :param tables: Names of the tables to replicate (abbreviations are
+     available).
+    :param columns: dict of table name and columns to replicate. Defaults
+     to all the columns.
+    :param callbacks: Functions called with the table name, the old record
+     and the new record for each change. The old record is `None` for the
+     inserted rows (including the rows downloaded at the start), and the
+     new record is `None` for the deleted rows. Called in the background
+     thread (or in `start()` for the rows downloaded at the start).
+    :param timeout: Timeout in seconds for the requests. If no message is
+     received within `timeout` after started, the replica reconnects.
+     `None` means no timeout.
+    :param ssl_context: Instance of 'ssl.SSLContext' for 'ssl' protocol.
+    :param retry_interval: Seconds to wait before reconnecting.
+    :param database: Database name.
+    """
+
+    def __init__(self, vsctl, tables, columns=None, callbacks=(),
+                 timeout=None, ssl_context=None,
+                 retry_interval=DEFAULT_RETRY_INTERVAL,
+                 database='Open_vSwitch'):
+        self.ovsdb_addr = vsctl.ovsdb_addr
+        self.tables = list(tables)
+        self.columns = columns or {}
+        self.callbacks = list(callbacks)
+        self.retry_interval = retry_interval
+        self.database = database
+        self.schema = None
+        self.connection = jsonrpc.Connection(
+            self.ovsdb_addr, timeout=timeout, ssl_context=ssl_context)
+        self.connection.notification_handler = self._on_notification
+        self._records = {}
+        self._column_types = {}
+        self._lock = threading.Lock()
+        self._synced = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @property
+    def synced(self):
+        """
+        `True` if the replica is receiving the updates, `False` while
+        reconnecting (the records are kept but may be outdated).
+        """
+        return self._synced.is_set()
+
+    def start(self):
+        """
+        Downloads the rows and starts receiving the updates in background.
+
+        :raise: * ovs_vsctl.exception.VSCtlRpcError -- When failed to
+                  download the rows.
+                * ValueError -- When the table or column is not found.
+        """
+        self._stopped.clear()
+        self._sync()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops receiving the updates. The records are kept.
+        """
+        self._stopped.set()
+        self._synced.clear()
+        self.connection.close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *_):
+        self.stop()
+
+    def wait_synced(self, timeout=None):
+        """
+        Waits until the replica is receiving the updates.
+
+        :param timeout: Timeout in seconds. `None` means no timeout.
+        :return: `True` if synced, `False` if timed out.
+        """
+        return self._synced.wait(timeout)
+
+    def list(self, table):
+        """
+        Returns the records of the given table as 'ovs-vsctl list' does.
+
+        :param table: (Abbreviated) table name.
+        :return: list of `Record` instances.
+        :raise: * ValueError -- When the table is not replicated.
+        """
+        records = self._table(table)
+        with self._lock:
+            return list(records.values())
+
+    def get(self, table, record):
+        """
+        Returns the record of the given UUID or name.
+
+        :param table: (Abbreviated) table name.
+        :param record: UUID or the value of 'name' column.
+        :return: `Record` instance.
+        :raise: * KeyError -- When the record is not found.
+                * ValueError -- When the table is not replicated.
+        """
+        records = self._table(table)
+        with self._lock:
+            found = records.get(record)
+            if found is not None:
+                return found
+            for found in records.values():
+                if getattr(found, 'name', None) == record:
+                    return found
+        raise KeyError(record)
+
+    def find(self, table, **conditions):
+        """
+        Returns the records whose columns are equal to the given values as
+        'ovs-vsctl find' does.
+
+        Example::
+
+            >>> replica.find('Interface', type='internal')
+            [Record(_uuid='ba7fee67-...', name='s1', type='internal', ...)]
+
+        :param table: (Abbreviated) table name.
+        :param conditions: Column names and values.
+        :return: list of `Record` instances.
+        :raise: * ValueError -- When the table is not replicated.
+        """
+        records = self._table(table)
+        with self._lock:
+            return [r for r in records.values()
+                    if all(getattr(r, c, None) == v
+                           for c, v in conditions.items())]
+
+    def _table(self, table):
+        if self.schema is None:
+            raise ValueError('Replica is not started')
+        name = self.schema.find_table(table).name
+        if name not in self._records:
+            raise ValueError('Table %s is not replicated' % name)
+        return self._records[name]
+
+    def _requests(self):
+        requests = {}
+        self._column_types = {}
+        for table in self.tables:
+            table_schema = self.schema.find_table(table)
+            columns = self.columns.get(table) or sorted(
+                c for c in table_schema.columns if not c.startswith('_'))
+            for column in columns:
+                if column not in table_schema.columns:
+                    raise ValueError(
+                        '%s does not contain a column whose name matches '
+                        '"%s"' % (table_schema.name, column))
+            requests[table_schema.name] = {'columns': list(columns)}
+            self._column_types[table_schema.name] = dict(
+                (c, table_schema.columns[c].type) for c in columns)
+        return requests
+
+    def _sync(self):
+        """
+        (Re)connects and downloads the rows of the replicated tables.
+        """
+        if self.schema is None:
+            self.schema = Schema.from_json(
+                self.connection.get_schema(self.database))
+        updates = self.connection.monitor(
+            self.database, _MONITOR_ID, self._requests())
+        self._apply(updates, initial=True)
+        self._synced.set()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            if not self._receive():
+                self._stopped.wait(self.retry_interval)
+
+    def _receive(self):
+        """
+        Receives the updates (after downloading the rows again if not
+        synced), and returns `False` if disconnected.
+        """
+        try:
+            if not self._synced.is_set():
+                self._sync()
+            self.connection.receive()
+        except exception.VSCtlRpcError as e:  # pylint: disable=invalid-name
+            self._synced.clear()
+            self.connection.close()
+            if not self._stopped.is_set():
+                LOG.warning('Replica of %s is disconnected: %s',
+                            self.ovsdb_addr, e)
+            return False
+        return True
+
+    def _on_notification(self, method, params):
+        if method == 'update' and params[0] == _MONITOR_ID:
+            self._apply(params[1])
+
+    def _record(self, table, row_uuid, row, old):
+        column_types = self._column_types[table]
+        kwargs = {}
+        if old is not None:
+            kwargs.update(old._items())  # pylint: disable=protected-access
+        kwargs['_uuid'] = row_uuid
+        for column, value in row.items():
+            if column in column_types:
+                kwargs[column] = _json_cell_parser(
+                    datum.to_json(value, column_types[column]))
+        return Record(**kwargs)
+
+    def _apply(self, table_updates, initial=False):
+        """
+        Applies <table-updates> and calls the callbacks for the changes.
+
+        If `initial` is `True`, `table_updates` contains all the rows, and
+        the records not contained are deleted.
+        """
+        changes = []
+        with self._lock:
+            if initial:
+                for table in self._column_types:
+                    self._records.setdefault(table, {})
+                deleted = dict((t, set(r)) for t, r in self._records.items())
+
+            for table, row_updates in table_updates.items():
+                records = self._records[table]
+                for row_uuid, update in row_updates.items():
+                    old = records.get(row_uuid)
+                    if initial:
+                        deleted[table].discard(row_uuid)
+                    new = update.get('new')
+                    if new is None:
+                        if records.pop(row_uuid, None) is not None:
+                            changes.append((table, old, None))
+                        continue
+                    record = self._record(table, row_uuid, new, old)
+                    records[row_uuid] = record
+                    if old is None or not _same_record(old, record):
+                        changes.append((table, old, record))
+
+            if initial:
+                for table, row_uuids in deleted.items():
+                    for row_uuid in row_uuids:
+                        changes.append(
+                            (table, self._records[table].pop(row_uuid), None))
+
+        for change in changes:
+            for callback in self.callbacks:
+                try:
+                    callback(*change)
+                except Exception:  # pylint: disable=broad-except
+                    LOG.exception('Error in callback %s', callback)
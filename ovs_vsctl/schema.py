@@ -0,0 +1,234 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+OVSDB schema representation (RFC 7047, section 3.2).
+"""
+
+import json
+
+UNLIMITED = float('inf')
+
+
+class BaseType():  # pylint: disable=too-few-public-methods
+    """
+    Atomic type of the keys or values of a column.
+
+    :param atom_type: `'integer'`, `'real'`, `'boolean'`, `'string'` or
+     `'uuid'`.
+    :param ref_table: Name of the table referred by this type, if any.
+    """
+
+    def __init__(self, atom_type, ref_table=None):
+        self.type = atom_type
+        self.ref_table = ref_table
+
+    @classmethod
+    def from_json(cls, doc):
+        """
+        Parses <base-type> of OVSDB schema.
+
+        :param doc: str or dict type value of <base-type>.
+        :return: `BaseType` instance.
+        """
+        if isinstance(doc, dict):
+            return cls(doc['type'], doc.get('refTable'))
+        return cls(doc)
+
+
+class ColumnType():  # pylint: disable=too-few-public-methods
+    """
+    Type of a column, i.e. the <type> of OVSDB schema.
+
+    :param key: `BaseType` of the keys (or of the atoms for non-map columns).
+    :param value: `BaseType` of the values if a map column, else `None`.
+    :param n_min: Minimum number of elements.
+    :param n_max: Maximum number of elements (`UNLIMITED` for 'unlimited').
+    """
+
+    def __init__(self, key, value=None, n_min=1, n_max=1):
+        self.key = key
+        self.value = value
+        self.n_min = n_min
+        self.n_max = n_max
+
+    @classmethod
+    def from_json(cls, doc):
+        """
+        Parses <type> of OVSDB schema.
+
+        :param doc: str or dict type value of <type>.
+        :return: `ColumnType` instance.
+        """
+        if not isinstance(doc, dict):
+            return cls(BaseType.from_json(doc))
+
+        value = None
+        if 'value' in doc:
+            value = BaseType.from_json(doc['value'])
+        n_max = doc.get('max', 1)
+        if n_max == 'unlimited':
+            n_max = UNLIMITED
+
+        return cls(BaseType.from_json(doc['key']), value,
+                   doc.get('min', 1), n_max)
+
+    @property
+    def is_map(self):
+        """
+        `True` if this column is a map.
+        """
+        return self.value is not None
+
+    @property
+    def is_set(self):
+        """
+        `True` if this column is a set of more than one element.
+        """
+        return self.value is None and self.n_max > 1
+
+    @property
+    def is_optional(self):
+        """
+        `True` if this column is an optional scalar (zero or one element).
+        """
+        return self.value is None and self.n_min == 0 and self.n_max == 1
+
+
+class ColumnSchema():  # pylint: disable=too-few-public-methods
+    """
+    Column of OVSDB table.
+
+    :param name: Column name.
+    :param column_type: `ColumnType` instance.
+    """
+
+    def __init__(self, name, column_type):
+        self.name = name
+        self.type = column_type
+
+
+class TableSchema():  # pylint: disable=too-few-public-methods
+    """
+    Table of OVSDB database.
+
+    :param name: Table name.
+    :param columns: dict of column name and `ColumnSchema` instance.
+    :param is_root: `True` if this table is a root set table.
+    :param indexes: list of column name lists which are unique indexes.
+    """
+
+    def __init__(self, name, columns, is_root=False, indexes=None):
+        self.name = name
+        self.columns = columns
+        self.is_root = is_root
+        self.indexes = indexes or []
+
+    @classmethod
+    def from_json(cls, name, doc):
+        """
+        Parses <table-schema> of OVSDB schema.
+
+        Additionally, appends the implicit '_uuid' and '_version' columns.
+
+        :param name: Table name.
+        :param doc: dict type value of <table-schema>.
+        :return: `TableSchema` instance.
+        """
+        columns = {
+            '_uuid': ColumnSchema('_uuid', ColumnType(BaseType('uuid'))),
+            '_version': ColumnSchema('_version', ColumnType(BaseType('uuid'))),
+        }
+        for column, column_doc in doc['columns'].items():
+            columns[column] = ColumnSchema(
+                column, ColumnType.from_json(column_doc['type']))
+
+        return cls(name, columns,
+                   is_root=doc.get('isRoot', False),
+                   indexes=doc.get('indexes'))
+
+    def column_names(self):
+        """
+        Returns column names in the order which 'ovs-vsctl list' prints,
+        i.e. '_uuid' first and then sorted other columns except '_version'.
+
+        :return: list of column names.
+        """
+        return ['_uuid'] + sorted(c for c in self.columns
+                                  if c not in ('_uuid', '_version'))
+
+
+class Schema():  # pylint: disable=too-few-public-methods
+    """
+    OVSDB database schema.
+
+    :param name: Database name.
+    :param tables: dict of table name and `TableSchema` instance.
+    :param version: Schema version.
+    """
+
+    def __init__(self, name, tables, version=None):
+        self.name = name
+        self.tables = tables
+        self.version = version
+
+    @classmethod
+    def from_json(cls, doc):
+        """
+        Parses <database-schema> of OVSDB schema, e.g. the result of
+        'get_schema' method of OVSDB JSON-RPC.
+
+        :param doc: dict type value of <database-schema>.
+        :return: `Schema` instance.
+        """
+        tables = {}
+        for table, table_doc in doc['tables'].items():
+            tables[table] = TableSchema.from_json(table, table_doc)
+
+        return cls(doc['name'], tables, doc.get('version'))
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads OVSDB schema file, e.g. 'vswitch.ovsschema'.
+
+        :param path: Path to the schema file.
+        :return: `Schema` instance.
+        """
+        with open(path, encoding='utf-8') as f:  # pylint: disable=invalid-name
+            return cls.from_json(json.load(f))
+
+    def find_table(self, name):
+        """
+        Finds the table with the given `name` in the same manner as
+        'ovs-vsctl', i.e. case insensitive and unique prefix match.
+
+        :param name: (Abbreviated) table name.
+        :return: `TableSchema` instance.
+        :raise: * ValueError -- When no or ambiguous table found.
+        """
+        lower = name.lower()
+        candidates = []
+        for table in self.tables.values():
+            if table.name.lower() == lower:
+                return table
+            if table.name.lower().startswith(lower):
+                candidates.append(table)
+
+        if len(candidates) == 1:
+            return candidates[0]
+        if not candidates:
+            raise ValueError('unknown table "%s"' % name)
+        raise ValueError('multiple table names match "%s"' % name)
@@ -0,0 +1,347 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Strategies of spawning 'ovs-vsctl' command for
+`ovs_vsctl.backend.SubprocessBackend`.
+
+A spawner provides `run(args)` returning `ovs_vsctl.utils.Process` after
+the command terminated, and `close()`. `ovs_vsctl.VSCtl` takes a spawner
+(or its name in `SPAWNERS`) as `spawner` parameter.
+
+- `PopenSpawner` ('popen', default) spawns with 'subprocess.Popen'.
+- `PosixSpawnSpawner` ('posix_spawn') spawns with 'os.posix_spawnp', which
+  does not copy the page tables of the calling process, so its cost does
+  not grow with the memory size of the calling process.
+- `ForkServerSpawner` ('forkserver') asks a small helper process to spawn
+  the commands, so the calling process never forks. The spawner given by
+  its name is shared in the process, i.e. a single helper process.
+"""
+
+import functools
+import itertools
+import json
+import os
+import selectors
+import subprocess
+import sys
+import threading
+import time
+
+from ovs_vsctl import utils
+
+READ_SIZE = 65536
+
+# Serializes the creation of the shared `ForkServerSpawner`.
+_SHARED_LOCK = threading.Lock()
+
+# Script of the helper process of `ForkServerSpawner`.
+_HELPER = ('import sys; from ovs_vsctl.spawn import _serve; '
+           '_serve(sys.stdin.buffer, sys.stdout.buffer)')
+
+
+class PopenSpawner():
+    """
+    Spawns the commands with 'subprocess.Popen'.
+    """
+
+    @staticmethod
+    def run(args):
+        """
+        Executes the given command arguments.
+
+        :param args: Command arguments to execute.
+        :return: Instance of `ovs_vsctl.utils.Process`.
+        """
+        return utils.run(args)
+
+    def close(self):
+        """
+        Does nothing because no resource is held.
+        """
+
+
+def _exit_code(status):
+    # The same as 'subprocess.Popen.returncode', i.e. negative signal number
+    # if killed by a signal.
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+def _read_all(fds):
+    """
+    Reads the given pipes until all of them are closed.
+    """
+    chunks = dict((fd, []) for fd in fds)
+    with selectors.DefaultSelector() as selector:
+        for fd in fds:  # pylint: disable=invalid-name
+            selector.register(fd, selectors.EVENT_READ)
+        while selector.get_map():
+            for key, _ in selector.select():
+                data = os.read(key.fd, READ_SIZE)
+                if data:
+                    chunks[key.fd].append(data)
+                else:
+                    selector.unregister(key.fd)
+    return [b''.join(chunks[fd]).decode('utf-8') for fd in fds]
+
+
+class PosixSpawnSpawner():
+    """
+    Spawns the commands with 'os.posix_spawnp', i.e. vfork-and-exec on
+    Linux, without copying the page tables of the calling process.
+
+    Unlike `close_fds=True` of 'subprocess.Popen', the file descriptors
+    are not closed explicitly, because closing all of them costs for each
+    command. The descriptors opened by Python are non-inheritable (i.e.
+    closed on exec) by default, so only the ones made inheritable (e.g.
+    with 'os.set_inheritable') or opened by the extension modules without
+    close-on-exec flag are inherited by 'ovs-vsctl'.
+
+    :raise: * ValueError -- When 'os.posix_spawnp' is not available on this
+              platform.
+    """
+
+    def __init__(self):
+        if not hasattr(os, 'posix_spawnp'):
+            raise ValueError('posix_spawn is not available')
+
+    @staticmethod
+    def run(args):
+        """
+        Executes the given command arguments.
+
+        :param args: Command arguments to execute.
+        :return: Instance of `ovs_vsctl.utils.Process`.
+        :raise: * OSError -- When failed to execute the command, e.g. not
+                  found.
+        """
+        stdout_r, stdout_w = os.pipe()
+        stderr_r, stderr_w = os.pipe()
+        try:
+            # The pipes are not inherited except the duplicated ones.
+            start = time.perf_counter()
+            pid = os.posix_spawnp(args[0], args, os.environ, file_actions=[
+                (os.POSIX_SPAWN_DUP2, stdout_w, 1),
+                (os.POSIX_SPAWN_DUP2, stderr_w, 2),
+            ])
+            spawn_time = time.perf_counter() - start
+        except BaseException:
+            for fd in (stdout_r, stderr_r):  # pylint: disable=invalid-name
+                os.close(fd)
+            raise
+        finally:
+            os.close(stdout_w)
+            os.close(stderr_w)
+
+        try:
+            stdout, stderr = _read_all([stdout_r, stderr_r])
+        finally:
+            os.close(stdout_r)
+            os.close(stderr_r)
+            _, status = os.waitpid(pid, 0)
+
+        return utils.Process(args, _exit_code(status), stdout, stderr,
+                             spawn_time)
+
+    def close(self):
+        """
+        Does nothing because no resource is held.
+        """
+
+
+def _default_spawner():
+    try:
+        return PosixSpawnSpawner()
+    except ValueError:
+        return PopenSpawner()
+
+
+class ForkServerSpawner():
+    """
+    Spawns the commands in a helper process, so that the calling process
+    (e.g. a large daemon) never forks.
+
+    The helper is a new Python interpreter started at the construction,
+    which receives the command arguments over a pipe, spawns the commands
+    with `PosixSpawnSpawner` (or `PopenSpawner`) concurrently and sends
+    back the results. If the helper exits unexpectedly, it is restarted at
+    the next command.
+
+    The helper itself is spawned by the calling process, so this should be
+    created (and shared by `VSCtl` instances) early while the process is
+    small. `get_spawner('forkserver')` returns the instance shared in the
+    process. The helper exits when closed or when the calling process
+    exits.
+    """
+
+    def __init__(self):
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        # ID --> [threading.Event, response]
+        self._pending = {}
+        self._popen = None
+        self._start()
+
+    def _start(self):
+        # Makes this package importable by the helper in any directory.
+        env = dict(os.environ)
+        package_dir = os.path.dirname(os.path.dirname(
+            os.path.abspath(__file__)))
+        env['PYTHONPATH'] = os.pathsep.join(
+            p for p in (package_dir, env.get('PYTHONPATH')) if p)
+        popen = subprocess.Popen(
+            [sys.executable, '-c', _HELPER],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=env)
+        thread = threading.Thread(target=self._receive, args=(popen,))
+        thread.daemon = True
+        thread.start()
+        self._popen = popen
+
+    def _receive(self, popen):
+        for line in popen.stdout:
+            response = json.loads(line.decode('utf-8'))
+            with self._lock:
+                waiter = self._pending.pop(response['id'], None)
+            if waiter is not None:
+                waiter[1] = response
+                waiter[0].set()
+        popen.stdout.close()
+
+        # The helper exited, fails the commands waiting for it.
+        with self._lock:
+            if self._popen is popen:
+                self._popen = None
+            pending, self._pending = self._pending, {}
+        for waiter in pending.values():
+            waiter[0].set()
+
+    def run(self, args):
+        """
+        Executes the given command arguments in the helper process.
+
+        :param args: Command arguments to execute.
+        :return: Instance of `ovs_vsctl.utils.Process`.
+        :raise: * OSError -- When failed to execute the command, e.g. not
+                  found, or the helper exited.
+        """
+        waiter = [threading.Event(), None]
+        with self._lock:
+            if self._popen is None:
+                self._start()
+            request_id = next(self._ids)
+            self._pending[request_id] = waiter
+            data = json.dumps({'id': request_id, 'args': list(args)})
+            try:
+                self._popen.stdin.write(data.encode('utf-8') + b'\n')
+                self._popen.stdin.flush()
+            except OSError:
+                del self._pending[request_id]
+                raise
+
+        waiter[0].wait()
+        response = waiter[1] or {}
+        if not response:
+            raise OSError('Fork server exited')
+        if 'error' in response:
+            raise OSError(response['errno'], response['error'],
+                          response['filename'])
+        return utils.Process(args, response['returncode'],
+                             response['stdout'], response['stderr'],
+                             response['spawn_time'])
+
+    def close(self):
+        """
+        Terminates the helper process.
+        """
+        with self._lock:
+            popen, self._popen = self._popen, None
+        if popen is not None:
+            popen.stdin.close()
+            popen.wait()
+
+
+# Mapping of the names and the classes of the spawners.
+SPAWNERS = {
+    'popen': PopenSpawner,
+    'posix_spawn': PosixSpawnSpawner,
+    'forkserver': ForkServerSpawner,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_forkserver():
+    return ForkServerSpawner()
+
+
+def get_spawner(spawner):
+    """
+    Returns the spawner of the given name, or `spawner` itself if not str.
+
+    For 'forkserver', returns the `ForkServerSpawner` shared in the
+    process (created at the first call), so that the helper process is not
+    started for each caller. The shared one is restarted at the next
+    command even if closed.
+
+    :param spawner: Name in `SPAWNERS` or the spawner.
+    :return: Spawner.
+    :raise: * ValueError -- When the given name is not supported.
+    """
+    if not isinstance(spawner, str):
+        return spawner
+    if spawner not in SPAWNERS:
+        raise ValueError('Unsupported spawner: %s' % spawner)
+    if spawner == 'forkserver':
+        with _SHARED_LOCK:
+            return _shared_forkserver()
+    return SPAWNERS[spawner]()
+
+
+def _handle(spawner, request, output, lock):
+    try:
+        process = spawner.run(request['args'])
+        response = {
+            'id': request['id'],
+            'returncode': process.returncode,
+            'stdout': process.stdout.getvalue(),
+            'stderr': process.stderr.getvalue(),
+            'spawn_time': process.spawn_time,
+        }
+    except OSError as e:  # pylint: disable=invalid-name
+        response = {'id': request['id'], 'errno': e.errno,
+                    'error': e.strerror, 'filename': e.filename}
+    data = json.dumps(response).encode('utf-8') + b'\n'
+    with lock:
+        output.write(data)
+        output.flush()
+
+
+def _serve(requests, output):
+    """
+    Main loop of the helper process of `ForkServerSpawner`, which executes
+    the requested commands until `requests` is closed.
+    """
+    spawner = _default_spawner()
+    lock = threading.Lock()
+    threads = []
+    for line in requests:
+        thread = threading.Thread(
+            target=_handle,
+            args=(spawner, json.loads(line.decode('utf-8')), output, lock))
+        thread.start()
+        threads = [t for t in threads if t.is_alive()] + [thread]
+    for thread in threads:
+        thread.join()
@@ -17,22 +17,134 @@
 Utilities.
 """
 
+from io import StringIO
 from subprocess import PIPE
 from subprocess import Popen
+import threading
+import time
 from uuid import UUID
 
+# Commands of 'ovs-vsctl' which print their outputs as tables.
+TABLE_COMMANDS = ('list', 'find')
 
-def run(args):
+
+class Process():  # pylint: disable=too-few-public-methods
+    """
+    Result of the executed command which has the same interface as the
+    instance of 'subprocess.Popen' after the process terminated.
+
+    :param args: Command arguments executed.
+    :param returncode: Exit code of the command.
+    :param stdout: str type outputs of the command.
+    :param stderr: str type error outputs of the command.
+    :param spawn_time: Seconds spent in spawning the command, or `None` if
+     not spawned.
+    """
+
+    def __init__(self, args, returncode, stdout='', stderr='',
+                 spawn_time=None):
+        self.args = args
+        self.returncode = returncode
+        self.stdout = StringIO(stdout)
+        self.stderr = StringIO(stderr)
+        self.spawn_time = spawn_time
+
+    def wait(self):
+        """
+        Returns the exit code of the command like 'subprocess.Popen.wait'.
+
+        :return: Exit code of the command.
+        """
+        return self.returncode
+
+    def kill(self):
+        """
+        Does nothing because the command already terminated.
+        """
+
+
+class StreamingProcess():
+    """
+    Running command whose outputs are read as a stream.
+
+    `stdout` is the pipe connected to the command, and can be iterated
+    line by line. The error outputs are drained in background to avoid
+    blocking the command, and are available as `stderr` after `wait()`.
+
+    :param args: Command arguments to execute.
+    """
+
+    def __init__(self, args):
+        self.args = args
+        self._popen = Popen(args, stdout=PIPE, stderr=PIPE,
+                            universal_newlines=True)
+        self.stdout = self._popen.stdout
+        self.stderr = None
+        self._stderr = []
+        self._thread = threading.Thread(target=self._drain_stderr)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _drain_stderr(self):
+        self._stderr.append(self._popen.stderr.read())
+
+    @property
+    def returncode(self):
+        """
+        Exit code of the command, or `None` if not terminated yet.
+        """
+        return self._popen.returncode
+
+    def wait(self):
+        """
+        Waits for the command to terminate.
+
+        :return: Exit code of the command.
+        """
+        self._popen.wait()
+        self._thread.join()
+        self.stdout.close()
+        self._popen.stderr.close()
+        self.stderr = StringIO(''.join(self._stderr))
+        return self._popen.returncode
+
+    def kill(self):
+        """
+        Kills the command and waits for it to terminate.
+        """
+        if self._popen.poll() is None:
+            self._popen.kill()
+        # Closes the pipe first so that the descendants, if any, stop
+        # writing and release the pipe of the error outputs.
+        self.stdout.close()
+        self.wait()
+
+
+def run(args, stream=False):
     """
     Wrapper of 'subprocess.run'.
 
+    Both of the outputs and the error outputs are read while the command
+    is running, so the command never blocks on writing to the pipes even
+    if its outputs are larger than the pipe buffer.
+
     :param args: Command arguments to execute.
-    :return: instance of 'subprocess.Popen'.
+    :param stream: If `True`, returns without waiting for the command to
+     terminate, and the outputs are read as a stream.
+    :return: instance of `Process` which has the same interface as
+     'subprocess.Popen' after the process terminated, or instance of
+     `StreamingProcess` if `stream` is `True`. `Process` has the seconds
+     spent in spawning the command as `spawn_time`.
     """
+    if stream:
+        return StreamingProcess(args)
+
+    start = time.perf_counter()
     popen = Popen(args, stdout=PIPE, stderr=PIPE, universal_newlines=True)
-    popen.wait()
+    spawn_time = time.perf_counter() - start
+    stdout, stderr = popen.communicate()
 
-    return popen
+    return Process(args, popen.returncode, stdout, stderr, spawn_time)
 
 
 def is_valid_uuid(uuid):
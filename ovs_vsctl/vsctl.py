@@ -17,21 +17,253 @@
 APIs for execute 'ovs-vsctl' command.
 """
 
-# pylint: disable=no-name-in-module,import-error
-from distutils.spawn import find_executable
-# pylint: enable=no-name-in-module,import-error
+from collections.abc import Iterator
+import functools
+import json
+import re
 import shlex
+import shutil
+import socket
+import time
 from os import path
 
-import netaddr
-
 from ovs_vsctl import exception
 from ovs_vsctl import utils
+from ovs_vsctl.backend import SubprocessBackend
+from ovs_vsctl.cache import command_tables
+from ovs_vsctl.metrics import Invocation
+from ovs_vsctl.parser import record_columns
+from ovs_vsctl.spawn import get_spawner
 
 
-INSTALLED_OVS_VSCTL = find_executable("ovs-vsctl")
 DEFAULT_OVS_VSCTL = '%s/bin/ovs-vsctl' % path.dirname(__file__)
 
+# Escape sequences of '--oneline' option of 'ovs-vsctl'.
+_ONELINE_ESCAPE = re.compile(r'\\(.)')
+_ONELINE_UNESCAPES = {'n': '\n', '\\': '\\'}
+
+
+@functools.lru_cache(maxsize=None)
+def find_ovs_vsctl():
+    """
+    Returns the path to 'ovs-vsctl' executable found in PATH, or the
+    built-in binary if not found.
+
+    The result is cached, so PATH is searched only once in the process.
+
+    :return: Path to 'ovs-vsctl'.
+    """
+    return shutil.which('ovs-vsctl') or DEFAULT_OVS_VSCTL
+
+
+def __getattr__(name):
+    # Searches PATH when referred instead of at import time.
+    if name == 'INSTALLED_OVS_VSCTL':
+        return shutil.which('ovs-vsctl')
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
+
+
+def _is_valid_ip(addr):
+    for family in (socket.AF_INET, socket.AF_INET6):
+        try:
+            socket.inet_pton(family, addr)
+            return True
+        except (OSError, ValueError):
+            pass
+    return False
+
+
+def _apply_parser(parser, buf, **kwargs):
+    try:
+        return parser(buf, **kwargs)
+    except exception.VSCtlCmdExecError:
+        # Raised while reading the outputs in streaming mode.
+        raise
+    except Exception as e:  # pylint: disable=invalid-name
+        raise exception.VSCtlCmdParseError(e)
+
+
+def _iter_parsed(records):
+    """
+    Yields the outputs of the lazy parser (e.g. `iter_list_cmd_parser`),
+    raising `VSCtlCmdParseError` when the parser fails while iterating.
+    """
+    try:
+        yield from records
+    except exception.VSCtlCmdExecError:
+        raise
+    except Exception as e:  # pylint: disable=invalid-name
+        raise exception.VSCtlCmdParseError(e)
+
+
+def _apply_stream_parser(parser, lines):
+    """
+    Applies `parser` to the iterator of the lines in streaming mode.
+    """
+    output = _apply_parser(parser, lines)
+    if isinstance(output, Iterator):
+        # Parses the lines while being iterated.
+        return _iter_parsed(output)
+    return output
+
+
+def _iter_stdout(process):
+    """
+    Yields the outputs of the given streaming `process` line by line, and
+    raises `VSCtlCmdExecError` at the end if the command failed.
+    """
+    try:
+        yield from process.stdout
+    except BaseException:
+        process.kill()
+        raise
+    if process.wait() != 0:
+        raise exception.VSCtlCmdExecError(process.stderr.read())
+
+
+def _parser_table_format(parser):
+    """
+    Returns the table format which the given `parser` takes, i.e. its
+    `table_format` attribute if specified, otherwise `'list'`.
+    """
+    return getattr(parser, 'table_format', 'list')
+
+
+def _parser_data_format(parser):
+    """
+    Returns the data format which the given `parser` takes, i.e. its
+    `data_format` attribute if specified, otherwise `'json'`.
+    """
+    return getattr(parser, 'data_format', 'json')
+
+
+def _parser_name(parser):
+    if parser is None:
+        return None
+    return getattr(parser, '__name__', type(parser).__name__)
+
+
+def _columns_options(command_args, columns, parser):
+    """
+    Returns '--columns' option for the given command arguments, i.e. for
+    `columns` if given, otherwise for `columns` attribute of `parser`.
+    """
+    explicit = columns is not None
+    if columns is None:
+        columns = getattr(parser, 'columns', None)
+        if columns is None:
+            return []
+    if isinstance(columns, type):
+        columns = record_columns(columns)
+    if _command_name(command_args) not in utils.TABLE_COMMANDS:
+        if explicit:
+            raise ValueError('Columns are available only with %s commands'
+                             % ' and '.join(utils.TABLE_COMMANDS))
+        return []
+    return ['--columns=%s' % ','.join(columns)]
+
+
+def _command_name(args):
+    for arg in args:
+        if not arg.startswith('-'):
+            return arg
+    return None
+
+
+def _unescape_oneline(line):
+    """
+    Restores the new-lines and backslashes escaped by '--oneline' option.
+    """
+    output = _ONELINE_ESCAPE.sub(
+        lambda m: _ONELINE_UNESCAPES.get(m.group(1), m.group(0)), line)
+    if output:
+        # The last new-line is omitted by '--oneline' option.
+        output += '\n'
+    return output
+
+
+def _format_json_table(line, table_format, data_format):
+    """
+    Formats the table printed with '--format=json' in the given
+    `table_format` as 'ovs-vsctl' does.
+    """
+    try:
+        table = json.loads(line)
+    except ValueError:
+        table = json.loads(_unescape_oneline(line))
+    if table_format == 'json':
+        return line + '\n'
+
+    records = []
+    for row in table['data']:
+        lines = []
+        for heading, cell in zip(table['headings'], row):
+            if data_format == 'json':
+                cell = json.dumps(cell, separators=(',', ':'))
+            lines.append('%-20s: %s\n' % (heading, cell))
+        records.append(''.join(lines))
+    return '\n'.join(records)
+
+
+def _output_size(stream):
+    """
+    Returns the length of the outputs in `stream` without consuming them,
+    or 0 if unknown, e.g. the pipe returned by a custom backend.
+    """
+    getvalue = getattr(stream, 'getvalue', None)
+    if getvalue is None:
+        return 0
+    return len(getvalue())
+
+
+def _check_process(process, invocation=None, wall=None):
+    """
+    Records the result of the executed `process` to `invocation` (if not
+    `None`), and raises `VSCtlCmdExecError` if the command failed.
+    """
+    if invocation is not None:
+        invocation.wall = wall
+        invocation.spawn = getattr(process, 'spawn_time', None)
+        invocation.returncode = process.returncode
+        invocation.stdout_size = _output_size(process.stdout)
+        invocation.stderr_size = _output_size(process.stderr)
+    if process.returncode != 0:
+        raise exception.VSCtlCmdExecError(process.stderr.read())
+    return process
+
+
+class PreparedCommand():  # pylint: disable=too-few-public-methods
+    """
+    Invocation of 'ovs-vsctl' command built by `VSCtl.prepare()` or
+    `VSCtl.prepare_batch()`, which is executed by the caller instead of
+    `VSCtl` (e.g. on asyncio event loop by `ovs_vsctl.aio.AsyncVSCtl`).
+
+    Example::
+
+        >>> prepared = vsctl.prepare('list port', parser=list_cmd_parser)
+        >>> try:
+        ...     output = vsctl.get_cached(prepared)
+        ... except KeyError:
+        ...     try:
+        ...         process = vsctl.backend.execute(prepared.args)
+        ...     finally:
+        ...         vsctl.invalidate(prepared)
+        ...     output = vsctl.finish(prepared, process)
+
+    :param args: Arguments of 'ovs-vsctl' command to execute.
+    :param parser: Parser for the outputs, or `None`.
+    :param invocation: `ovs_vsctl.metrics.Invocation` to record the
+     execution to, or `None` if not measured.
+    :param parse: Function parsing the whole outputs instead of `parser`
+     (e.g. the outputs of multiple commands), or `None`.
+    """
+
+    def __init__(self, args, parser=None, invocation=None, parse=None):
+        self.args = args
+        self.parser = parser
+        self.invocation = invocation
+        self.parse = parse
+
 
 class VSCtl():
     """
@@ -40,20 +272,43 @@ class VSCtl():
     :param protocol: `'tcp'`, `'ssl'`, and `'unix'` are available.
     :param addr: IP address of switch to connect.
     :param port: (TCP or SSL) port number to connect.
+    :param backend: Backend class (or callable) which executes commands.
+     Called with this instance. Defaults to
+     `ovs_vsctl.backend.SubprocessBackend` which spawns 'ovs-vsctl'.
+     See `ovs_vsctl.backend.JsonRpcBackend` for the backend keeping the
+     connection to OVSDB server open.
+    :param cache: Instance of `ovs_vsctl.cache.ResultCache` to cache the
+     outputs of the read-only commands, or `None` to disable caching.
+     The same cache can be shared by multiple instances.
+    :param metrics: Function called with `ovs_vsctl.metrics.Invocation`
+     after each invocation of 'ovs-vsctl' by `run()` and `run_batch()`,
+     e.g. `ovs_vsctl.metrics.MetricsRegistry` instance. If `None`, nothing
+     is measured. The streaming mode and the cached outputs are not
+     measured.
+    :param ovs_vsctl_path: Path to 'ovs-vsctl' executable. Defaults to the
+     one found in PATH (searched at the first use), or the built-in binary
+     if not found.
+    :param spawner: Strategy of spawning 'ovs-vsctl' with
+     `ovs_vsctl.backend.SubprocessBackend`, i.e. `'popen'` (default),
+     `'posix_spawn'`, `'forkserver'` or an instance of the spawner in
+     `ovs_vsctl.spawn` which can be shared by multiple instances. The
+     instances given `'forkserver'` share a single helper process (see
+     `ovs_vsctl.spawn.get_spawner()`).
     :raise: * ValueError -- When the given parameter is invalid.
     """
     SUPPORTED_PROTOCOLS = ['tcp', 'ssl', 'unix']
     SUPPORTED_FORMATS = ['json']
 
-    def __init__(self, protocol='tcp', addr='127.0.0.1', port=6640):
+    def __init__(self, protocol='tcp', addr='127.0.0.1', port=6640,
+                 backend=None, cache=None, metrics=None,
+                 ovs_vsctl_path=None, spawner=None):
         # Validates the given protocol.
         if protocol not in self.SUPPORTED_PROTOCOLS:
             raise ValueError('Unsupported protocol: %s' % protocol)
         self.protocol = protocol
 
         # Validates the given IP address.
-        if (self.protocol != "unix" and not netaddr.valid_ipv4(addr)
-                and not netaddr.valid_ipv6(addr)):
+        if self.protocol != "unix" and not _is_valid_ip(addr):
             raise ValueError('Invalid IP address: %s' % addr)
         self.addr = addr
 
@@ -63,8 +318,29 @@ class VSCtl():
         except ValueError:
             raise ValueError('Invalid (TCP or SSL) port number: %s' % port)
 
-        # If "ovs-vsctl" executable not found, uses the built-in binary.
-        self.ovs_vsctl_path = INSTALLED_OVS_VSCTL or DEFAULT_OVS_VSCTL
+        self._ovs_vsctl_path = ovs_vsctl_path
+
+        if spawner is None:
+            spawner = 'popen'
+        self.spawner = get_spawner(spawner)
+
+        self.backend = (backend or SubprocessBackend)(self)
+        self.cache = cache
+        self.metrics = metrics
+
+    @property
+    def ovs_vsctl_path(self):
+        """
+        Path to 'ovs-vsctl' executable.
+
+        If not given to the constructor (or assigned), returns the result of
+        `find_ovs_vsctl()`.
+        """
+        return self._ovs_vsctl_path or find_ovs_vsctl()
+
+    @ovs_vsctl_path.setter
+    def ovs_vsctl_path(self, value):
+        self._ovs_vsctl_path = value
 
     @property
     def ovsdb_addr(self):
@@ -90,7 +366,7 @@ class VSCtl():
         return '%s:%s:%d' % (self.protocol, self.addr, self.port)
 
     def run(self, command, table_format='list', data_format='string',
-            parser=None):
+            parser=None, stream=False, columns=None):
         """
         Executes ovs-vsctl command.
 
@@ -113,40 +389,329 @@ class VSCtl():
          '--data' option of 'ovs-vsctl' command.
         :param parser: Parser class for the outputs. If this parameter is
          specified `table_format` and `data_format` is overridden with
-         `table_format='list'` and `data_format='json'`.
+         `table_format='list'` (or `table_format` attribute of the parser,
+         e.g. `'json'` for `json_list_cmd_parser`) and `data_format='json'`
+         (or `data_format` attribute of the parser, e.g. `'string'` for
+         `string_list_cmd_parser`).
+        :param stream: If `True`, the outputs are not loaded at once, and
+         `parser` receives an iterator of the lines of the outputs instead
+         of str, e.g. `line_parser` or `iter_list_cmd_parser`. The failure
+         of the command is raised when the iterator is exhausted, and the
+         failure of the parser returning an iterator is raised as
+         `VSCtlCmdParseError` while iterating.
+        :param columns: Column names to print by 'list' or 'find' command,
+         i.e. '--columns' option, or a subclass of
+         `ovs_vsctl.parser.CompactRecord` declaring the columns as
+         `__slots__`. Defaults to `columns` attribute of `parser` (e.g. the
+         parser returned by `record_class_parser()`) if any, otherwise all
+         the columns are printed.
         :return: Output of 'ovs-vsctl' command. If `parser` is not specified,
-         returns an instance of 'subprocess.Popen'. If `parser` is specified,
-         the given `parser` is applied to parse the outputs.
+         returns an instance of 'subprocess.Popen' (or iterator of lines if
+         `stream` is `True`). If `parser` is specified, the given `parser`
+         is applied to parse the outputs.
         :raise: * ovs_vsctl.exception.VSCtlCmdExecError -- When the given
                   command fails.
                 * ovs_vsctl.exception.VSCtlCmdParseError -- When the given
                   parser fails to parse the outputs.
+                * ValueError -- When `columns` is given to the command other
+                  than 'list' and 'find'.
+        """
+        prepared = self.prepare(command, table_format, data_format,
+                                parser, columns)
+
+        if stream:
+            self.invalidate(prepared)
+            lines = _iter_stdout(
+                self.backend.execute(prepared.args, stream=True))
+            if parser:
+                return _apply_stream_parser(parser, lines)
+            return lines
+
+        if self.cache is not None:
+            try:
+                return self.get_cached(prepared)
+            except KeyError:
+                pass
+
+        return self._execute(prepared)
+
+    def prepare(self, command, table_format='list', data_format='string',
+                parser=None, columns=None):
+        """
+        Builds the invocation of ovs-vsctl command for `run()` without
+        executing it. See `PreparedCommand` for how to execute it.
+
+        The parameters are the same as `run()`.
+
+        :return: `PreparedCommand` instance.
+        :raise: * ValueError -- When `columns` is given to the command other
+                  than 'list' and 'find'.
+        """
+        if parser:
+            table_format = _parser_table_format(parser)
+            data_format = _parser_data_format(parser)
+        args = self._build_args(table_format, data_format)
+        args.extend(self._build_command_args(command, parser, columns))
+
+        invocation = None
+        if self.metrics is not None:
+            invocation = Invocation(args, _command_name(args[1:]),
+                                    _parser_name(parser))
+        return PreparedCommand(args, parser, invocation)
+
+    def get_cached(self, prepared):
+        """
+        Returns the cached outputs of the prepared command.
+
+        :param prepared: `PreparedCommand` returned by `prepare()`.
+        :return: Output of the command, the same as `run()`.
+        :raise: * KeyError -- When not cached, or `cache` is not given.
+        """
+        if self.cache is None or not command_tables(prepared.args)[0]:
+            # Not looked up (nor counted as a miss) because never cached.
+            raise KeyError(tuple(prepared.args))
+        output = self.cache.get(self.ovsdb_addr, prepared.args,
+                                prepared.parser)
+        if prepared.parser:
+            return output
+        # Returns a new process every time because the outputs are consumed
+        # by reading.
+        return utils.Process(prepared.args, 0, *output)
+
+    def invalidate(self, prepared):
+        """
+        Invalidates the cached outputs which the prepared command may
+        change.
+
+        Must be called after executing the command even if failed, so that
+        the outputs read while executing are not left in the cache.
+
+        :param prepared: `PreparedCommand` instance.
+        """
+        if self.cache is not None:
+            self.cache.notify(self.ovsdb_addr, prepared.args)
+
+    def finish(self, prepared, process, wall=None):
+        """
+        Completes the prepared command executed by the caller, i.e. records
+        the result to its invocation, checks the exit status and parses
+        (and caches) the outputs.
+
+        :param prepared: `PreparedCommand` instance.
+        :param process: Result of the command, e.g. the returned value of
+         `execute()` of the backend.
+        :param wall: Time in seconds taken to execute the command, or
+         `None` if not measured.
+        :return: Output of the command, the same as `run()` or
+         `run_batch()`.
+        :raise: * ovs_vsctl.exception.VSCtlCmdExecError -- When the command
+                  failed.
+                * ovs_vsctl.exception.VSCtlCmdParseError -- When the parser
+                  fails to parse the outputs.
+        """
+        invocation = prepared.invocation
+        _check_process(process, invocation, wall)
+
+        if prepared.parse is not None:
+            return self._parse(invocation, prepared.parse,
+                               process.stdout.read())
+
+        if self.cache is not None:
+            return self._put_cached(prepared, process)
+
+        # If parser is specified, applies parser and returns it.
+        if prepared.parser:
+            return self._parse(invocation, _apply_parser,
+                               prepared.parser, process.stdout.read())
+
+        # Returns outputs in str type.
+        return process
+
+    def _measured(self, invocation, func, *args):
+        """
+        Calls `func` with `args` and reports `invocation` to the metrics.
+        """
+        try:
+            return func(*args)
+        except Exception as e:  # pylint: disable=invalid-name
+            invocation.error = e
+            raise
+        finally:
+            self.metrics(invocation)
+
+    @staticmethod
+    def _parse(invocation, func, *args):
+        """
+        Calls the parsing `func` with `args`, measuring the time if
+        `invocation` is not `None`.
+        """
+        if invocation is None:
+            return func(*args)
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            invocation.parse = time.perf_counter() - start
+
+    def _put_cached(self, prepared, process):
+        args, parser = prepared.args, prepared.parser
+        if parser:
+            output = self._parse(prepared.invocation, _apply_parser,
+                                 parser, process.stdout.read())
+            self.cache.put(self.ovsdb_addr, args, parser, output)
+            return output
+        output = (process.stdout.read(), process.stderr.read())
+        self.cache.put(self.ovsdb_addr, args, parser, output)
+        return utils.Process(args, 0, *output)
+
+    def run_batch(self, commands, table_format='list', data_format='string'):
+        """
+        Executes multiple ovs-vsctl commands in a single invocation of
+        'ovs-vsctl' (i.e. in a single transaction) and parses the outputs of
+        each command with its own parser.
+
+        Example::
+
+            >>> from ovs_vsctl import VSCtl
+            >>> from ovs_vsctl import line_parser
+            >>> from ovs_vsctl import list_cmd_parser
+            >>> vsctl = VSCtl('tcp', '127.0.0.1', 6640)
+            >>> vsctl.run_batch([('list-br', line_parser),
+            ...                  ('list port s1', list_cmd_parser)])
+            [['s1'], [Record(_uuid='91c8423c-...', ...)]]
+
+        :param commands: list of tuples of command and parser. The format of
+         command is the same as `run()`. If parser is `None`, returns the
+         output of the command in str type. `columns` attribute of parser
+         is respected as `run()` does.
+        :param table_format: Table format. Only `'list'` and `'json'` are
+         available. Meaning is the same as `run()`.
+        :param data_format: Cell format in table. Meaning is the same as
+         `run()`.
+        :return: list of the parsed outputs corresponding to `commands`.
+        :raise: * ovs_vsctl.exception.VSCtlCmdExecError -- When the given
+                  commands fail.
+                * ovs_vsctl.exception.VSCtlCmdParseError -- When the given
+                  parser fails to parse the outputs.
+                * ValueError -- When the given table format is not
+                  supported, or the parsers of the tables take different
+                  data formats.
+        """
+        return self._execute(
+            self.prepare_batch(commands, table_format, data_format))
+
+    def prepare_batch(self, commands, table_format='list',
+                      data_format='string'):
         """
-        # Constructs command.
+        Builds the invocation of ovs-vsctl commands for `run_batch()`
+        without executing it. See `PreparedCommand` for how to execute it.
+
+        The parameters are the same as `run_batch()`.
+
+        :return: `PreparedCommand` instance.
+        :raise: * ValueError -- When the given table format is not
+                  supported, or the parsers of the tables take different
+                  data formats.
+        """
+        args, splitted, formats = self._build_batch_args(
+            commands, table_format, data_format)
+
+        invocation = None
+        if self.metrics is not None:
+            invocation = Invocation(
+                args, ','.join(_command_name(c) or '' for c in splitted))
+        parse = functools.partial(
+            self._parse_batch, commands, splitted, *formats)
+        return PreparedCommand(args, invocation=invocation, parse=parse)
+
+    def _build_args(self, table_format, data_format, options=()):
         args = [
             self.ovs_vsctl_path,
             '--db=%s' % self.ovsdb_addr,
         ]
-        if parser:
-            table_format = 'list'
-            data_format = 'json'
+        args.extend(options)
         args.extend([
             '--format=%s' % table_format,
             '--data=%s' % data_format,
         ])
-        args.extend(shlex.split(command))
+        return args
 
-        # Executes command.
-        process = utils.run(args)
-        if process.returncode != 0:
-            raise exception.VSCtlCmdExecError(process.stderr.read())
+    @staticmethod
+    def _build_command_args(command, parser, columns=None):
+        command_args = shlex.split(command)
+        return (_columns_options(command_args, columns, parser)
+                + command_args)
 
-        # If parser is specified, applies parser and returns it.
-        if parser:
-            try:
-                return parser(process.stdout.read())
-            except Exception as e:  # pylint: disable=invalid-name
-                raise exception.VSCtlCmdParseError(e)
+    def _build_batch_args(self, commands, table_format, data_format):
+        if table_format not in ('list', 'json'):
+            raise ValueError('Unsupported table format: %s' % table_format)
+        splitted = [shlex.split(command) for command, _ in commands]
+        if any(parser for _, parser in commands):
+            table_format = 'list'
+            # '--data' applies to all the tables printed in the invocation.
+            data_formats = set(
+                _parser_data_format(parser)
+                for command_args, (_, parser) in zip(splitted, commands)
+                if parser
+                and _command_name(command_args) in utils.TABLE_COMMANDS)
+            if len(data_formats) > 1:
+                raise ValueError('Parsers take different data formats: %s'
+                                 % ', '.join(sorted(data_formats)))
+            data_format = data_formats.pop() if data_formats else 'json'
 
-        # Returns outputs in str type.
-        return process
+        # Prints the output of each command in a single line. Tables are
+        # printed in JSON format because '--oneline' does not apply to them.
+        args = self._build_args('json', data_format, ['--oneline'])
+        for command_args, (_, parser) in zip(splitted, commands):
+            args.append('--')
+            args.extend(_columns_options(command_args, None, parser))
+            args.extend(command_args)
+
+        return args, splitted, (table_format, data_format)
+
+    @staticmethod
+    def _parse_batch(commands, splitted, table_format, data_format, stdout):
+        lines = stdout.split('\n')[:-1]
+        if len(lines) != len(commands):
+            raise exception.VSCtlCmdParseError(
+                'Expected %d outputs, but got %d'
+                % (len(commands), len(lines)))
+
+        format_table = functools.partial(
+            _format_json_table, data_format=data_format)
+        results = []
+        for command_args, (_, parser), line in zip(splitted, commands, lines):
+            if _command_name(command_args) in utils.TABLE_COMMANDS:
+                output = _apply_parser(format_table, line, table_format=(
+                    getattr(parser, 'table_format', table_format)))
+            else:
+                output = _unescape_oneline(line)
+            if parser:
+                output = _apply_parser(parser, output)
+            results.append(output)
+
+        return results
+
+    def _execute(self, prepared):
+        if prepared.invocation is None:
+            return self._execute_and_finish(prepared)
+        return self._measured(prepared.invocation,
+                              self._execute_and_finish, prepared)
+
+    def _execute_and_finish(self, prepared):
+        start = time.perf_counter()
+        try:
+            process = self.backend.execute(prepared.args)
+        finally:
+            self.invalidate(prepared)
+        return self.finish(prepared, process, time.perf_counter() - start)
+
+    def close(self):
+        """
+        Releases the resources held by the backend (e.g. the connection to
+        OVSDB server).
+
+        The spawner is not closed because it may be shared, e.g. the
+        helper process of `'forkserver'`.
+        """
+        self.backend.close()
@@ -0,0 +1,209 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test cases for ovs_vsctl.aio.
+"""
+
+import asyncio
+import logging
+import os
+import shutil
+import stat
+import tempfile
+import time
+import unittest
+
+from nose.tools import eq_
+from nose.tools import ok_
+from nose.tools import raises
+from six.moves import mock
+
+from ovs_vsctl import line_parser
+from ovs_vsctl import list_cmd_parser
+from ovs_vsctl import VSCtl
+from ovs_vsctl import utils
+from ovs_vsctl.aio import AsyncVSCtl
+from ovs_vsctl.backend import JsonRpcBackend
+from ovs_vsctl.exception import VSCtlCmdExecError
+from ovs_vsctl.fake_server import FakeOVSDBServer
+from ovs_vsctl.spawn import PosixSpawnSpawner
+
+LOG = logging.getLogger(__name__)
+
+
+class TestAsyncVSCtl(unittest.TestCase):
+    """
+    Test cases for ovs_vsctl.aio.AsyncVSCtl.
+    """
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.tmpdir = tempfile.mkdtemp()
+        self.vsctl = AsyncVSCtl('tcp', '127.0.0.1', 6640)
+
+    def tearDown(self):
+        self.loop.close()
+        shutil.rmtree(self.tmpdir)
+
+    def _stub(self, script):
+        path = os.path.join(self.tmpdir, 'ovs-vsctl')
+        with open(path, 'w') as f:  # pylint: disable=invalid-name
+            f.write('#!/bin/sh\n%s\n' % script)
+        os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR)
+        self.vsctl.ovs_vsctl_path = path
+
+    def test_run(self):
+        self._stub('echo "$@"')
+
+        process = self.loop.run_until_complete(self.vsctl.run('list-br'))
+
+        eq_(0, process.returncode)
+        eq_('--db=tcp:127.0.0.1:6640 --format=list --data=string list-br\n',
+            process.stdout.read())
+
+    def test_run_with_parser(self):
+        self._stub('echo \'name                : "s1"\'')
+
+        output = self.loop.run_until_complete(
+            self.vsctl.run('list bridge', parser=list_cmd_parser))
+
+        eq_(['s1'], [r.name for r in output])
+
+    @raises(VSCtlCmdExecError)
+    def test_run_cmd_exec_error(self):
+        self._stub('echo "error" >&2; exit 1')
+
+        self.loop.run_until_complete(self.vsctl.run('list-br'))
+
+    def test_run_with_timeout(self):
+        self._stub('exec sleep 10')
+
+        start = time.time()
+        with self.assertRaises(asyncio.TimeoutError):
+            self.loop.run_until_complete(
+                self.vsctl.run('list-br', timeout=0.1))
+        ok_(time.time() - start < 5)
+
+    def test_run_with_concurrency(self):
+        self.vsctl.concurrency = 2
+        running = []
+        peak = []
+
+        async def communicate(args):
+            running.append(args)
+            peak.append(len(running))
+            await asyncio.sleep(0.01)
+            running.remove(args)
+            return utils.Process(args, 0, 'br%d\n' % len(peak))
+
+        async def main():
+            return await asyncio.gather(*[
+                self.vsctl.run('list-br', parser=line_parser)
+                for _ in range(10)])
+
+        with mock.patch('ovs_vsctl.aio._communicate', communicate):
+            outputs = self.loop.run_until_complete(main())
+
+        eq_(10, len(outputs))
+        eq_(2, max(peak))
+
+    def test_run_on_multiple_loops(self):
+        self.vsctl.concurrency = 1
+
+        async def communicate(args):
+            await asyncio.sleep(0.01)
+            return utils.Process(args, 0, 's1\n')
+
+        async def main():
+            return await asyncio.gather(*[
+                self.vsctl.run('list-br', parser=line_parser)
+                for _ in range(2)])
+
+        with mock.patch('ovs_vsctl.aio._communicate', communicate):
+            for _ in range(2):
+                # The semaphore waited on the previous loop is not reused.
+                eq_([['s1'], ['s1']], asyncio.run(main()))
+
+    def test_run_batch(self):
+        self._stub("printf '%s\\n' s1 's1-eth1\\ns1-eth2'")
+
+        outputs = self.loop.run_until_complete(self.vsctl.run_batch([
+            ('list-br', line_parser),
+            ('list-ports s1', line_parser)]))
+
+        eq_([['s1'], ['s1-eth1', 's1-eth2']], outputs)
+
+    def test_run_with_jsonrpc_backend(self):
+        server = FakeOVSDBServer()
+        server.add_bridge('s1', ['s1-eth1'])
+        server.start()
+        _, _, port = server.ovsdb_addr.rpartition(':')
+        vsctl = AsyncVSCtl('tcp', '127.0.0.1', int(port),
+                           backend=JsonRpcBackend)
+
+        try:
+            output = self.loop.run_until_complete(
+                vsctl.run('list-ports s1', parser=line_parser))
+        finally:
+            vsctl.close()
+            server.stop()
+
+        eq_(['s1-eth1'], output)
+
+    def test_run_without_timeout(self):
+        self._stub('sleep 0.2; echo s1')
+        self.vsctl.timeout = 0.1
+
+        with self.assertRaises(asyncio.TimeoutError):
+            self.loop.run_until_complete(self.vsctl.run('list-br'))
+        output = self.loop.run_until_complete(
+            self.vsctl.run('list-br', parser=line_parser, timeout=None))
+
+        eq_(['s1'], output)
+
+    def test_run_with_metrics(self):
+        self._stub('echo s1')
+        invocations = []
+        vsctl = AsyncVSCtl('tcp', '127.0.0.1', 6640,
+                           metrics=invocations.append,
+                           ovs_vsctl_path=self.vsctl.ovs_vsctl_path)
+
+        self.loop.run_until_complete(vsctl.run('list-br', parser=line_parser))
+        self.loop.run_until_complete(vsctl.run_batch([('list-br', None)]))
+
+        eq_(['list-br', 'list-br'], [i.verb for i in invocations])
+        eq_('line_parser', invocations[0].parser)
+        ok_(invocations[0].wall > 0)
+        ok_(invocations[0].spawn > 0)
+        eq_(3, invocations[0].stdout_size)
+
+    def test_run_with_spawner(self):
+        self._stub('echo s1')
+        spawner = PosixSpawnSpawner()
+        vsctl = AsyncVSCtl('tcp', '127.0.0.1', 6640, spawner=spawner,
+                           ovs_vsctl_path=self.vsctl.ovs_vsctl_path)
+
+        with mock.patch.object(spawner, 'run', wraps=spawner.run) as run:
+            output = self.loop.run_until_complete(
+                vsctl.run('list-br', parser=line_parser))
+
+        eq_(['s1'], output)
+        eq_(1, run.call_count)
+
+    def test_wraps_vsctl(self):
+        ok_(isinstance(self.vsctl.vsctl, VSCtl))
+        ok_(not isinstance(self.vsctl, VSCtl))
+        eq_('tcp:127.0.0.1:6640', self.vsctl.ovsdb_addr)
@@ -17,9 +17,9 @@
 Test cases for APIs using Docker.
 """
 
-from distutils.spawn import find_executable
 import logging
 import shlex
+import shutil
 import unittest
 from uuid import UUID
 
@@ -43,7 +43,7 @@ OVSDB_PORT = 6640
 
 
 def setUpModule():
-    if not find_executable('docker'):
+    if not shutil.which('docker'):
         raise unittest.SkipTest(
             'Docker is not available. Test in %s will be skipped.' % __name__)
 
@@ -0,0 +1,245 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test cases for ovs_vsctl.backend.
+"""
+
+import logging
+import unittest
+
+from nose.tools import eq_
+from nose.tools import ok_
+from nose.tools import raises
+from six.moves import mock
+
+from ovs_vsctl import VSCtl
+from ovs_vsctl import get_cmd_parser
+from ovs_vsctl import json_columns_parser
+from ovs_vsctl import json_list_cmd_parser
+from ovs_vsctl import line_parser
+from ovs_vsctl import list_cmd_parser
+from ovs_vsctl import record_class_parser
+from ovs_vsctl import string_list_cmd_parser
+from ovs_vsctl.backend import JsonRpcBackend
+from ovs_vsctl.exception import VSCtlCmdExecError
+from ovs_vsctl.fake_server import FakeOVSDBServer
+from ovs_vsctl.parser import CompactRecord
+from ovs_vsctl.parser import Record
+
+LOG = logging.getLogger(__name__)
+
+
+class TestJsonRpcBackend(unittest.TestCase):
+    """
+    Test cases for ovs_vsctl.backend.JsonRpcBackend.
+    """
+
+    def setUp(self):
+        self.server = FakeOVSDBServer()
+        self.server.add_bridge('s1', ['s1-eth1', 's1-eth2'])
+        self.server.start()
+        _, _, port = self.server.ovsdb_addr.rpartition(':')
+        self.vsctl = VSCtl('tcp', '127.0.0.1', int(port),
+                           backend=JsonRpcBackend)
+
+    def tearDown(self):
+        self.vsctl.close()
+        self.server.stop()
+
+    def test_list_cmd_parser(self):
+        output = self.vsctl.run('list Port s1', parser=list_cmd_parser)
+
+        eq_(1, len(output))
+        ok_(isinstance(output[0], Record))
+        eq_('s1', output[0].name)
+        eq_([], output[0].tag)
+        eq_({}, output[0].other_config)
+
+    def test_list_output(self):
+        output = self.vsctl.run('list Port s1', table_format='list',
+                                data_format='json').stdout.read()
+
+        ok_('\nname                : "s1"\n' in output)
+        ok_('\ntag                 : ["set",[]]\n' in output)
+
+    def test_get_cmd_parser(self):
+        self.vsctl.run('list-br')  # Connects
+        self.server.insert('Port', {'name': 'p1', 'tag': 100,
+                                    'trunks': ['set', [100, 200]],
+                                    'other_config': ['map', [
+                                        ['stp-enable', 'true']]]})
+
+        eq_(100, self.vsctl.run('get Port p1 tag', parser=get_cmd_parser))
+        eq_([100, 200],
+            self.vsctl.run('get Port p1 trunks', parser=get_cmd_parser))
+        eq_({'stp-enable': 'true'},
+            self.vsctl.run('get Port p1 other_config',
+                           parser=get_cmd_parser))
+        eq_('true', self.vsctl.run('get Port p1 other_config:stp-enable',
+                                   parser=get_cmd_parser))
+
+    def test_get_single_element_set(self):
+        output = self.vsctl.run('get Bridge s1 ports').stdout.read()
+
+        ok_(output.startswith('['))
+
+    def test_line_parser(self):
+        eq_(['s1'], self.vsctl.run('list-br', parser=line_parser))
+        eq_(['s1-eth1', 's1-eth2'],
+            self.vsctl.run('list-ports s1', parser=line_parser))
+        eq_(['s1-eth1', 's1-eth2'],
+            self.vsctl.run('list-ifaces s1', parser=line_parser))
+
+    def test_find(self):
+        output = self.vsctl.run('find Interface name=s1-eth2',
+                                parser=list_cmd_parser)
+
+        eq_(['s1-eth2'], [r.name for r in output])
+
+    def test_columns(self):
+        output = self.vsctl.run('list Interface s1-eth1', table_format='list',
+                                data_format='json',
+                                columns=['name', 'type']).stdout.read()
+
+        eq_('name                : "s1-eth1"\n'
+            'type                : ""\n', output)
+
+        output = self.vsctl.run('find Interface name=s1-eth2',
+                                parser=list_cmd_parser, columns=['_uuid'])
+
+        eq_(['_uuid'], list(vars(output[0])))
+
+    def test_columns_record_class_parser(self):
+        class Interface(CompactRecord):
+            """Declares the columns to fetch."""
+            __slots__ = ('name', 'ofport')
+
+        self.vsctl.run('list-br')  # Connects
+        connection = self.vsctl.backend.connection
+        with mock.patch.object(connection, 'transact',
+                               wraps=connection.transact) as transact:
+            outputs = self.vsctl.run_batch([
+                ('list Interface', record_class_parser(Interface)),
+                ('list Port s1', list_cmd_parser),
+            ])
+
+        eq_(['s1', 's1-eth1', 's1-eth2'], sorted(r.name for r in outputs[0]))
+        ok_(all(isinstance(r, Interface) for r in outputs[0]))
+        eq_('s1', outputs[1][0].name)
+        # Fetches only the needed columns of Interface in a request.
+        eq_(1, transact.call_count)
+        interface_op, port_op = transact.call_args[0][1:]
+        eq_(['_uuid', 'name', 'ofport'], interface_op['columns'])
+        ok_('columns' not in port_op)
+
+    @raises(VSCtlCmdExecError)
+    def test_columns_unknown(self):
+        self.vsctl.run('list Interface', parser=list_cmd_parser,
+                       columns=['name', 'xxx'])
+
+    @raises(VSCtlCmdExecError)
+    def test_no_row(self):
+        self.vsctl.run('list Port xxx', parser=list_cmd_parser)
+
+    def test_br_exists(self):
+        eq_(0, self.vsctl.run('br-exists s1').returncode)
+        eq_(2, self.vsctl.backend.execute(
+            ['ovs-vsctl', 'br-exists', 'xxx']).returncode)
+
+    def test_connection_kept_open(self):
+        self.vsctl.run('list-br', parser=line_parser)
+        sock = self.vsctl.backend.connection._sock
+        self.vsctl.run('list-br', parser=line_parser)
+
+        ok_(sock is not None)
+        ok_(sock is self.vsctl.backend.connection._sock)
+
+    def test_connection_closed_by_server(self):
+        eq_(['s1'], self.vsctl.run('list-br', parser=line_parser))
+        self.server.drop_connections()
+
+        eq_(['s1'], self.vsctl.run('list-br', parser=line_parser))
+
+    def test_fallback(self):
+        fallback = mock.MagicMock()
+        fallback.execute.return_value.returncode = 0
+        self.vsctl.backend.fallback = fallback
+
+        self.vsctl.run('add-br s2')
+
+        ok_(fallback.execute.called)
+        eq_(['add-br', 's2'], fallback.execute.call_args[0][0][-2:])
+
+    def test_run_batch(self):
+        requests = self.server.requests
+        outputs = self.vsctl.run_batch([
+            ('list-br', line_parser),
+            ('list Interface s1-eth1', list_cmd_parser),
+            ('get Port s1 name', get_cmd_parser),
+            ('list-ports s1', None),
+        ])
+
+        eq_(['s1'], outputs[0])
+        eq_('s1-eth1', outputs[1][0].name)
+        eq_('s1', outputs[2])
+        eq_('s1-eth1\ns1-eth2\n', outputs[3])
+        ok_(self.server.requests - requests <= 2)
+
+    def test_json_list_cmd_parser(self):
+        eq_([str(r) for r in self.vsctl.run('list Interface',
+                                            parser=list_cmd_parser)],
+            [str(r) for r in self.vsctl.run('list Interface',
+                                            parser=json_list_cmd_parser)])
+
+    def test_run_batch_with_json_parser(self):
+        outputs = self.vsctl.run_batch([
+            ('list Interface', json_columns_parser),
+            ('list Interface s1-eth1', list_cmd_parser),
+        ])
+
+        eq_(['s1', 's1-eth1', 's1-eth2'], sorted(outputs[0]['name']))
+        eq_('s1-eth1', outputs[1][0].name)
+
+    def test_string_list_cmd_parser(self):
+        self.vsctl.run('list-br')  # Connects
+        self.server.insert('Port', {'name': 'p1', 'tag': 100,
+                                    'trunks': ['set', [100, 200]],
+                                    'other_config': ['map', [
+                                        ['a=b', 'c, d']]]})
+
+        output = self.vsctl.run('list Port p1',
+                                parser=string_list_cmd_parser)
+
+        eq_('p1', output[0].name)
+        eq_(100, output[0].tag)
+        eq_([100, 200], output[0].trunks)
+        eq_({'a=b': 'c, d'}, output[0].other_config)
+
+    def test_run_batch_with_string_parser(self):
+        outputs = self.vsctl.run_batch([
+            ('list Interface s1-eth1', string_list_cmd_parser),
+            ('get Port s1 name', get_cmd_parser),
+        ])
+
+        eq_('s1-eth1', outputs[0][0].name)
+        eq_('s1', outputs[1])
+
+    @raises(ValueError)
+    def test_run_batch_with_different_data_formats(self):
+        self.vsctl.run_batch([
+            ('list Interface s1-eth1', string_list_cmd_parser),
+            ('list Interface s1-eth2', list_cmd_parser),
+        ])
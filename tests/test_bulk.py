@@ -0,0 +1,178 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test cases for ovs_vsctl.bulk.
+"""
+
+import logging
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+
+from nose.tools import eq_
+from nose.tools import ok_
+from nose.tools import raises
+
+from ovs_vsctl.bulk import BulkProvisioner
+from ovs_vsctl.bulk import port_commands
+from ovs_vsctl.exception import VSCtlCmdExecError
+from ovs_vsctl.vsctl import VSCtl
+
+LOG = logging.getLogger(__name__)
+
+# Records the arguments of each invocation, and fails if any argument
+# contains 'bad'.
+STUB = '''#!/bin/sh
+echo "$*" >> "$0.log"
+case "$*" in
+    *bad*)
+        echo "ovs-vsctl: no bridge named bad" >&2
+        exit 1
+        ;;
+esac
+'''
+
+
+class FakeTimer():  # pylint: disable=too-few-public-methods
+    """
+    Timer which advances `latency` seconds for each call, i.e. for each
+    invocation measured.
+    """
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += self.latency
+        return self.now
+
+
+def test_port_commands():
+    eq_(['--may-exist add-port br0 tap0'], port_commands('br0', 'tap0'))
+    eq_(['add-port br0 tap0',
+         "set Interface tap0 'external_ids:iface-id=\"vm 1\"'"
+         " 'options:key=\"100\"' 'options:remote_ip=\"10.0.0.2\"'"
+         " 'trunks=[1, 2]' type=vxlan"],
+        port_commands('br0', 'tap0', may_exist=False, type='vxlan',
+                      options={'remote_ip': '10.0.0.2', 'key': '100'},
+                      external_ids={'iface-id': 'vm 1'}, trunks=[1, 2]))
+
+
+class TestBulkProvisioner(unittest.TestCase):
+    """
+    Test cases for ovs_vsctl.bulk.BulkProvisioner.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'ovs-vsctl')
+        with open(self.path, 'w') as f:  # pylint: disable=invalid-name
+            f.write(STUB)
+        os.chmod(self.path, os.stat(self.path).st_mode | stat.S_IXUSR)
+        self.vsctl = VSCtl('tcp', '127.0.0.1', 6640,
+                           ovs_vsctl_path=self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _invocations(self):
+        if not os.path.exists(self.path + '.log'):
+            return []
+        with open(self.path + '.log') as f:  # pylint: disable=invalid-name
+            return f.read().splitlines()
+
+    def test_provision(self):
+        items = [port_commands('br0', 'tap%d' % i) for i in range(10)]
+        provisioner = BulkProvisioner(self.vsctl, initial_chunk=4)
+        results = provisioner.provision(items)
+
+        eq_(items, [r.item for r in results])
+        ok_(all(r.ok for r in results))
+        # 4 items, then 6 items in the doubled chunk.
+        eq_(2, provisioner.invocations)
+        invocations = self._invocations()
+        eq_(2, len(invocations))
+        ok_(invocations[0].endswith(
+            'add-port br0 tap2 -- --may-exist add-port br0 tap3'))
+        eq_(8, provisioner.chunk_size)
+
+    def test_provision_empty(self):
+        eq_([], BulkProvisioner(self.vsctl).provision([]))
+        eq_([], self._invocations())
+
+    def test_bisect(self):
+        items = ['add-port br0 tap%d' % i for i in range(8)]
+        items[5] = 'add-port bad tap5'
+        provisioner = BulkProvisioner(self.vsctl, initial_chunk=8)
+        results = provisioner.provision(items)
+
+        eq_([['add-port br0 tap%d' % i] for i in range(8) if i != 5],
+            [r.item for r in results if r.ok])
+        ok_(not results[5].ok)
+        ok_(isinstance(results[5].error, VSCtlCmdExecError))
+        # 0-7 (failed), 0-3, 4-7 (failed), 4-5 (failed), 4, 5 (failed), 6-7
+        eq_(7, provisioner.invocations)
+        eq_(7, len(self._invocations()))
+        # Bisection does not shrink nor grow the chunks.
+        eq_(8, provisioner.chunk_size)
+
+    def test_bisect_common_error(self):
+        with open(self.path, 'a') as f:  # pylint: disable=invalid-name
+            f.write('echo "ovs-vsctl: database connection failed" >&2\n'
+                    'exit 1\n')
+        items = ['add-port br0 tap%d' % i for i in range(16)]
+        provisioner = BulkProvisioner(self.vsctl, initial_chunk=8)
+        results = provisioner.provision(items)
+
+        ok_(not any(r.ok for r in results))
+        ok_(all('connection failed' in str(r.error) for r in results))
+        # 0-7, 0-3, 4-7, 8-15, 8-11, 12-15 (all failed)
+        eq_(6, provisioner.invocations)
+
+    def test_adapt_latency(self):
+        items = ['add-port br0 tap%d' % i for i in range(20)]
+        provisioner = BulkProvisioner(
+            self.vsctl, initial_chunk=8, max_chunk=8, target_latency=0.5,
+            timer=FakeTimer(1.0))
+        provisioner.provision(items)
+
+        # 8 items (too slow), 4 items, 2 items, 1 item, 1 item...
+        eq_(1, provisioner.chunk_size)
+        eq_(['tap7', 'tap11', 'tap13', 'tap14', 'tap15'],
+            [i.split()[-1] for i in self._invocations()[:5]])
+
+        provisioner.timer = FakeTimer(0.1)
+        provisioner.provision(items)
+
+        # Doubled up to `max_chunk`.
+        eq_(8, provisioner.chunk_size)
+
+    def test_max_args_size(self):
+        items = ['add-port br0 tap%d' % i for i in range(6)]
+        # Each item is 'add-port br0 tapN' and '--' (24 characters).
+        provisioner = BulkProvisioner(self.vsctl, initial_chunk=6,
+                                      max_args_size=50)
+        results = provisioner.provision(items)
+
+        ok_(all(r.ok for r in results))
+        eq_(3, provisioner.invocations)
+
+    @raises(ValueError)
+    def test_invalid_chunk(self):
+        BulkProvisioner(self.vsctl, initial_chunk=0)
@@ -0,0 +1,162 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test cases for ovs_vsctl.cache.
+"""
+
+import logging
+import unittest
+
+from nose.tools import eq_
+from nose.tools import ok_
+from nose.tools import raises
+from six.moves import mock
+
+from ovs_vsctl import line_parser
+from ovs_vsctl import list_cmd_parser
+from ovs_vsctl import utils
+from ovs_vsctl.cache import command_tables
+from ovs_vsctl.cache import ResultCache
+from ovs_vsctl.vsctl import VSCtl
+
+LOG = logging.getLogger(__name__)
+
+
+class TestCommandTables(unittest.TestCase):
+    """
+    Test cases for ovs_vsctl.cache.command_tables.
+    """
+
+    def test_read(self):
+        eq_((True, frozenset(['port'])),
+            command_tables(['ovs-vsctl', '--db=tcp:127.0.0.1:6640',
+                            'get', 'Port', 's1-eth1', 'tag']))
+        eq_((True, frozenset(['bridge', 'port'])),
+            command_tables(['ovs-vsctl', 'list-ports', 's1']))
+        eq_((True, None), command_tables(['ovs-vsctl', 'show']))
+
+    def test_write(self):
+        eq_((False, frozenset(['port', 'interface', 'qos', 'queue',
+                               'mirror'])),
+            command_tables(['ovs-vsctl', '--if-exists', 'clear', 'Port',
+                            's1-eth1', 'tag', '--',
+                            'set', 'Interface', 's1-eth1', 'type=internal']))
+        eq_((False, None), command_tables(['ovs-vsctl', 'emer-reset']))
+
+    def test_write_cascade(self):
+        # The ports and interfaces are deleted by OVSDB.
+        _, tables = command_tables(['ovs-vsctl', 'set', 'br', 's1',
+                                    'ports=[]'])
+        ok_(set(['bridge', 'port', 'interface', 'mirror']) <= tables)
+        ok_('open_vswitch' not in tables)
+        _, tables = command_tables(['ovs-vsctl', 'del-br', 's1'])
+        ok_(set(['open_vswitch', 'port', 'interface', 'qos']) <= tables)
+        ok_('manager' not in tables)
+
+
+class TestResultCache(unittest.TestCase):
+    """
+    Test cases for ovs_vsctl.cache.ResultCache.
+    """
+
+    def setUp(self):
+        self.now = 0
+        self.cache = ResultCache(maxsize=2, ttl=1,
+                                 timer=lambda: self.now)
+        self.args = ['ovs-vsctl', 'list', 'Port']
+
+    def test_get(self):
+        self.cache.put('target', self.args, None, 'output')
+
+        eq_('output', self.cache.get('target', self.args, None))
+        eq_(1, self.cache.hits)
+        eq_(0, self.cache.misses)
+
+    @raises(KeyError)
+    def test_get_expired(self):
+        self.cache.put('target', self.args, None, 'output')
+        self.now = 1
+
+        self.cache.get('target', self.args, None)
+
+    def test_put_mutating(self):
+        self.cache.put('target', ['ovs-vsctl', 'del-br', 's1'], None, '')
+
+        eq_(0, len(self.cache))
+
+    def test_put_lru(self):
+        self.cache.put('target', ['ovs-vsctl', 'list', 'Port'], None, '1')
+        self.cache.put('target', ['ovs-vsctl', 'list', 'Bridge'], None, '2')
+        self.cache.get('target', ['ovs-vsctl', 'list', 'Port'], None)
+        self.cache.put('target', ['ovs-vsctl', 'list-br'], None, '3')
+
+        eq_('1', self.cache.get('target', ['ovs-vsctl', 'list', 'Port'],
+                                None))
+        with self.assertRaises(KeyError):
+            self.cache.get('target', ['ovs-vsctl', 'list', 'Bridge'], None)
+
+    def test_notify(self):
+        self.cache.put('target', ['ovs-vsctl', 'list', 'Port'], None, '1')
+        self.cache.put('other', ['ovs-vsctl', 'list', 'Port'], None, '2')
+        self.cache.notify('target', ['ovs-vsctl', 'set', 'port', 'p1', 'x'])
+
+        eq_(1, len(self.cache))
+        eq_('2', self.cache.get('other', ['ovs-vsctl', 'list', 'Port'],
+                                None))
+
+
+class TestVSCtlWithCache(unittest.TestCase):
+    """
+    Test cases for ovs_vsctl.vsctl.VSCtl with ovs_vsctl.cache.ResultCache.
+    """
+
+    def setUp(self):
+        self.cache = ResultCache()
+        self.vsctl = VSCtl('tcp', '127.0.0.1', 6640, cache=self.cache)
+
+    @mock.patch('ovs_vsctl.utils.run')
+    def test_run(self, mock_run):
+        mock_run.side_effect = lambda args, **_: utils.Process(args, 0, 's1\n')
+
+        eq_(['s1'], self.vsctl.run('list-br', parser=line_parser))
+        eq_(['s1'], self.vsctl.run('list-br', parser=line_parser))
+        eq_('s1\n', self.vsctl.run('list-br').stdout.read())
+        eq_('s1\n', self.vsctl.run('list-br').stdout.read())
+
+        eq_(2, mock_run.call_count)
+        eq_((2, 2), (self.cache.hits, self.cache.misses))
+
+    @mock.patch('ovs_vsctl.utils.run')
+    def test_run_invalidated(self, mock_run):
+        mock_run.side_effect = lambda args, **_: utils.Process(args, 0, 's1\n')
+
+        self.vsctl.run('list-br', parser=line_parser)
+        self.vsctl.run('add-br s2')
+        self.vsctl.run('list-br', parser=line_parser)
+
+        eq_(3, mock_run.call_count)
+        # The write is not looked up.
+        eq_((0, 2), (self.cache.hits, self.cache.misses))
+
+    @mock.patch('ovs_vsctl.utils.run')
+    def test_run_invalidated_by_cascade(self, mock_run):
+        mock_run.side_effect = lambda args, **_: utils.Process(args, 0, '')
+
+        self.vsctl.run('list Interface', parser=list_cmd_parser)
+        self.vsctl.run('destroy Port s1-eth1')
+        self.vsctl.run('list Interface', parser=list_cmd_parser)
+
+        eq_(3, mock_run.call_count)
@@ -0,0 +1,126 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test cases for ovs_vsctl.columnar.
+"""
+
+import logging
+import unittest
+
+from nose.tools import eq_
+from nose.tools import ok_
+
+from ovs_vsctl import json_list_cmd_parser
+from ovs_vsctl.columnar import columnar_parser
+from ovs_vsctl.columnar import ColumnarTable
+from ovs_vsctl.columnar import numpy
+
+LOG = logging.getLogger(__name__)
+
+OUTPUT = (
+    '{"data":['
+    '["s1-eth1",1,["map",[["rx_bytes",100],["tx_bytes",10]]],'
+    '["map",[["iface-id","vm1"]]]],'
+    '["s1-eth2",2,["map",[["rx_bytes",2000]]],["map",[]]],'
+    '["s1-eth3",["set",[]],["map",[["rx_bytes",3000]]],["map",[]]]],'
+    '"headings":["name","ofport","statistics","external_ids"]}\n')
+
+# Internal and tunnel interfaces have no statistics of some keys.
+MIXED_OUTPUT = (
+    '{"data":['
+    '["br0","internal",["map",[["rx_bytes",500]]]],'
+    '["eth0","",["map",[["rx_bytes",2000],["rx_crc_err",1]]]],'
+    '["vxlan0","vxlan",["map",[]]]],'
+    '"headings":["name","type","statistics"]}\n')
+
+# Counters larger than 2^53 are not exact as float.
+LARGE_OUTPUT = (
+    '{"data":['
+    '["eth0",["map",[["rx_bytes",9007199254740993]]]],'
+    '["vxlan0",["map",[]]]],'
+    '"headings":["name","statistics"]}\n')
+
+
+class TestColumnarTable(unittest.TestCase):
+    """
+    Test cases for ovs_vsctl.columnar.ColumnarTable.
+    """
+
+    def setUp(self):
+        self.table = columnar_parser(OUTPUT)
+
+    def test_columns(self):
+        eq_(3, len(self.table))
+        eq_(['external_ids:iface-id', 'name', 'ofport',
+             'statistics:rx_bytes', 'statistics:tx_bytes'],
+            self.table.names)
+        eq_([100, 2000, 3000], list(self.table['statistics:rx_bytes']))
+        eq_([10, None, None], self.table.values('statistics:tx_bytes'))
+        eq_(['s1-eth1', 's1-eth2', 's1-eth3'], list(self.table['name']))
+
+    def test_sum(self):
+        eq_(5100, self.table.sum('statistics:rx_bytes'))
+        eq_(10, self.table.sum('statistics:tx_bytes'))
+        eq_(3000, self.table.sum('statistics:rx_bytes',
+                                 where=[False, False, True]))
+
+    def test_filter(self):
+        table = self.table.filter(
+            [v > 1000 for v in self.table['statistics:rx_bytes']])
+
+        eq_(['s1-eth2', 's1-eth3'], list(table['name']))
+        eq_(5000, table.sum('statistics:rx_bytes'))
+
+    def test_to_records(self):
+        eq_([str(r) for r in json_list_cmd_parser(OUTPUT)],
+            [str(r) for r in self.table.to_records()])
+
+    def test_from_records(self):
+        table = ColumnarTable.from_records(json_list_cmd_parser(OUTPUT))
+
+        ok_('statistics:rx_bytes' in table)
+        eq_(5100, table.sum('statistics:rx_bytes'))
+
+    def test_missing_keys(self):
+        table = columnar_parser(MIXED_OUTPUT)
+        column = table['statistics:rx_bytes']
+
+        if numpy is not None:
+            eq_(numpy.int64, column.dtype)
+            busy = table.filter(column > 1000)
+            eq_(1, len(table.filter(column < 1000)))
+        else:
+            eq_('q', column.typecode)
+            busy = table.filter([v is not None and v > 1000
+                                 for v in table.values('statistics:rx_bytes')])
+        eq_(['eth0'], list(busy['name']))
+        eq_([500, 2000, None], table.values('statistics:rx_bytes'))
+        eq_([2000], busy.values('statistics:rx_bytes'))
+
+        total = table.sum('statistics:rx_bytes')
+        eq_(2500, total)
+        ok_(isinstance(total, int))
+        eq_(1, table.sum('statistics:rx_crc_err', where=[False, True, True]))
+        eq_([str(r) for r in json_list_cmd_parser(MIXED_OUTPUT)],
+            [str(r) for r in table.to_records()])
+
+    def test_large_integers(self):
+        table = columnar_parser(LARGE_OUTPUT)
+
+        eq_([9007199254740993, None], table.values('statistics:rx_bytes'))
+        eq_(9007199254740993, table.sum('statistics:rx_bytes'))
+        eq_([str(r) for r in json_list_cmd_parser(LARGE_OUTPUT)],
+            [str(r) for r in table.to_records()])
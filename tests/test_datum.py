@@ -0,0 +1,77 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test cases for ovs_vsctl.datum.
+"""
+
+import logging
+import unittest
+
+from nose.tools import eq_
+
+from ovs_vsctl import datum
+from ovs_vsctl.schema import ColumnType
+
+LOG = logging.getLogger(__name__)
+
+UUID = '79c26f92-86f9-485f-945d-5786c8147f53'
+
+
+class TestDatum(unittest.TestCase):
+    """
+    Test cases for ovs_vsctl.datum.
+    """
+
+    def test_dumps(self):
+        eq_('"br1"', datum.dumps('br1'))
+        eq_('100', datum.dumps(['set', [100]]))
+        eq_('["set",[]]', datum.dumps(['set', []]))
+        eq_('["map",[["a","b"]]]', datum.dumps(['map', [['a', 'b']]]))
+        eq_('["uuid","%s"]' % UUID, datum.dumps(['uuid', UUID]))
+
+    def test_to_string(self):
+        eq_('"br1"', datum.to_string('br1'))
+        eq_('br', datum.to_string('br'))
+        eq_('"true"', datum.to_string('true'))
+        eq_(UUID, datum.to_string(['uuid', UUID]))
+        eq_('[]', datum.to_string(['set', []]))
+        eq_('[100, 200]', datum.to_string(['set', [100, 200]]))
+        eq_('{stp-enable="true"}',
+            datum.to_string(['map', [['stp-enable', 'true']]]))
+
+    def test_python_to_string(self):
+        eq_('br', datum.python_to_string('br'))
+        eq_('"br 1"', datum.python_to_string('br 1'))
+        eq_('100', datum.python_to_string(100))
+        eq_('true', datum.python_to_string(True))
+        eq_('[]', datum.python_to_string(None))
+        eq_('[100, 200]', datum.python_to_string([200, 100]))
+        eq_('{}', datum.python_to_string({}))
+        eq_('{iface-id="vm 1", stp-enable="true"}',
+            datum.python_to_string({'stp-enable': 'true',
+                                    'iface-id': 'vm 1'}))
+
+    def test_to_string_with_column_type(self):
+        set_type = ColumnType.from_json(
+            {'key': 'integer', 'min': 0, 'max': 'unlimited'})
+
+        eq_('[100]', datum.to_string(100, set_type))
+
+    def test_atom_from_string(self):
+        eq_(100, datum.atom_from_string('100', 'integer'))
+        eq_(True, datum.atom_from_string('true', 'boolean'))
+        eq_('br1', datum.atom_from_string('"br1"', 'string'))
+        eq_(['uuid', UUID], datum.atom_from_string(UUID, 'uuid'))
@@ -0,0 +1,115 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test cases for ovs_vsctl.decoder.
+"""
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+from nose.tools import eq_
+from nose.tools import ok_
+from nose.tools import raises
+
+from ovs_vsctl.decoder import SchemaDecoder
+from ovs_vsctl.fake_server import VSWITCH_SCHEMA
+from ovs_vsctl.schema import Schema
+
+LOG = logging.getLogger(__name__)
+
+UUID = '1f42e5a6-26ff-4d5d-ae6e-6ac8de3b4b2e'
+
+
+class TestSchemaDecoder(unittest.TestCase):
+    """
+    Test cases for ovs_vsctl.decoder.SchemaDecoder.
+    """
+
+    def setUp(self):
+        self.decoder = SchemaDecoder(Schema.from_json(VSWITCH_SCHEMA))
+
+    def test_decoders(self):
+        decoders = self.decoder.decoders('Port')
+
+        eq_(UUID, decoders['_uuid']('["uuid","%s"]' % UUID))
+        eq_('s1-eth1', decoders['name']('"s1-eth1"'))
+        eq_('a"b', decoders['name']('"a\\"b"'))
+        eq_(True, decoders['fake_bridge']('true'))
+        # Optional
+        eq_(None, decoders['tag']('["set",[]]'))
+        eq_(100, decoders['tag']('100'))
+        # Set
+        eq_([], decoders['trunks']('["set",[]]'))
+        eq_([100], decoders['trunks']('100'))
+        eq_([100, 200], decoders['trunks']('["set",[100,200]]'))
+        eq_([UUID], decoders['interfaces']('["uuid","%s"]' % UUID))
+        # Map
+        eq_({'rx_bytes': 1},
+            decoders['statistics']('["map",[["rx_bytes",1]]]'))
+
+    def test_list_cmd_parser(self):
+        output = (
+            '_uuid               : ["uuid","%s"]\n'
+            'name                : "s1-eth1"\n'
+            'tag                 : ["set",[]]\n'
+            'trunks              : 100\n'
+            'unknown             : ["set",[1,2]]\n'
+            '\n'
+            '_uuid               : ["uuid","%s"]\n'
+            'name                : "s1-eth2"\n'
+            'tag                 : 10\n'
+            'trunks              : ["set",[]]\n'
+            'unknown             : 1\n' % (UUID, UUID))
+        parser = self.decoder.list_cmd_parser('port')
+
+        records = parser(output)
+
+        eq_(2, len(records))
+        eq_((None, [100], [1, 2]),
+            (records[0].tag, records[0].trunks, records[0].unknown))
+        eq_((10, [], 1),
+            (records[1].tag, records[1].trunks, records[1].unknown))
+        ok_(parser is self.decoder.list_cmd_parser('Port'))
+
+    def test_get_cmd_parser(self):
+        eq_([100, 200], self.decoder.get_cmd_parser('Port', 'trunks')(
+            '[100, 200]\n'))
+        eq_(None, self.decoder.get_cmd_parser('Port', 'tag')('[]\n'))
+        eq_({'a=b': 'c, d', 'e': ''},
+            self.decoder.get_cmd_parser('Port', 'external_ids')(
+                '{"a=b"="c, d", e=""}\n'))
+        eq_(10, self.decoder.get_cmd_parser('Port', 'statistics', 'x')(
+            '10\n'))
+
+    @raises(ValueError)
+    def test_get_cmd_parser_unknown_column(self):
+        self.decoder.get_cmd_parser('Port', 'xxx')
+
+    def test_load(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, 'vswitch.ovsschema')
+            with open(path, 'w') as f:  # pylint: disable=invalid-name
+                json.dump(VSWITCH_SCHEMA, f)
+            decoder = SchemaDecoder.load(path)
+        finally:
+            shutil.rmtree(tmpdir)
+
+        eq_('Open_vSwitch', decoder.schema.name)
@@ -0,0 +1,138 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test cases for ovs_vsctl.index.
+"""
+
+import logging
+import unittest
+
+from nose.tools import eq_
+from nose.tools import ok_
+from nose.tools import raises
+
+from ovs_vsctl.index import IndexedTable
+from ovs_vsctl.parser import Record
+from ovs_vsctl.parser import list_cmd_parser
+
+LOG = logging.getLogger(__name__)
+
+
+def _interface(i, iface_id, vlans=()):
+    return Record(_uuid='uuid%d' % i, name='s1-eth%d' % i,
+                  external_ids={'iface-id': iface_id} if iface_id else {},
+                  trunks=list(vlans))
+
+
+class TestIndexedTable(unittest.TestCase):
+    """
+    Test cases for ovs_vsctl.index.IndexedTable.
+    """
+
+    def setUp(self):
+        self.records = [_interface(1, 'vm1', [100, 200]),
+                        _interface(2, 'vm1', [200]),
+                        _interface(3, None)]
+        self.table = IndexedTable(self.records, unique=['_uuid', 'name'],
+                                  multi=['external_ids:iface-id', 'trunks'])
+
+    def test_get(self):
+        ok_(self.table.get('name', 's1-eth2') is self.records[1])
+        ok_(self.table.get('_uuid', 'uuid3') is self.records[2])
+        eq_(3, len(self.table))
+        eq_(['_uuid', 'external_ids:iface-id', 'name', 'trunks'],
+            self.table.indexes)
+
+    @raises(KeyError)
+    def test_get_not_found(self):
+        self.table.get('name', 's1-eth4')
+
+    @raises(ValueError)
+    def test_get_not_unique(self):
+        self.table.get('trunks', 100)
+
+    def test_find(self):
+        eq_(self.records[:2], self.table.find('external_ids:iface-id', 'vm1'))
+        eq_(self.records[:2], self.table.find('trunks', 200))
+        eq_([self.records[0]], self.table.find('trunks', 100))
+        eq_([], self.table.find('trunks', 300))
+        eq_([self.records[2]], self.table.find('name', 's1-eth3'))
+        eq_([], self.table.find('name', 's1-eth4'))
+
+    @raises(ValueError)
+    def test_duplicate_key(self):
+        IndexedTable(self.records, unique=['external_ids:iface-id'])
+
+    def test_add_index(self):
+        self.table.add_index('external_ids')
+
+        eq_(self.records[:2], self.table.find('external_ids', 'iface-id'))
+
+    def test_add_remove(self):
+        record = _interface(4, 'vm2', [100])
+        self.table.add(record)
+
+        ok_(record in self.table)
+        ok_(self.table.get('name', 's1-eth4') is record)
+        eq_([self.records[0], record], self.table.find('trunks', 100))
+
+        self.table.remove(self.records[0])
+
+        ok_(self.records[0] not in self.table)
+        eq_([record], self.table.find('trunks', 100))
+        eq_([self.records[1]], self.table.find('external_ids:iface-id', 'vm1'))
+        with self.assertRaises(KeyError):
+            self.table.get('name', 's1-eth1')
+        with self.assertRaises(ValueError):
+            self.table.remove(self.records[0])
+
+    def test_add_duplicate_key(self):
+        with self.assertRaises(ValueError):
+            self.table.add(_interface(1, None))
+
+        eq_(3, len(self.table))
+        ok_(self.table.get('name', 's1-eth1') is self.records[0])
+
+    def test_rebuild(self):
+        records = [_interface(1, 'vm2'), _interface(4, 'vm2')]
+        self.table.rebuild(records)
+
+        eq_(records, self.table.records)
+        eq_(records, self.table.find('external_ids:iface-id', 'vm2'))
+        eq_([], self.table.find('trunks', 200))
+
+    def test_rebuild_duplicate_key(self):
+        with self.assertRaises(ValueError):
+            self.table.rebuild([_interface(1, None), _interface(1, None)])
+
+        eq_(self.records, self.table.records)
+        ok_(self.table.get('name', 's1-eth1') is self.records[0])
+
+    def test_uuid_set(self):
+        bridges = list_cmd_parser(
+            '_uuid               : ["uuid","b1"]\n'
+            'name                : "s1"\n'
+            'ports               : ["set",[["uuid","p1"],["uuid","p2"]]]\n'
+            '\n'
+            '_uuid               : ["uuid","b2"]\n'
+            'name                : "s2"\n'
+            'ports               : ["uuid","p3"]\n')
+        table = IndexedTable(bridges, unique=['_uuid'], multi=['ports'])
+
+        ok_(table.get('_uuid', 'b2') is bridges[1])
+        eq_([bridges[0]], table.find('ports', 'p2'))
+        eq_([bridges[1]], table.find('ports', 'p3'))
+        eq_([], table.find('ports', 'uuid'))
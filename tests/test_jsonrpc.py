@@ -0,0 +1,101 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test cases for ovs_vsctl.jsonrpc.
+"""
+
+import logging
+import unittest
+
+from nose.tools import eq_
+
+from ovs_vsctl.exception import VSCtlRpcError
+from ovs_vsctl.fake_server import FakeOVSDBServer
+from ovs_vsctl.jsonrpc import Connection
+from ovs_vsctl.jsonrpc import JsonStream
+from ovs_vsctl.jsonrpc import parse_address
+
+LOG = logging.getLogger(__name__)
+
+
+class TestJsonRpc(unittest.TestCase):
+    """
+    Test cases for ovs_vsctl.jsonrpc.
+    """
+
+    def test_parse_address(self):
+        eq_(('tcp', ('127.0.0.1', 6640)), parse_address('tcp:127.0.0.1:6640'))
+        eq_(('ssl', ('::1', 6640)), parse_address('ssl:[::1]:6640'))
+        eq_(('unix', '/tmp/db.sock'), parse_address('unix:/tmp/db.sock'))
+
+    def test_json_stream(self):
+        stream = JsonStream()
+
+        eq_([], stream.feed(b'{"id":0,"result":'))
+        eq_([], stream.feed(b'["}"]'))
+        eq_([{'id': 0, 'result': ['}']}, {'id': 1}],
+            stream.feed(b'}\n{"id":1}'))
+        eq_([{'id': 2}], stream.feed(b' {"id":2}'))
+
+
+class TestConnection(unittest.TestCase):
+    """
+    Test cases for ovs_vsctl.jsonrpc.Connection.
+    """
+
+    def setUp(self):
+        self.server = FakeOVSDBServer()
+        self.server.add_port('s1-eth1')
+        self.server.start()
+        self.notifications = []
+        self.connection = Connection(self.server.ovsdb_addr, timeout=5)
+        self.connection.notification_handler = (
+            lambda method, params: self.notifications.append(
+                (method, params)))
+
+    def tearDown(self):
+        self.connection.close()
+        self.server.stop()
+
+    def test_monitor(self):
+        updates = self.connection.monitor(
+            'Open_vSwitch', 'mon', {'Port': {'columns': ['name', 'tag']}})
+
+        eq_(['Port'], list(updates))
+        eq_([{'new': {'name': 's1-eth1', 'tag': ['set', []]}}],
+            list(updates['Port'].values()))
+
+        port_uuid = self.server.add_port('s1-eth2')
+        self.connection.receive()
+
+        eq_([('update', ['mon', {'Port': {port_uuid: {'new': {
+            'name': 's1-eth2', 'tag': ['set', []]}}}}])],
+            self.notifications)
+
+    def test_call_retry(self):
+        eq_(['a'], self.connection.call('echo', 'a'))
+        self.server.drop_connections()
+
+        eq_(['b'], self.connection.call('echo', 'b', retry=True))
+
+    def test_call_without_retry(self):
+        eq_(['a'], self.connection.call('echo', 'a'))
+        self.server.drop_connections()
+
+        with self.assertRaises(VSCtlRpcError):
+            self.connection.call('echo', 'b')
+        # Reconnects at the next request.
+        eq_(['c'], self.connection.call('echo', 'c'))
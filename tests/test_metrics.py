@@ -0,0 +1,198 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test cases for ovs_vsctl.metrics.
+"""
+
+import io
+import logging
+import unittest
+
+from nose.tools import eq_
+from nose.tools import ok_
+from six.moves import mock
+
+from ovs_vsctl import line_parser
+from ovs_vsctl import list_cmd_parser
+from ovs_vsctl import utils
+from ovs_vsctl.exception import VSCtlCmdExecError
+from ovs_vsctl.exception import VSCtlCmdParseError
+from ovs_vsctl.metrics import Histogram
+from ovs_vsctl.metrics import Invocation
+from ovs_vsctl.metrics import MetricsRegistry
+from ovs_vsctl.vsctl import VSCtl
+
+LOG = logging.getLogger(__name__)
+
+
+def _invocation(verb='list', parser='list_cmd_parser', wall=0.002):
+    invocation = Invocation(['ovs-vsctl', verb], verb, parser)
+    invocation.spawn = 0.001
+    invocation.wall = wall
+    invocation.parse = 0.0001
+    invocation.stdout_size = 100
+    invocation.returncode = 0
+    return invocation
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """
+    Test cases for ovs_vsctl.metrics.MetricsRegistry.
+    """
+
+    def setUp(self):
+        self.registry = MetricsRegistry(buckets=(0.001, 0.01))
+
+    def test_histogram(self):
+        histogram = Histogram((0.001, 0.01))
+        for value in (0.0005, 0.001, 0.005, 1):
+            histogram.observe(value)
+
+        eq_([(0.001, 2), (0.01, 3), (float('inf'), 4)],
+            histogram.cumulative_counts())
+        eq_(4, histogram.count)
+
+    def test_observe(self):
+        self.registry.observe(_invocation(wall=0.002))
+        self.registry(_invocation(wall=0.02))
+        failed = _invocation(parser=None)
+        failed.returncode = 1
+        self.registry(failed)
+
+        wall = self.registry.histogram('ovs_vsctl_wall_seconds', 'list',
+                                       'list_cmd_parser')
+        eq_([(0.001, 0), (0.01, 1), (float('inf'), 2)],
+            wall.cumulative_counts())
+        eq_(2, self.registry.counter('ovs_vsctl_invocations_total', 'list',
+                                     'list_cmd_parser'))
+        eq_(200, self.registry.counter('ovs_vsctl_stdout_chars_total',
+                                       'list', 'list_cmd_parser'))
+        eq_(1, self.registry.counter('ovs_vsctl_failures_total', 'list'))
+        eq_(0, self.registry.counter('ovs_vsctl_failures_total', 'show'))
+
+    def test_callbacks(self):
+        callback = mock.MagicMock()
+        self.registry.callbacks.append(callback)
+        invocation = _invocation()
+        self.registry(invocation)
+
+        callback.assert_called_once_with(invocation)
+
+    def test_to_prometheus(self):
+        self.registry(_invocation())
+        self.registry(_invocation(verb='list-br', parser=None))
+        output = self.registry.to_prometheus()
+
+        ok_('# TYPE ovs_vsctl_wall_seconds histogram\n' in output)
+        ok_('ovs_vsctl_wall_seconds_bucket{verb="list",'
+            'parser="list_cmd_parser",le="0.001"} 0\n' in output)
+        ok_('ovs_vsctl_wall_seconds_bucket{verb="list",'
+            'parser="list_cmd_parser",le="+Inf"} 1\n' in output)
+        ok_('ovs_vsctl_wall_seconds_count{verb="list-br",parser=""} 1\n'
+            in output)
+        ok_('# TYPE ovs_vsctl_invocations_total counter\n' in output)
+        ok_('ovs_vsctl_stdout_chars_total{verb="list",'
+            'parser="list_cmd_parser"} 100\n' in output)
+
+
+class TestVSCtlWithMetrics(unittest.TestCase):
+    """
+    Test cases for ovs_vsctl.vsctl.VSCtl with metrics.
+    """
+
+    def setUp(self):
+        self.invocations = []
+        self.vsctl = VSCtl('tcp', '127.0.0.1', 6640,
+                           metrics=self.invocations.append)
+
+    @mock.patch('ovs_vsctl.utils.run')
+    def test_run(self, mock_run):
+        output = '_uuid               : ["uuid","%s"]\n' % ('0' * 36)
+        mock_run.return_value = utils.Process([], 0, output,
+                                              spawn_time=0.001)
+
+        self.vsctl.run('--if-exists list Port s1-eth1',
+                       parser=list_cmd_parser)
+
+        invocation, = self.invocations
+        eq_('list', invocation.verb)
+        eq_('list_cmd_parser', invocation.parser)
+        eq_(0.001, invocation.spawn)
+        ok_(invocation.wall >= 0)
+        ok_(invocation.parse >= 0)
+        eq_(len(output), invocation.stdout_size)
+        ok_(not invocation.failed)
+
+    @mock.patch('ovs_vsctl.utils.run')
+    def test_run_failed(self, mock_run):
+        mock_run.return_value = utils.Process([], 1, '', 'error\n')
+
+        with self.assertRaises(VSCtlCmdExecError):
+            self.vsctl.run('list Port s1-eth1', parser=list_cmd_parser)
+
+        invocation, = self.invocations
+        ok_(invocation.failed)
+        eq_(6, invocation.stderr_size)
+        eq_(None, invocation.parse)
+
+    @mock.patch('ovs_vsctl.utils.run')
+    def test_run_parse_error(self, mock_run):
+        mock_run.return_value = utils.Process([], 0, 'xxx\n')
+
+        with self.assertRaises(VSCtlCmdParseError):
+            self.vsctl.run('list Port', parser=list_cmd_parser)
+
+        invocation, = self.invocations
+        ok_(invocation.failed)
+        ok_(isinstance(invocation.error, VSCtlCmdParseError))
+        ok_(invocation.parse is not None)
+
+    @mock.patch('ovs_vsctl.utils.run')
+    def test_run_batch(self, mock_run):
+        mock_run.return_value = utils.Process([], 0, 's1\n\n')
+
+        self.vsctl.run_batch([('list-br', line_parser),
+                              ('add-br s2', None)])
+
+        invocation, = self.invocations
+        eq_('list-br,add-br', invocation.verb)
+        eq_(None, invocation.parser)
+        ok_(invocation.parse is not None)
+
+    def test_run_with_streams(self):
+        # e.g. the pipes returned by a custom spawner.
+        process = mock.Mock(
+            returncode=0, spawn_time=None,
+            stdout=io.TextIOWrapper(io.BytesIO(b's1\n')),
+            stderr=io.TextIOWrapper(io.BytesIO(b'')))
+        self.vsctl.spawner = mock.Mock()
+        self.vsctl.spawner.run.return_value = process
+
+        eq_(['s1'], self.vsctl.run('list-br', parser=line_parser))
+
+        invocation, = self.invocations
+        eq_(0, invocation.stdout_size)
+        ok_(not invocation.failed)
+
+    @mock.patch('ovs_vsctl.vsctl.Invocation')
+    @mock.patch('ovs_vsctl.utils.run')
+    def test_run_without_metrics(self, mock_run, mock_invocation):
+        mock_run.return_value = utils.Process([], 0, 's1\n')
+        self.vsctl.metrics = None
+
+        eq_(['s1'], self.vsctl.run('list-br', parser=line_parser))
+
+        ok_(not mock_invocation.called)
@@ -0,0 +1,99 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test cases for ovs_vsctl.parallel.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import unittest
+
+from nose.tools import eq_
+from nose.tools import ok_
+from six.moves import mock
+
+from ovs_vsctl import list_cmd_parser
+from ovs_vsctl.parallel import parallel_list_cmd_parser
+from ovs_vsctl.parallel import shutdown
+from ovs_vsctl.parallel import split_records
+from ovs_vsctl.parser import CompactRecord
+
+LOG = logging.getLogger(__name__)
+
+
+def _output(n_rows):
+    return '\n\n'.join(
+        '_uuid               : ["uuid","%08d-2222-3333-4444-555555555555"]\n'
+        'external_ids        : ["map",[["iface-id","vm%d"]]]\n'
+        'name                : "s1-eth%d"\n'
+        'ofport              : %d' % (i, i % 10, i, i)
+        for i in range(n_rows))
+
+
+class TestParallel(unittest.TestCase):
+    """
+    Test cases for ovs_vsctl.parallel.
+    """
+
+    def setUp(self):
+        self.output = _output(100)
+
+    def tearDown(self):
+        shutdown()
+
+    def test_split_records(self):
+        chunks = split_records(self.output, 3)
+
+        eq_(3, len(chunks))
+        eq_(self.output, '\n\n'.join(chunks))
+        for chunk in chunks:
+            ok_(chunk.startswith('_uuid'))
+            ok_(30 <= len(list_cmd_parser(chunk)) <= 37)
+
+    def test_split_records_few(self):
+        eq_(['a'], split_records('a', 4))
+        eq_(['a', 'b'], split_records('a\n\nb', 4))
+
+    def test_parallel(self):
+        records = parallel_list_cmd_parser(self.output, processes=2,
+                                           min_size=0)
+
+        eq_(repr(list_cmd_parser(self.output)), repr(records))
+
+    def test_parallel_compact(self):
+        records = parallel_list_cmd_parser(self.output, processes=2,
+                                           min_size=0, compact=True)
+
+        eq_(100, len(records))
+        ok_(all(isinstance(r, CompactRecord) for r in records))
+        eq_(['s1-eth%d' % i for i in range(100)], [r.name for r in records])
+
+    def test_executor(self):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            records = parallel_list_cmd_parser(self.output, processes=4,
+                                               min_size=0, executor=executor)
+
+        eq_(repr(list_cmd_parser(self.output)), repr(records))
+
+    def test_serial(self):
+        executor = mock.Mock()
+        for kwargs in ({'processes': 4},
+                       {'processes': 1, 'min_size': 0}):
+            records = parallel_list_cmd_parser(self.output,
+                                               executor=executor, **kwargs)
+            eq_(100, len(records))
+
+        ok_(not executor.map.called)
@@ -18,11 +18,31 @@ Test cases for ovs_vsctl.parser.
 """
 
 import logging
+import pickle
+import random
 import unittest
+import uuid
 
 from nose.tools import eq_
+from nose.tools import ok_
+from nose.tools import raises
+from six.moves import mock
 
+from ovs_vsctl import datum
+from ovs_vsctl.parser import compact_list_cmd_parser
+from ovs_vsctl.parser import compact_record_class
+from ovs_vsctl.parser import CompactRecord
+from ovs_vsctl.parser import get_cmd_parser
+from ovs_vsctl.parser import iter_list_cmd_parser
+from ovs_vsctl.parser import json_columns_parser
+from ovs_vsctl.parser import json_list_cmd_parser
+from ovs_vsctl.parser import lazy_list_cmd_parser
+from ovs_vsctl.parser import LazyRecord
+from ovs_vsctl.parser import list_cmd_parser
 from ovs_vsctl.parser import Record
+from ovs_vsctl.parser import record_class_parser
+from ovs_vsctl.parser import string_list_cmd_parser
+from ovs_vsctl.parser import string_value_parser
 
 LOG = logging.getLogger(__name__)
 
@@ -36,3 +56,323 @@ class TestRecord(unittest.TestCase):
         record = Record(aaa=1, bbb='value')
 
         eq_("Record(aaa=1, bbb='value')", str(record))
+
+
+class TestIterListCmdParser(unittest.TestCase):
+    """
+    Test cases for ovs_vsctl.parser.iter_list_cmd_parser.
+    """
+
+    output = (
+        '_uuid               : '
+        '["uuid","1f42e5a6-26ff-4d5d-ae6e-6ac8de3b4b2e"]\n'
+        'name                : "s1-eth1"\n'
+        'ofport              : 1\n'
+        '\n'
+        '_uuid               : '
+        '["uuid","2f42e5a6-26ff-4d5d-ae6e-6ac8de3b4b2e"]\n'
+        'name                : "s1-eth2"\n'
+        'ofport              : 2\n')
+
+    def test_str(self):
+        records = list(iter_list_cmd_parser(self.output))
+
+        eq_([str(r) for r in list_cmd_parser(self.output)],
+            [str(r) for r in records])
+
+    def test_lines(self):
+        lines = iter(self.output.splitlines(True))
+        records = iter_list_cmd_parser(lines)
+
+        eq_('s1-eth1', next(records).name)
+        # The second record is not read yet.
+        ok_(next(lines).startswith('_uuid'))
+
+    def test_empty(self):
+        eq_([], list(iter_list_cmd_parser('')))
+        eq_([], list(iter_list_cmd_parser('\n\n')))
+
+
+class TestCompactRecord(unittest.TestCase):
+    """
+    Test cases for ovs_vsctl.parser.CompactRecord.
+    """
+
+    output = (
+        '_uuid               : '
+        '["uuid","1f42e5a6-26ff-4d5d-ae6e-6ac8de3b4b2e"]\n'
+        'external_ids        : ["map",[["iface-id","vm1"]]]\n'
+        'name                : "s1-eth1"\n'
+        '\n'
+        '_uuid               : '
+        '["uuid","2f42e5a6-26ff-4d5d-ae6e-6ac8de3b4b2e"]\n'
+        'external_ids        : ["map",[["iface-id","vm2"]]]\n'
+        'name                : "s1-eth2"\n')
+
+    def test_compact_list_cmd_parser(self):
+        records = compact_list_cmd_parser(self.output)
+
+        eq_([str(r) for r in list_cmd_parser(self.output)],
+            [str(r) for r in records])
+        ok_(isinstance(records[0], Record))
+        ok_(records[0].__class__ is records[1].__class__)
+        # Map keys are shared.
+        key0, = records[0].external_ids
+        key1, = records[1].external_ids
+        ok_(key0 is key1)
+
+    def test_iter_list_cmd_parser(self):
+        records = list(iter_list_cmd_parser(self.output, compact=True))
+
+        eq_('s1-eth2', records[1].name)
+        ok_(records[0].__class__ is records[1].__class__)
+
+    def test_compact_record_class(self):
+        cls = compact_record_class(['name', 'ofport'])
+        record = cls(name='s1-eth1', ofport=1)
+
+        eq_("Record(name='s1-eth1', ofport=1)", str(record))
+        ok_(cls is compact_record_class(('name', 'ofport')))
+
+    def test_pickle(self):
+        record = compact_list_cmd_parser(self.output)[0]
+
+        eq_(str(record), str(pickle.loads(pickle.dumps(record))))
+
+    def test_record_class_parser(self):
+        class Interface(CompactRecord):
+            """Declares the columns to fetch."""
+            __slots__ = ('name', '_uuid')
+
+        parser = record_class_parser(Interface)
+        records = parser(self.output)
+
+        eq_(('name', '_uuid'), parser.columns)
+        eq_('record_class_parser(Interface)', parser.__name__)
+        ok_(all(isinstance(r, Interface) for r in records))
+        eq_(['s1-eth1', 's1-eth2'], [r.name for r in records])
+        # Not declared.
+        ok_(not hasattr(records[0], 'external_ids'))
+
+    @raises(ValueError)
+    def test_record_class_parser_no_columns(self):
+        record_class_parser(CompactRecord)
+
+    def test_empty(self):
+        class Interface(CompactRecord):
+            """Declares the columns to fetch."""
+            __slots__ = ('name',)
+
+        for buf in ('', '\n', '\n\n'):
+            eq_([], list_cmd_parser(buf))
+            eq_([], list_cmd_parser(buf, lazy=True))
+            eq_([], compact_list_cmd_parser(buf))
+            eq_([], record_class_parser(Interface)(buf))
+
+
+class TestLazyRecord(unittest.TestCase):
+    """
+    Test cases for ovs_vsctl.parser.LazyRecord.
+    """
+
+    output = TestCompactRecord.output
+
+    @mock.patch('ovs_vsctl.parser._record_value_parser',
+                side_effect=lambda buf: buf.upper())
+    def test_decode_on_access(self, mock_parser):
+        record = lazy_list_cmd_parser(self.output)[0]
+
+        eq_(0, mock_parser.call_count)
+        eq_('"S1-ETH1"', record.name)
+        eq_('"S1-ETH1"', record.name)
+        mock_parser.assert_called_once_with('"s1-eth1"')
+        eq_(['name'], list(vars(record)))
+
+    def test_lazy_list_cmd_parser(self):
+        records = lazy_list_cmd_parser(self.output)
+
+        eq_([str(r) for r in list_cmd_parser(self.output)],
+            [str(r).replace('LazyRecord', 'Record', 1) for r in records])
+        ok_(isinstance(records[0], LazyRecord))
+
+    def test_iter_list_cmd_parser(self):
+        records = list(iter_list_cmd_parser(self.output, lazy=True))
+
+        eq_('s1-eth2', records[1].name)
+        eq_({'iface-id': 'vm2'}, records[1].external_ids)
+
+    @raises(AttributeError)
+    def test_missing_column(self):
+        _ = lazy_list_cmd_parser(self.output)[0].ofport
+
+    @raises(ValueError)
+    def test_compact_and_lazy(self):
+        list_cmd_parser(self.output, compact=True, lazy=True)
+
+    def test_pickle(self):
+        record = lazy_list_cmd_parser(self.output)[0]
+        loaded = pickle.loads(pickle.dumps(record))
+
+        eq_(str(record), str(loaded))
+        eq_('s1-eth1', loaded.name)
+
+
+class TestJsonParsers(unittest.TestCase):
+    """
+    Test cases for the parsers of the outputs in JSON format.
+    """
+
+    output = (
+        '{"data":[[["uuid","1f42e5a6-26ff-4d5d-ae6e-6ac8de3b4b2e"],'
+        '["map",[["iface-id","vm1"]]],"s1-eth1\\n\\nx",["set",[1,2]]]],'
+        '"headings":["_uuid","external_ids","name","trunks"]}\n')
+
+    def test_json_list_cmd_parser(self):
+        records = json_list_cmd_parser(self.output)
+
+        eq_(1, len(records))
+        eq_('1f42e5a6-26ff-4d5d-ae6e-6ac8de3b4b2e', records[0]._uuid)
+        eq_({'iface-id': 'vm1'}, records[0].external_ids)
+        eq_('s1-eth1\n\nx', records[0].name)
+        eq_([1, 2], records[0].trunks)
+        eq_('json', json_list_cmd_parser.table_format)
+
+    def test_json_columns_parser(self):
+        columns = json_columns_parser(self.output)
+
+        eq_(['s1-eth1\n\nx'], columns['name'])
+        eq_([[1, 2]], columns['trunks'])
+
+    def test_json_columns_parser_empty(self):
+        eq_({'name': []},
+            json_columns_parser('{"data":[],"headings":["name"]}'))
+
+
+# Characters of the random strings, including the separators and escapes.
+_FUZZ_CHARS = 'aZ_-.09 ,={}[]":\\\n\t\u00e9\u3042'
+
+
+def _random_atom(rng):
+    """
+    Returns the tuple of random OVSDB atom and its expected Python value.
+    """
+    kind = rng.choice(('string', 'bare', 'integer', 'real', 'boolean',
+                       'uuid'))
+    if kind == 'string':
+        value = ''.join(rng.choice(_FUZZ_CHARS)
+                        for _ in range(rng.randint(0, 8)))
+        return value, value
+    if kind == 'bare':
+        value = rng.choice(('s1-eth1', 'true', 'internal', 'a.b', '_x'))
+        return value, value
+    if kind == 'integer':
+        value = rng.randint(-2 ** 63, 2 ** 63 - 1)
+        return value, value
+    if kind == 'real':
+        value = rng.uniform(-1e6, 1e6)
+        return value, float('%.15g' % value)
+    if kind == 'boolean':
+        value = rng.choice((True, False))
+        return value, value
+    value = str(uuid.UUID(int=rng.getrandbits(128)))
+    return ['uuid', value], value
+
+
+def _random_value(rng):
+    """
+    Returns the tuple of random OVSDB value and its expected Python value.
+    """
+    kind = rng.choice(('atom', 'set', 'map'))
+    if kind == 'atom':
+        return _random_atom(rng)
+    # Single element sets are printed as the atom.
+    size = rng.choice((0, 2, 3, 5))
+    if kind == 'set':
+        atoms = [_random_atom(rng) for _ in range(size)]
+        return ['set', [a for a, _ in atoms]], [e for _, e in atoms]
+    pairs = [(_random_atom(rng), _random_atom(rng)) for _ in range(size)]
+    return (['map', [[k, v] for (k, _), (v, _) in pairs]],
+            dict((k, v) for (_, k), (_, v) in pairs))
+
+
+class TestStringValueParser(unittest.TestCase):
+    """
+    Test cases for ovs_vsctl.parser.string_value_parser.
+    """
+
+    def test_atoms(self):
+        eq_('br1', string_value_parser('"br1"'))
+        eq_('s1-eth1', string_value_parser('s1-eth1'))
+        eq_(100, string_value_parser('100'))
+        eq_(-1.5, string_value_parser('-1.5'))
+        eq_(True, string_value_parser('true'))
+        eq_('1f42e5a6-26ff-4d5d-ae6e-6ac8de3b4b2e',
+            string_value_parser('1f42e5a6-26ff-4d5d-ae6e-6ac8de3b4b2e'))
+        eq_('', string_value_parser(''))
+
+    def test_set(self):
+        eq_([], string_value_parser('[]'))
+        eq_([100, 200], string_value_parser('[100, 200]'))
+        eq_(['a, b', 'c]'], string_value_parser('["a, b", "c]"]'))
+
+    def test_map(self):
+        eq_({}, string_value_parser('{}'))
+        eq_({'stp-enable': 'true', 'a=b': 'c, d', 'e': 'x"y'},
+            string_value_parser(
+                '{stp-enable="true", "a=b"="c, d", e="x\\"y"}'))
+
+    def test_invalid(self):
+        for buf in ('[1, 2', '{a}', '{a=}', '[1 2]', '1 2', ']', '"a'):
+            with self.assertRaises(ValueError):
+                string_value_parser(buf)
+
+    def test_non_canonical(self):
+        # e.g.) The values with extra whitespaces typed by hand.
+        eq_([1, 'a'], string_value_parser('[ 1,a ]'))
+        eq_({1: 'b', 'c': 'd'}, string_value_parser('{1 = "b",c="d"}'))
+        for buf in ('[a=b]', '[1, , 2]', '{a=b=c, d}', '{a="b""c"}'):
+            with self.assertRaises(ValueError):
+                string_value_parser(buf)
+
+    def test_fuzz(self):
+        rng = random.Random(0)
+        for _ in range(1000):
+            value, expected = _random_value(rng)
+            buf = datum.to_string(value)
+
+            eq_(expected, string_value_parser(buf), buf)
+
+    def test_get_cmd_parser(self):
+        eq_({'a=b': 'c, d'}, get_cmd_parser('{"a=b"="c, d"}\n'))
+        # The keys of maps are converted as well as the values.
+        eq_({1: 2, 'a': True}, get_cmd_parser('{1=2, a=true}\n'))
+        # Multiple values are returned as they are.
+        eq_('"s1"\n100', get_cmd_parser('"s1"\n100\n'))
+
+
+class TestStringListCmdParser(unittest.TestCase):
+    """
+    Test cases for ovs_vsctl.parser.string_list_cmd_parser.
+    """
+
+    output = (
+        '_uuid               : 1f42e5a6-26ff-4d5d-ae6e-6ac8de3b4b2e\n'
+        'external_ids        : {iface-id="vm1", "a b"="c: d"}\n'
+        'name                : "s1-eth1"\n'
+        'trunks              : [100, 200]\n'
+        '\n'
+        '_uuid               : 2f42e5a6-26ff-4d5d-ae6e-6ac8de3b4b2e\n'
+        'external_ids        : {}\n'
+        'name                : s1-eth2\n'
+        'trunks              : []\n')
+
+    def test_string_list_cmd_parser(self):
+        records = string_list_cmd_parser(self.output)
+
+        eq_(2, len(records))
+        eq_('1f42e5a6-26ff-4d5d-ae6e-6ac8de3b4b2e', records[0]._uuid)
+        eq_({'iface-id': 'vm1', 'a b': 'c: d'}, records[0].external_ids)
+        eq_([100, 200], records[0].trunks)
+        eq_('s1-eth2', records[1].name)
+        eq_([], records[1].trunks)
+        eq_('string', string_list_cmd_parser.data_format)
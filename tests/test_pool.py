@@ -0,0 +1,122 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test cases for ovs_vsctl.pool.
+"""
+
+import functools
+import logging
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+
+from nose.tools import eq_
+from nose.tools import ok_
+from nose.tools import raises
+from six.moves import mock
+
+from ovs_vsctl import line_parser
+from ovs_vsctl.exception import VSCtlCmdExecError
+from ovs_vsctl.pool import VSCtlPool
+from ovs_vsctl.vsctl import VSCtl
+
+LOG = logging.getLogger(__name__)
+
+# Prints the port number, and fails if the port number is odd.
+STUB = '''#!/bin/sh
+port=${1##*:}
+if [ $((port % 2)) -eq 1 ]; then
+    echo "error on $port" >&2
+    exit 1
+fi
+echo "$port"
+'''
+
+
+def _stub_factory(path, protocol, addr, port):
+    vsctl = VSCtl(protocol, addr, port)
+    vsctl.ovs_vsctl_path = path
+    return vsctl
+
+
+class TestVSCtlPool(unittest.TestCase):
+    """
+    Test cases for ovs_vsctl.pool.VSCtlPool.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        path = os.path.join(self.tmpdir, 'ovs-vsctl')
+        with open(path, 'w') as f:  # pylint: disable=invalid-name
+            f.write(STUB)
+        os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR)
+        self.factory = functools.partial(_stub_factory, path)
+        self.targets = [('tcp', '127.0.0.1', port) for port in range(10)]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _check(self, results):
+        results = sorted(results, key=lambda r: r.target[2])
+
+        eq_(self.targets, [r.target for r in results])
+        for port, result in enumerate(results):
+            if port % 2:
+                ok_(not result.ok)
+                ok_(isinstance(result.error, VSCtlCmdExecError))
+            else:
+                ok_(result.ok)
+                eq_([str(port)], result.output)
+
+    def test_run_with_thread(self):
+        with VSCtlPool(4, factory=self.factory) as pool:
+            self._check(pool.run(self.targets, 'list-br',
+                                 parser=line_parser))
+
+    def test_run_with_process(self):
+        with VSCtlPool(2, executor='process', factory=self.factory) as pool:
+            self._check(pool.run(self.targets, 'list-br',
+                                 parser=line_parser))
+
+    def test_run_with_unpicklable_parser(self):
+        with VSCtlPool(2, executor='process', factory=self.factory) as pool:
+            results = list(pool.run(self.targets, 'list-br',
+                                    parser=lambda buf: buf))
+
+        eq_(self.targets, sorted(r.target for r in results))
+        ok_(all(not r.ok for r in results))
+
+    def test_run_with_columns(self):
+        with mock.patch.object(VSCtl, 'run') as run:
+            with VSCtlPool(2) as pool:
+                list(pool.run(self.targets[:1], 'list bridge',
+                              columns=['name']))
+
+        run.assert_called_once_with(
+            'list bridge', table_format='list', data_format='string',
+            parser=None, columns=['name'])
+
+    def test_run_with_invalid_target(self):
+        with VSCtlPool(2) as pool:
+            results = list(pool.run([('tcp', 'xxx', 6640)], 'list-br'))
+
+        ok_(isinstance(results[0].error, ValueError))
+
+    @raises(ValueError)
+    def test_init_with_invalid_executor(self):
+        VSCtlPool(executor='xxx')
@@ -0,0 +1,124 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test cases for ovs_vsctl.query.
+"""
+
+import logging
+import shlex
+import unittest
+
+from nose.tools import eq_
+from nose.tools import ok_
+from nose.tools import raises
+
+from ovs_vsctl import VSCtl
+from ovs_vsctl import record_class_parser
+from ovs_vsctl.backend import JsonRpcBackend
+from ovs_vsctl.fake_server import FakeOVSDBServer
+from ovs_vsctl.parser import CompactRecord
+from ovs_vsctl.query import Query
+
+LOG = logging.getLogger(__name__)
+
+
+class Interface(CompactRecord):
+    """
+    Interface with the columns to fetch.
+    """
+    __slots__ = ('name', 'type')
+
+
+class TestQuery(unittest.TestCase):
+    """
+    Test cases for ovs_vsctl.query.Query.
+    """
+
+    def setUp(self):
+        self.server = FakeOVSDBServer()
+        self.server.add_bridge('s1', ['s1-eth1', 's1-eth2'])
+        self.server.add_port('vm 1', type='internal',
+                             external_ids=['map', [['iface-id', 'a "b"']]])
+        self.server.start()
+        _, _, port = self.server.ovsdb_addr.rpartition(':')
+        self.vsctl = VSCtl('tcp', '127.0.0.1', int(port),
+                           backend=JsonRpcBackend)
+
+    def tearDown(self):
+        self.vsctl.close()
+        self.server.stop()
+
+    def test_args(self):
+        query = (Query('Port', name='p 1', other_config={'k': 'v'})
+                 .where('tag', '>=', 100)
+                 .contains('trunks', [200, 100])
+                 .where('external_ids', '{=}', {})
+                 .where('bond_mode', '=', None)
+                 .where('external_ids', '!=', 'it\'s', key='vm id'))
+
+        args = ['find', 'Port', 'name="p 1"', 'other_config:k=v',
+                'tag>=100', 'trunks{>=}[100, 200]', 'external_ids{=}{}',
+                'bond_mode=[]', 'external_ids:"vm id"!="it\'s"']
+        eq_(args, query.args())
+        eq_(args, shlex.split(query.command()))
+
+    def test_immutable(self):
+        base = Query('Interface', type='internal')
+        query = base.where('ofport', '>', 0).select('name')
+
+        eq_(['find', 'Interface', 'type=internal'], base.args())
+        ok_(base.columns is None)
+        eq_(('name',), query.columns)
+
+    @raises(ValueError)
+    def test_invalid_operator(self):
+        Query('Interface').where('ofport', '=~', 1)
+
+    @raises(ValueError)
+    def test_invalid_column(self):
+        Query('Interface').where('name=x name', '=', 'y')
+
+    @raises(ValueError)
+    def test_invalid_select(self):
+        Query('Interface').select('name,ofport')
+
+    def test_run(self):
+        records = Query('Interface', external_ids={'iface-id': 'a "b"'}).run(
+            self.vsctl)
+
+        eq_(['vm 1'], [r.name for r in records])
+        eq_('internal', records[0].type)
+
+    def test_run_select(self):
+        records = (Query('Interface', name='vm 1').select('name', 'type')
+                   .run(self.vsctl))
+
+        eq_(["Record(name='vm 1', type='internal')"],
+            [str(r) for r in records])
+
+    def test_run_record_class_parser(self):
+        records = (Query('Interface').where('type', '!=', 'internal')
+                   .run(self.vsctl, parser=record_class_parser(Interface)))
+
+        eq_(['s1', 's1-eth1', 's1-eth2'], sorted(r.name for r in records))
+        ok_(all(isinstance(r, Interface) for r in records))
+
+    def test_run_no_match(self):
+        query = Query('Interface', name='nothere')
+
+        eq_([], query.run(self.vsctl))
+        eq_([], query.select('name').run(self.vsctl))
+        eq_([], query.run(self.vsctl, parser=record_class_parser(Interface)))
@@ -0,0 +1,170 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test cases for ovs_vsctl.reconcile.
+"""
+
+import logging
+import unittest
+
+from nose.tools import eq_
+from six.moves import mock
+
+from ovs_vsctl import VSCtl
+from ovs_vsctl.backend import JsonRpcBackend
+from ovs_vsctl.fake_server import FakeOVSDBServer
+from ovs_vsctl.reconcile import Reconciler
+
+LOG = logging.getLogger(__name__)
+
+
+def _desired():
+    return {
+        's1': {
+            'columns': {'external_ids': {'owner': 'agent'},
+                        'stp_enable': False},
+            'ports': {
+                's1-eth1': {},
+                's1-eth2': {
+                    'interfaces': {
+                        's1-eth2': {'type': 'internal',
+                                    'options': {'key': '10'}},
+                    },
+                },
+            },
+        },
+    }
+
+
+class TestReconciler(unittest.TestCase):
+    """
+    Test cases for ovs_vsctl.reconcile.Reconciler.
+    """
+
+    def setUp(self):
+        self.server = FakeOVSDBServer()
+        self.server.add_bridge(
+            's1', external_ids=['map', [['owner', 'agent']]])
+        self.server.add_bridge('s2', ['s2-eth1'])
+        port_uuids = [
+            self.server.add_port('s1-eth1'),
+            self.server.add_port('s1-eth2', type='internal',
+                                 options=['map', [['key', '10']]]),
+        ]
+        self._transact('Bridge', 's1', 'ports', port_uuids)
+        self.server.start()
+        _, _, port = self.server.ovsdb_addr.rpartition(':')
+        self.vsctl = VSCtl('tcp', '127.0.0.1', int(port),
+                           backend=JsonRpcBackend)
+        self.reconciler = Reconciler(self.vsctl)
+
+    def tearDown(self):
+        self.vsctl.close()
+        self.server.stop()
+
+    def _transact(self, table, name, column, uuids):
+        self.server.transact('Open_vSwitch', [{
+            'op': 'mutate', 'table': table,
+            'where': [['name', '==', name]],
+            'mutations': [[column, 'insert',
+                           ['set', [['uuid', u] for u in uuids]]]],
+        }])
+
+    def _reconcile(self, desired):
+        with mock.patch.object(self.vsctl, 'run_batch',
+                               wraps=self.vsctl.run_batch) as run_batch:
+            with mock.patch.object(self.vsctl, 'run') as run:
+                commands = self.reconciler.reconcile(desired)
+        eq_(1, run_batch.call_count)
+        if commands:
+            run.assert_called_once_with(' -- '.join(commands))
+        else:
+            eq_(0, run.call_count)
+        return commands
+
+    def test_steady_state(self):
+        eq_([], self._reconcile(_desired()))
+
+    def test_update_columns(self):
+        desired = _desired()
+        desired['s1']['columns'] = {'external_ids': {'owner': 'other',
+                                                     'zone': 'a b'},
+                                    'stp_enable': True}
+        desired['s1']['ports']['s1-eth1'] = {'columns': {'tag': 10}}
+        desired['s1']['ports']['s1-eth2']['interfaces']['s1-eth2'] = {
+            'type': 'internal', 'options': {}}
+
+        eq_(['set Bridge s1 external_ids:owner=other'
+             " 'external_ids:zone=\"a b\"' stp_enable=true",
+             'set Port s1-eth1 tag=10',
+             'remove Interface s1-eth2 options key'],
+            self._reconcile(desired))
+
+    def test_add_delete_ports(self):
+        desired = _desired()
+        del desired['s1']['ports']['s1-eth1']
+        desired['s1']['ports']['s1-eth3'] = {
+            'interfaces': {'s1-eth3': {'type': 'vxlan',
+                                       'options': {'remote_ip': '10.0.0.2'}}}}
+        desired['s1']['ports']['bond0'] = {
+            'columns': {'bond_mode': 'balance-slb'},
+            'interfaces': {'s1-eth4': {}, 's1-eth5': {}}}
+
+        eq_(['del-port s1 s1-eth1',
+             'add-bond s1 bond0 s1-eth4 s1-eth5',
+             'set Port bond0 bond_mode=balance-slb',
+             '--may-exist add-port s1 s1-eth3',
+             "set Interface s1-eth3 'options:remote_ip=\"10.0.0.2\"'"
+             ' type=vxlan'],
+            self._reconcile(desired))
+
+    def test_move_port(self):
+        desired = _desired()
+        desired['s2'] = {'ports': {'s1-eth1': {}}}
+        del desired['s1']['ports']['s1-eth1']
+
+        eq_(['del-port s1 s1-eth1',
+             'del-port s2 s2-eth1',
+             '--may-exist add-port s2 s1-eth1'],
+            self._reconcile(desired))
+
+    def test_add_delete_bridges(self):
+        self.reconciler.delete_bridges = True
+        desired = _desired()
+        desired['s3'] = {'columns': {'fail_mode': 'secure'},
+                         'ports': {'s3-eth1': {}}}
+
+        eq_(['del-br s2',
+             '--may-exist add-br s3',
+             'set Bridge s3 fail_mode=secure',
+             '--may-exist add-port s3 s3-eth1'],
+            self._reconcile(desired))
+
+    def test_empty_database(self):
+        server = FakeOVSDBServer()
+        server.start()
+        self.addCleanup(server.stop)
+        _, _, port = server.ovsdb_addr.rpartition(':')
+        vsctl = VSCtl('tcp', '127.0.0.1', int(port), backend=JsonRpcBackend)
+        self.addCleanup(vsctl.close)
+        reconciler = Reconciler(vsctl)
+
+        eq_({}, reconciler.fetch().bridges)
+        with mock.patch.object(vsctl, 'run') as run:
+            commands = reconciler.reconcile({'s1': {'ports': {'s1-eth1': {}}}})
+        eq_(['--may-exist add-br s1', '--may-exist add-port s1 s1-eth1'],
+            commands)
+        run.assert_called_once_with(' -- '.join(commands))
@@ -0,0 +1,106 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test cases for ovs_vsctl.reference.
+"""
+
+import logging
+import unittest
+
+from nose.tools import eq_
+from nose.tools import ok_
+from six.moves import mock
+
+from ovs_vsctl import VSCtl
+from ovs_vsctl import list_cmd_parser
+from ovs_vsctl.backend import JsonRpcBackend
+from ovs_vsctl.fake_server import FakeOVSDBServer
+from ovs_vsctl.parser import Record
+from ovs_vsctl.reference import ReferenceResolver
+
+LOG = logging.getLogger(__name__)
+
+
+class TestReferenceResolver(unittest.TestCase):
+    """
+    Test cases for ovs_vsctl.reference.ReferenceResolver.
+    """
+
+    def setUp(self):
+        self.server = FakeOVSDBServer()
+        self.server.add_bridge('s1', ['s1-eth1', 's1-eth2'])
+        self.server.start()
+        _, _, port = self.server.ovsdb_addr.rpartition(':')
+        self.vsctl = VSCtl('tcp', '127.0.0.1', int(port),
+                           backend=JsonRpcBackend)
+        self.resolver = ReferenceResolver(self.vsctl)
+
+    def tearDown(self):
+        self.vsctl.close()
+        self.server.stop()
+
+    def _list_bridges(self):
+        return self.vsctl.run('list Bridge', parser=list_cmd_parser)
+
+    def test_resolve(self):
+        bridges = self._list_bridges()
+        with mock.patch.object(self.vsctl, 'run_batch',
+                               wraps=self.vsctl.run_batch) as run_batch:
+            ok_(self.resolver.resolve('Bridge', bridges) is bridges)
+
+        # Fetches Port and then Interface table.
+        eq_(2, run_batch.call_count)
+        eq_(['s1', 's1-eth1', 's1-eth2'],
+            sorted(p.name for p in bridges[0].ports))
+        eq_(['s1', 's1-eth1', 's1-eth2'],
+            sorted(p.interfaces.name for p in bridges[0].ports))
+        ok_(isinstance(bridges[0].ports[0], Record))
+
+    def test_resolve_cached(self):
+        self.resolver.resolve('Bridge', self._list_bridges())
+        bridges = self._list_bridges()
+        with mock.patch.object(self.vsctl, 'run_batch') as run_batch:
+            self.resolver.resolve('Bridge', bridges)
+
+        ok_(not run_batch.called)
+        ports = dict((p.name, p) for p in bridges[0].ports)
+        ok_(ports['s1-eth1'].interfaces
+            is self.resolver.records[ports['s1-eth1'].interfaces._uuid])
+
+    def test_resolve_depth(self):
+        bridges = self.resolver.resolve('Bridge', self._list_bridges(),
+                                        depth=1)
+
+        ok_(all(isinstance(p, Record) for p in bridges[0].ports))
+        ok_(all(isinstance(p.interfaces, str) for p in bridges[0].ports))
+
+    def test_clear(self):
+        self.resolver.resolve('Bridge', self._list_bridges())
+        self.resolver.clear()
+
+        eq_({}, self.resolver.records)
+        with mock.patch.object(self.vsctl, 'run_batch',
+                               wraps=self.vsctl.run_batch) as run_batch:
+            self.resolver.resolve('Bridge', self._list_bridges())
+        eq_(2, run_batch.call_count)
+
+    def test_from_schema(self):
+        resolver = ReferenceResolver.from_schema(self.vsctl,
+                                                 self.server.schema)
+
+        eq_('Port', resolver.references['Bridge']['ports'])
+        eq_('Interface', resolver.references['Port']['interfaces'])
+        ok_('name' not in resolver.references['Bridge'])
@@ -0,0 +1,189 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test cases for ovs_vsctl.replica.
+"""
+
+import logging
+import threading
+import unittest
+
+from nose.tools import eq_
+from nose.tools import ok_
+from nose.tools import raises
+
+from ovs_vsctl import VSCtl
+from ovs_vsctl import list_cmd_parser
+from ovs_vsctl.backend import JsonRpcBackend
+from ovs_vsctl.fake_server import FakeOVSDBServer
+from ovs_vsctl.replica import Replica
+
+LOG = logging.getLogger(__name__)
+
+TIMEOUT = 5
+
+
+class TestReplica(unittest.TestCase):
+    """
+    Test cases for ovs_vsctl.replica.Replica.
+    """
+
+    def setUp(self):
+        self.server = FakeOVSDBServer()
+        self.server.add_bridge('s1', ['s1-eth1', 's1-eth2'])
+        self.server.start()
+        _, _, port = self.server.ovsdb_addr.rpartition(':')
+        self.vsctl = VSCtl('tcp', '127.0.0.1', int(port),
+                           backend=JsonRpcBackend)
+        self.changes = []
+        self.changed = threading.Event()
+        self.replica = Replica(self.vsctl, ['Port', 'Interface'],
+                               callbacks=[self._on_change],
+                               retry_interval=0.01)
+
+    def tearDown(self):
+        self.replica.stop()
+        self.vsctl.close()
+        self.server.stop()
+
+    def _on_change(self, table, old, new):
+        self.changes.append((table, old, new))
+        self.changed.set()
+
+    def _clear_changes(self):
+        del self.changes[:]
+        self.changed.clear()
+
+    def _wait_change(self):
+        ok_(self.changed.wait(TIMEOUT))
+        self.changed.clear()
+
+    def test_start(self):
+        self.replica.start()
+
+        ok_(self.replica.synced)
+        eq_(['s1', 's1-eth1', 's1-eth2'],
+            sorted(r.name for r in self.replica.list('Port')))
+        eq_(6, len(self.changes))
+        ok_(all(old is None for _, old, _ in self.changes))
+
+    def test_same_as_list_cmd_parser(self):
+        self.replica.start()
+
+        expected = self.vsctl.run('list Interface s1-eth1',
+                                  parser=list_cmd_parser)[0]
+        eq_(repr(expected), repr(self.replica.get('Interface', 's1-eth1')))
+        ok_(self.replica.get('Interface', 's1-eth1')
+            is self.replica.get('Interface', expected._uuid))
+
+    def test_insert(self):
+        self.replica.start()
+        self._clear_changes()
+
+        self.server.add_port('s1-eth3')
+        while len(self.changes) < 2:
+            self._wait_change()
+
+        eq_(set(['Port', 'Interface']), set(t for t, _, _ in self.changes))
+        ok_(all(old is None for _, old, _ in self.changes))
+        eq_('s1-eth3', self.replica.get('Port', 's1-eth3').name)
+
+    def _transact(self, *operations):
+        for result in self.server.transact('Open_vSwitch', operations):
+            ok_('error' not in result, result)
+
+    def test_update(self):
+        self.replica.start()
+        self._clear_changes()
+
+        self._transact({'op': 'update', 'table': 'Port',
+                        'where': [['name', '==', 's1-eth1']],
+                        'row': {'tag': 100}})
+        self._wait_change()
+
+        table, old, new = self.changes[0]
+        eq_('Port', table)
+        eq_([], old.tag)
+        eq_(100, new.tag)
+        eq_(100, self.replica.get('Port', 's1-eth1').tag)
+        eq_([new], self.replica.find('Port', tag=100))
+
+    def test_delete(self):
+        self.replica.start()
+        self._clear_changes()
+        port = self.replica.get('Port', 's1-eth2')
+
+        self._transact({'op': 'delete', 'table': 'Port',
+                        'where': [['name', '==', 's1-eth2']]})
+        self._wait_change()
+
+        eq_([('Port', port, None)], self.changes)
+        with self.assertRaises(KeyError):
+            self.replica.get('Port', 's1-eth2')
+
+    def test_columns(self):
+        self.replica = Replica(self.vsctl, ['Port'],
+                               columns={'Port': ['name']})
+        self.replica.start()
+
+        eq_([('_uuid', self.replica.get('Port', 's1-eth1')._uuid),
+             ('name', 's1-eth1')],
+            list(self.replica.get('Port', 's1-eth1')._items()))
+
+    def test_callback_error(self):
+        def _error(*_):
+            raise RuntimeError('callback error')
+
+        self.replica.callbacks.insert(0, _error)
+        self.replica.start()
+
+        eq_(6, len(self.changes))
+
+    def test_resync(self):
+        self.replica.start()
+        self._clear_changes()
+
+        # Deletes a port without notifications, and disconnects the
+        # replica to download the rows again.
+        port = self.replica.get('Port', 's1-eth2')
+        with self.server.lock:
+            del self.server.tables['Port'][port._uuid]
+        self.replica.connection.close()
+        self._wait_change()
+
+        ok_(self.replica.wait_synced(TIMEOUT))
+        eq_([('Port', port, None)], self.changes)
+
+    def test_stop(self):
+        with self.replica:
+            ok_(self.replica.synced)
+
+        ok_(not self.replica.synced)
+        self._transact({'op': 'update', 'table': 'Port',
+                        'where': [['name', '==', 's1-eth1']],
+                        'row': {'tag': 100}})
+        eq_([], self.replica.get('Port', 's1-eth1').tag)
+
+    @raises(ValueError)
+    def test_unknown_column(self):
+        self.replica = Replica(self.vsctl, ['Port'],
+                               columns={'Port': ['unknown']})
+        self.replica.start()
+
+    @raises(ValueError)
+    def test_not_replicated(self):
+        self.replica.start()
+        self.replica.list('Bridge')
@@ -0,0 +1,164 @@
+# Copyright (C) 2016 Iwase Yusuke <iwase yusuke0 at gmail com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test cases for ovs_vsctl.spawn.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+
+from nose.tools import eq_
+from nose.tools import ok_
+from nose.tools import raises
+
+from ovs_vsctl import VSCtl
+from ovs_vsctl.exception import VSCtlCmdExecError
+from ovs_vsctl.spawn import ForkServerSpawner
+from ovs_vsctl.spawn import PopenSpawner
+from ovs_vsctl.spawn import PosixSpawnSpawner
+from ovs_vsctl.spawn import get_spawner
+
+LOG = logging.getLogger(__name__)
+
+# Prints the arguments, and the large outputs to both of stdout and stderr
+# if the first argument is 'large'.
+STUB = '''#!/bin/sh
+if [ "$1" = large ]; then
+    head -c 200000 /dev/zero | tr '\\0' o
+    head -c 200000 /dev/zero | tr '\\0' e >&2
+    exit 0
+fi
+echo "$@"
+echo error >&2
+exit 3
+'''
+
+
+class SpawnerTestMixin():
+    """
+    Test cases common to the spawners.
+    """
+
+    def setUp(self):  # pylint: disable=invalid-name
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'ovs-vsctl')
+        with open(self.path, 'w') as f:  # pylint: disable=invalid-name
+            f.write(STUB)
+        os.chmod(self.path, os.stat(self.path).st_mode | stat.S_IXUSR)
+        self.spawner = self.spawner_class()
+
+    def tearDown(self):  # pylint: disable=invalid-name
+        self.spawner.close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_run(self):
+        process = self.spawner.run([self.path, 'list', 'a b'])
+
+        eq_(3, process.returncode)
+        eq_('list a b\n', process.stdout.read())
+        eq_('error\n', process.stderr.read())
+        ok_(process.spawn_time >= 0)
+
+    def test_large_outputs(self):
+        process = self.spawner.run([self.path, 'large'])
+
+        eq_(0, process.returncode)
+        eq_('o' * 200000, process.stdout.read())
+        eq_('e' * 200000, process.stderr.read())
+
+    @raises(OSError)
+    def test_not_found(self):
+        self.spawner.run([os.path.join(self.tmpdir, 'xxx')])
+
+    def test_concurrent(self):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            processes = list(executor.map(
+                lambda i: self.spawner.run([self.path, str(i)]), range(32)))
+
+        eq_(['%d\n' % i for i in range(32)],
+            [p.stdout.read() for p in processes])
+
+    def test_vsctl(self):
+        vsctl = VSCtl('tcp', '127.0.0.1', 6640, ovs_vsctl_path=self.path,
+                      spawner=self.spawner)
+        try:
+            vsctl.run('list-br')
+        except VSCtlCmdExecError as e:  # pylint: disable=invalid-name
+            eq_('error\n', str(e))
+        else:
+            ok_(False, 'VSCtlCmdExecError not raised')
+        vsctl.close()
+        # Not closed by VSCtl.
+        eq_('a\n', self.spawner.run([self.path, 'a']).stdout.read())
+
+
+class TestPopenSpawner(SpawnerTestMixin, unittest.TestCase):
+    """
+    Test cases for ovs_vsctl.spawn.PopenSpawner.
+    """
+    spawner_class = PopenSpawner
+
+
+class TestPosixSpawnSpawner(SpawnerTestMixin, unittest.TestCase):
+    """
+    Test cases for ovs_vsctl.spawn.PosixSpawnSpawner.
+    """
+    spawner_class = PosixSpawnSpawner
+
+
+class TestForkServerSpawner(SpawnerTestMixin, unittest.TestCase):
+    """
+    Test cases for ovs_vsctl.spawn.ForkServerSpawner.
+    """
+    spawner_class = ForkServerSpawner
+
+    def test_restart(self):
+        # pylint: disable=protected-access
+        helper = self.spawner._popen
+        helper.kill()
+        helper.wait()
+
+        eq_('a\n', self.spawner.run([self.path, 'a']).stdout.read())
+        ok_(self.spawner._popen is not helper)
+
+
+def test_get_spawner():
+    spawner = PopenSpawner()
+
+    ok_(get_spawner(spawner) is spawner)
+    ok_(isinstance(get_spawner('posix_spawn'), PosixSpawnSpawner))
+
+
+@raises(ValueError)
+def test_get_spawner_unsupported():
+    get_spawner('xxx')
+
+
+def test_vsctl_shares_forkserver():
+    vsctl = VSCtl('tcp', '127.0.0.1', 6640, spawner='forkserver')
+    other = VSCtl('tcp', '127.0.0.1', 6640, spawner='forkserver')
+    ok_(isinstance(vsctl.spawner, ForkServerSpawner))
+    ok_(vsctl.spawner is other.spawner)
+
+    # The shared helper is not terminated by closing one of them.
+    helper = vsctl.spawner._popen  # pylint: disable=protected-access
+    vsctl.close()
+    ok_(helper.poll() is None)
@@ -18,6 +18,7 @@ Test cases for ovs_vsctl.utils.
 """
 
 import logging
+import sys
 import unittest
 
 from nose.tools import eq_
@@ -38,3 +39,28 @@ class TestUtils(unittest.TestCase):
 
     def test_is_valid_uuid_with_invalid_uuid(self):
         eq_(False, utils.is_valid_uuid('xxx'))
+
+    def test_run_with_large_outputs(self):
+        # Outputs larger than the pipe buffer must not block the command.
+        process = utils.run([
+            sys.executable, '-c',
+            'import sys; '
+            'sys.stderr.write("e" * 1000000); '
+            'sys.stdout.write("o" * 1000000)'])
+
+        eq_(0, process.returncode)
+        eq_(1000000, len(process.stdout.read()))
+        eq_(1000000, len(process.stderr.read()))
+        ok_(process.spawn_time > 0)
+
+    def test_run_with_stream(self):
+        process = utils.run([
+            sys.executable, '-c',
+            'import sys; '
+            'sys.stderr.write("e" * 1000000); '
+            'sys.stdout.write("line\\n" * 100000); '
+            'sys.exit(3)'], stream=True)
+
+        eq_(100000, sum(1 for _ in process.stdout))
+        eq_(3, process.wait())
+        eq_(1000000, len(process.stderr.read()))
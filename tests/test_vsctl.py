@@ -17,14 +17,25 @@
 Test cases for ovs_vsctl.vsctl.
 """
 
+from io import StringIO
 import logging
 import unittest
 
 from nose.tools import eq_
+from nose.tools import ok_
 from nose.tools import raises
 from six.moves import mock
 
+from ovs_vsctl import utils
+from ovs_vsctl.parser import get_cmd_parser
+from ovs_vsctl.parser import iter_list_cmd_parser
+from ovs_vsctl.parser import line_parser
+from ovs_vsctl.parser import CompactRecord
+from ovs_vsctl.parser import list_cmd_parser
+from ovs_vsctl.parser import record_class_parser
+from ovs_vsctl.vsctl import DEFAULT_OVS_VSCTL
 from ovs_vsctl.vsctl import VSCtl
+from ovs_vsctl.vsctl import find_ovs_vsctl
 from ovs_vsctl.exception import VSCtlCmdExecError
 from ovs_vsctl.exception import VSCtlCmdParseError
 
@@ -49,6 +60,42 @@ class TestVSCtl(unittest.TestCase):
     def test_init_with_invalid_port(self):
         VSCtl(port='xxx')
 
+    @raises(ValueError)
+    def test_init_with_invalid_addr(self):
+        VSCtl(protocol='tcp', addr='::1::2')
+
+    def test_init_with_ipv6_addr(self):
+        eq_('fe80::1', VSCtl(protocol='tcp', addr='fe80::1').addr)
+
+    @mock.patch('shutil.which')
+    def test_ovs_vsctl_path(self, mock_which):
+        mock_which.return_value = '/usr/bin/ovs-vsctl'
+        find_ovs_vsctl.cache_clear()
+        self.addCleanup(find_ovs_vsctl.cache_clear)
+
+        vsctl = VSCtl('tcp', '127.0.0.1', 6640)
+        ok_(not mock_which.called)
+
+        eq_('/usr/bin/ovs-vsctl', vsctl.ovs_vsctl_path)
+        eq_('/usr/bin/ovs-vsctl', vsctl.ovs_vsctl_path)
+        eq_(1, mock_which.call_count)
+
+    @mock.patch('shutil.which')
+    def test_ovs_vsctl_path_not_found(self, mock_which):
+        mock_which.return_value = None
+        find_ovs_vsctl.cache_clear()
+        self.addCleanup(find_ovs_vsctl.cache_clear)
+
+        eq_(DEFAULT_OVS_VSCTL, VSCtl('tcp', '127.0.0.1', 6640).ovs_vsctl_path)
+
+    @mock.patch('shutil.which')
+    def test_ovs_vsctl_path_override(self, mock_which):
+        vsctl = VSCtl('tcp', '127.0.0.1', 6640,
+                      ovs_vsctl_path='/opt/ovs/bin/ovs-vsctl')
+
+        eq_('/opt/ovs/bin/ovs-vsctl', vsctl.ovs_vsctl_path)
+        ok_(not mock_which.called)
+
     def test_ovsdb_addr_ipv4(self):
         vsctl = VSCtl(protocol='tcp', ip_addr='127.0.0.1', port=6640)
 
@@ -92,3 +139,147 @@ class TestVSCtl(unittest.TestCase):
         output = vsctl.run('show', parser=None)
 
         eq_(mock_popen, output)
+
+    @mock.patch('ovs_vsctl.utils.run')
+    def test_run_batch(self, mock_run):
+        mock_popen = mock.MagicMock()
+        mock_popen.returncode = 0
+        mock_popen.stdout = StringIO(
+            's1\\ns2\n'
+            '{"data":[["s1",["set",[100,200]]]],'
+            '"headings":["name","trunks"]}\n'
+            '{stp-enable="true"}\n'
+            '\n')
+        mock_run.return_value = mock_popen
+
+        vsctl = VSCtl(protocol='tcp', addr='127.0.0.1', port=6640)
+        outputs = vsctl.run_batch([
+            ('list-br', line_parser),
+            ('list Port s1', list_cmd_parser),
+            ('get Port s1 other_config', get_cmd_parser),
+            ('set Port s1 tag=100', None),
+        ])
+
+        args = mock_run.call_args[0][0]
+        eq_(['--oneline', '--format=json', '--data=json',
+             '--', 'list-br', '--', 'list', 'Port', 's1'], args[2:11])
+        eq_(['s1', 's2'], outputs[0])
+        eq_('s1', outputs[1][0].name)
+        eq_([100, 200], outputs[1][0].trunks)
+        eq_({'stp-enable': 'true'}, outputs[2])
+        eq_('', outputs[3])
+
+    @raises(VSCtlCmdParseError)
+    @mock.patch('ovs_vsctl.utils.run')
+    def test_run_batch_with_missing_outputs(self, mock_run):
+        mock_popen = mock.MagicMock()
+        mock_popen.returncode = 0
+        mock_popen.stdout = StringIO('s1\n')
+        mock_run.return_value = mock_popen
+
+        vsctl = VSCtl(protocol='tcp', addr='127.0.0.1', port=6640)
+        vsctl.run_batch([('list-br', line_parser), ('list-br', None)])
+
+    @mock.patch('ovs_vsctl.utils.run')
+    def test_run_with_columns(self, mock_run):
+        class Interface(CompactRecord):
+            """Declares the columns to fetch."""
+            __slots__ = ('name', 'ofport')
+
+        mock_run.return_value = utils.Process(
+            [], 0, stdout='name                : "s1-eth1"\n'
+                          'ofport              : 1\n')
+        vsctl = VSCtl(protocol='tcp', addr='127.0.0.1', port=6640)
+
+        vsctl.run('list Interface', columns=['name', 'ofport'])
+        eq_(['--columns=name,ofport', 'list', 'Interface'],
+            mock_run.call_args[0][0][-3:])
+
+        vsctl.run('--if-exists find Interface', columns=Interface)
+        eq_(['--columns=name,ofport', '--if-exists', 'find', 'Interface'],
+            mock_run.call_args[0][0][-4:])
+
+        output = vsctl.run('list Interface',
+                           parser=record_class_parser(Interface))
+        eq_(['--columns=name,ofport', 'list', 'Interface'],
+            mock_run.call_args[0][0][-3:])
+        eq_("Interface(name='s1-eth1', ofport=1)", str(output[0]))
+
+        # Only 'list' and 'find' take the columns of the parser.
+        vsctl.run('get Interface s1-eth1 name',
+                  parser=record_class_parser(Interface))
+        ok_(not any(a.startswith('--columns')
+                    for a in mock_run.call_args[0][0]))
+
+    def test_prepare_and_finish(self):
+        vsctl = VSCtl(protocol='tcp', addr='127.0.0.1', port=6640,
+                      ovs_vsctl_path='ovs-vsctl')
+
+        prepared = vsctl.prepare('list-br', parser=line_parser)
+        eq_(['ovs-vsctl', '--db=tcp:127.0.0.1:6640', '--format=list',
+             '--data=json', 'list-br'], prepared.args)
+        with self.assertRaises(KeyError):
+            vsctl.get_cached(prepared)
+        eq_(['s1'], vsctl.finish(
+            prepared, utils.Process(prepared.args, 0, 's1\n')))
+
+        prepared = vsctl.prepare_batch([('list-br', line_parser)])
+        eq_(['--oneline', '--format=json', '--data=json', '--', 'list-br'],
+            prepared.args[2:])
+        eq_([['s1']], vsctl.finish(
+            prepared, utils.Process(prepared.args, 0, 's1\n')))
+
+        with self.assertRaises(VSCtlCmdExecError):
+            vsctl.finish(prepared, utils.Process(prepared.args, 1, '', 'x'))
+
+    @mock.patch('ovs_vsctl.utils.run')
+    def test_run_with_empty_table(self, mock_run):
+        # 'ovs-vsctl list' prints nothing if no record is found, which used
+        # to be parsed as a record without any column.
+        mock_run.return_value = utils.Process([], 0, stdout='')
+        vsctl = VSCtl(protocol='tcp', addr='127.0.0.1', port=6640)
+
+        eq_([], vsctl.run('list Port', parser=list_cmd_parser))
+        eq_([], vsctl.run('find Port name=s1', parser=list_cmd_parser))
+
+        mock_run.return_value = utils.Process(
+            [], 0, stdout='{"data":[],"headings":["_uuid","name"]}\n')
+        eq_([[]], vsctl.run_batch([('list Port', list_cmd_parser)]))
+
+    @raises(ValueError)
+    def test_run_with_columns_not_table(self):
+        vsctl = VSCtl(protocol='tcp', addr='127.0.0.1', port=6640)
+        vsctl.run('list-br', columns=['name'])
+
+    @mock.patch('ovs_vsctl.utils.run')
+    def test_run_with_stream(self, mock_run):
+        mock_run.return_value = utils.Process([], 0, stdout='s1\ns2\n')
+
+        vsctl = VSCtl(protocol='tcp', addr='127.0.0.1', port=6640)
+        output = vsctl.run('list-br', parser=line_parser, stream=True)
+
+        eq_(['s1', 's2'], output)
+        eq_(True, mock_run.call_args[1]['stream'])
+
+    @raises(VSCtlCmdExecError)
+    @mock.patch('ovs_vsctl.utils.run')
+    def test_run_with_stream_exec_error(self, mock_run):
+        mock_run.return_value = utils.Process([], 1, stderr='error')
+
+        vsctl = VSCtl(protocol='tcp', addr='127.0.0.1', port=6640)
+        vsctl.run('list-br', parser=line_parser, stream=True)
+
+    @mock.patch('ovs_vsctl.utils.run')
+    def test_run_with_stream_parse_error(self, mock_run):
+        mock_run.return_value = utils.Process(
+            [], 0, stdout='name                : "s1"\n'
+                          '\n'
+                          'ofport              : [xx\n')
+
+        vsctl = VSCtl(protocol='tcp', addr='127.0.0.1', port=6640)
+        records = vsctl.run('list Interface', parser=iter_list_cmd_parser,
+                            stream=True)
+
+        eq_('s1', next(records).name)
+        with self.assertRaises(VSCtlCmdParseError):
+            next(records)